@@ -0,0 +1,39 @@
+"""composite indexes for keyset pagination
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2025-03-03 00:00:00
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_tasks_created_at_id", "tasks", ["created_at", "id"], unique=False)
+    op.create_index("ix_comments_task_created_at_id", "comments", ["task_id", "created_at", "id"], unique=False)
+    op.create_index("ix_approvals_created_at_id", "approvals", ["created_at", "id"], unique=False)
+    op.create_index("ix_approvals_requested_by_created_at_id", "approvals", ["requested_by", "created_at", "id"], unique=False)
+    op.create_index("ix_users_created_at_id", "users", ["created_at", "id"], unique=False)
+    op.create_index("ix_users_role_created_at_id", "users", ["role", "created_at", "id"], unique=False)
+    op.create_index("ix_reviews_created_at_id", "reviews", ["created_at", "id"], unique=False)
+    op.create_index("ix_portfolio_entries_student_created_at_id", "portfolio_entries", ["student_id", "created_at", "id"], unique=False)
+    op.create_index("ix_assignments_student_created_at_id", "assignments", ["student_id", "created_at", "id"], unique=False)
+
+
+def downgrade():
+    op.drop_index("ix_assignments_student_created_at_id", table_name="assignments")
+    op.drop_index("ix_portfolio_entries_student_created_at_id", table_name="portfolio_entries")
+    op.drop_index("ix_reviews_created_at_id", table_name="reviews")
+    op.drop_index("ix_users_role_created_at_id", table_name="users")
+    op.drop_index("ix_users_created_at_id", table_name="users")
+    op.drop_index("ix_approvals_requested_by_created_at_id", table_name="approvals")
+    op.drop_index("ix_approvals_created_at_id", table_name="approvals")
+    op.drop_index("ix_comments_task_created_at_id", table_name="comments")
+    op.drop_index("ix_tasks_created_at_id", table_name="tasks")
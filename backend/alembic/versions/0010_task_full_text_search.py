@@ -0,0 +1,69 @@
+"""full-text search index for tasks
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2025-03-10 00:00:00
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+# Frozen copy of the DDL in app.db.task_search as of this revision. Migrations must
+# not change when the application's copy does, so this is deliberately not
+# imported; a later change to the index gets a migration of its own.
+SEARCH_VECTOR = """
+    setweight(to_tsvector('russian', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('russian', coalesce(skills_required, '') || ' ' || coalesce(goal, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(skills_required, '') || ' ' || coalesce(goal, '')), 'B') ||
+    setweight(to_tsvector('russian', coalesce(description, '') || ' ' || coalesce(key_tasks, '')), 'C') ||
+    setweight(to_tsvector('english', coalesce(description, '') || ' ' || coalesce(key_tasks, '')), 'C')
+"""
+
+FTS_COLUMNS = "title, description, goal, key_tasks, skills_required"
+NEW_ROW = "new.id, new.title, new.description, new.goal, new.key_tasks, new.skills_required"
+OLD_ROW = "'delete', old.id, old.title, old.description, old.goal, old.key_tasks, old.skills_required"
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute(f"ALTER TABLE tasks ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED")
+        op.execute("CREATE INDEX ix_tasks_search_vector ON tasks USING gin (search_vector)")
+    elif dialect == "sqlite":
+        op.execute(
+            f"CREATE VIRTUAL TABLE tasks_fts USING fts5({FTS_COLUMNS}, "
+            "content='tasks', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            f"CREATE TRIGGER tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+            f"INSERT INTO tasks_fts(rowid, {FTS_COLUMNS}) VALUES ({NEW_ROW}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+            f"INSERT INTO tasks_fts(tasks_fts, rowid, {FTS_COLUMNS}) VALUES ({OLD_ROW}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER tasks_fts_au AFTER UPDATE OF {FTS_COLUMNS} ON tasks BEGIN "
+            f"INSERT INTO tasks_fts(tasks_fts, rowid, {FTS_COLUMNS}) VALUES ({OLD_ROW}); "
+            f"INSERT INTO tasks_fts(rowid, {FTS_COLUMNS}) VALUES ({NEW_ROW}); END"
+        )
+        op.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_tasks_search_vector")
+        op.execute("ALTER TABLE tasks DROP COLUMN IF EXISTS search_vector")
+    elif dialect == "sqlite":
+        for trigger in ("tasks_fts_ai", "tasks_fts_ad", "tasks_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS tasks_fts")
@@ -0,0 +1,70 @@
+"""normalized task tags
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2025-03-17 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def _parse_tags(raw):
+    names = []
+    for part in (raw or "").split(","):
+        name = part.strip().lower()[:64]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def upgrade():
+    op.create_table(
+        "tags",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(length=64), nullable=False),
+    )
+    op.create_index("ix_tags_name", "tags", ["name"], unique=True)
+    op.create_table(
+        "task_tags",
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column("tag_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["tag_id"], ["tags.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("task_id", "tag_id"),
+    )
+    op.create_index("ix_task_tags_tag_id_task_id", "task_tags", ["tag_id", "task_id"], unique=False)
+
+    bind = op.get_bind()
+    tasks = sa.table("tasks", sa.column("id", sa.Integer), sa.column("tags", sa.String))
+    tags = sa.table("tags", sa.column("id", sa.Integer), sa.column("name", sa.String))
+    task_tags = sa.table("task_tags", sa.column("task_id", sa.Integer), sa.column("tag_id", sa.Integer))
+
+    parsed = {row.id: _parse_tags(row.tags) for row in bind.execute(sa.select(tasks.c.id, tasks.c.tags))}
+    names = sorted({name for task_names in parsed.values() for name in task_names})
+    if names:
+        op.bulk_insert(tags, [{"name": name} for name in names])
+        tag_ids = dict(bind.execute(sa.select(tags.c.name, tags.c.id)).all())
+        op.bulk_insert(
+            task_tags,
+            [{"task_id": task_id, "tag_id": tag_ids[name]} for task_id, task_names in parsed.items() for name in task_names],
+        )
+        for task_id, task_names in parsed.items():
+            bind.execute(tasks.update().where(tasks.c.id == task_id).values(tags=", ".join(task_names) or None))
+
+    op.drop_index("ix_tasks_tags", table_name="tasks")
+
+
+def downgrade():
+    op.create_index("ix_tasks_tags", "tasks", ["tags"], unique=False)
+    op.drop_index("ix_task_tags_tag_id_task_id", table_name="task_tags")
+    op.drop_table("task_tags")
+    op.drop_index("ix_tags_name", table_name="tags")
+    op.drop_table("tags")
@@ -0,0 +1,62 @@
+"""student statistics read model
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2025-03-24 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "student_stats",
+        sa.Column("student_id", sa.Integer(), primary_key=True),
+        sa.Column("applications_total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("requested_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("active_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("done_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("canceled_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("reviews_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("rating_sum", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(["student_id"], ["users.id"], ondelete="CASCADE"),
+    )
+    # Backfill; afterwards `python -m app.db.student_stats check` should report no drift.
+    op.execute(
+        """
+        INSERT INTO student_stats (
+            student_id, applications_total, requested_count, active_count, done_count,
+            canceled_count, reviews_count, rating_sum, updated_at
+        )
+        SELECT
+            a.student_id,
+            count(*),
+            sum(CASE WHEN a.state = 'requested' THEN 1 ELSE 0 END),
+            sum(CASE WHEN a.state = 'active' THEN 1 ELSE 0 END),
+            sum(CASE WHEN a.state = 'done' THEN 1 ELSE 0 END),
+            sum(CASE WHEN a.state = 'canceled' THEN 1 ELSE 0 END),
+            coalesce(max(r.reviews_count), 0),
+            coalesce(max(r.rating_sum), 0),
+            now()
+        FROM assignments a
+        LEFT JOIN (
+            SELECT a2.student_id, count(rv.id) AS reviews_count, sum(rv.rating) AS rating_sum
+            FROM reviews rv JOIN assignments a2 ON a2.id = rv.assignment_id
+            GROUP BY a2.student_id
+        ) r ON r.student_id = a.student_id
+        GROUP BY a.student_id
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("student_stats")
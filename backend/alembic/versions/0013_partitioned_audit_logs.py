@@ -0,0 +1,136 @@
+"""monthly partitions and range indexes for audit_logs
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2025-04-07 00:00:00
+"""
+
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0013"
+down_revision = "0012"
+branch_labels = None
+depends_on = None
+
+# Partitions ahead of the current month; later months come from
+# `python -m app.db.audit_partitions ensure` run on a schedule.
+MONTHS_AHEAD = 3
+
+SINGLE_COLUMN_INDEXES = (
+    ("ix_audit_logs_actor_id", ["actor_id"]),
+    ("ix_audit_logs_entity_id", ["entity_id"]),
+    ("ix_audit_logs_entity_type", ["entity_type"]),
+)
+
+RANGE_INDEXES = (
+    ("ix_audit_logs_created_at_id", ["created_at", "id"]),
+    ("ix_audit_logs_actor_created_at_id", ["actor_id", "created_at", "id"]),
+    ("ix_audit_logs_entity_created_at_id", ["entity_type", "entity_id", "created_at", "id"]),
+)
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def upgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        for name, _ in SINGLE_COLUMN_INDEXES:
+            op.drop_index(name, table_name="audit_logs")
+        for name, columns in RANGE_INDEXES:
+            op.create_index(name, "audit_logs", columns, unique=False)
+        return
+
+    # A table cannot be turned into a partitioned one in place: rebuild it and
+    # copy the rows across. The id sequence is kept so ids stay monotonic.
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_legacy")
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY NONE")
+    for name, _ in SINGLE_COLUMN_INDEXES + (("ix_audit_logs_action", None),):
+        op.execute(f"ALTER INDEX {name} RENAME TO {name.replace('audit_logs', 'audit_logs_legacy')}")
+    op.execute(
+        """
+        CREATE TABLE audit_logs (
+            id integer NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+            actor_id integer REFERENCES users (id),
+            action varchar(255) NOT NULL,
+            entity_type varchar(255),
+            entity_id integer,
+            metadata text,
+            created_at timestamp without time zone NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+
+    oldest = op.get_bind().execute(sa.text("SELECT min(created_at) FROM audit_logs_legacy")).scalar()
+    current = _month_start(datetime.utcnow())
+    month = _month_start(oldest) if oldest is not None else current
+    last = _add_months(current, MONTHS_AHEAD)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE audit_logs_{month:%Y_%m} PARTITION OF audit_logs "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_add_months(month, 1):%Y-%m-%d}')"
+        )
+        month = _add_months(month, 1)
+
+    op.execute(
+        """
+        INSERT INTO audit_logs (id, actor_id, action, entity_type, entity_id, metadata, created_at)
+        SELECT id, actor_id, action, entity_type, entity_id, metadata, created_at FROM audit_logs_legacy
+        """
+    )
+    op.execute("DROP TABLE audit_logs_legacy")
+    op.create_index("ix_audit_logs_action", "audit_logs", ["action"], unique=False)
+    for name, columns in RANGE_INDEXES:
+        op.create_index(name, "audit_logs", columns, unique=False)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        for name, _ in RANGE_INDEXES:
+            op.drop_index(name, table_name="audit_logs")
+        for name, columns in SINGLE_COLUMN_INDEXES:
+            op.create_index(name, "audit_logs", columns, unique=False)
+        return
+
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_partitioned")
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY NONE")
+    for name, _ in RANGE_INDEXES + (("ix_audit_logs_action", None),):
+        op.execute(f"ALTER INDEX {name} RENAME TO {name.replace('audit_logs', 'audit_logs_partitioned')}")
+    op.execute(
+        """
+        CREATE TABLE audit_logs (
+            id integer PRIMARY KEY DEFAULT nextval('audit_logs_id_seq'),
+            actor_id integer REFERENCES users (id),
+            action varchar(255) NOT NULL,
+            entity_type varchar(255),
+            entity_id integer,
+            metadata text,
+            created_at timestamp without time zone NOT NULL
+        )
+        """
+    )
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+    op.execute(
+        """
+        INSERT INTO audit_logs (id, actor_id, action, entity_type, entity_id, metadata, created_at)
+        SELECT id, actor_id, action, entity_type, entity_id, metadata, created_at FROM audit_logs_partitioned
+        """
+    )
+    # Detached (archived) partitions are left alone; only attached ones go with the parent.
+    op.execute("DROP TABLE audit_logs_partitioned")
+    op.create_index("ix_audit_logs_action", "audit_logs", ["action"], unique=False)
+    for name, columns in SINGLE_COLUMN_INDEXES:
+        op.create_index(name, "audit_logs", columns, unique=False)
@@ -0,0 +1,31 @@
+"""jsonb audit metadata with a GIN index
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2025-04-14 00:00:00
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0014"
+down_revision = "0013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # SQLite keeps the JSON text as is and queries it with JSON1 functions.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    # Altering the partitioned parent rewrites every attached partition.
+    op.execute("ALTER TABLE audit_logs ALTER COLUMN metadata TYPE jsonb USING metadata::jsonb")
+    op.execute("CREATE INDEX ix_audit_logs_metadata ON audit_logs USING gin (metadata jsonb_path_ops)")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP INDEX ix_audit_logs_metadata")
+    op.execute("ALTER TABLE audit_logs ALTER COLUMN metadata TYPE text USING metadata::text")
@@ -0,0 +1,42 @@
+"""transactional outbox for background jobs
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2025-04-28 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0015"
+down_revision = "0014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "outbox_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("kind", sa.String(length=100), nullable=False),
+        sa.Column("payload", sa.JSON().with_variant(postgresql.JSONB(), "postgresql"), nullable=False),
+        sa.Column("state", sa.String(length=20), nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_attempts", sa.Integer(), nullable=False, server_default="5"),
+        sa.Column("run_after", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("locked_by", sa.String(length=100), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_outbox_jobs_kind", "outbox_jobs", ["kind"])
+    op.create_index("ix_outbox_jobs_state_run_after_id", "outbox_jobs", ["state", "run_after", "id"])
+
+
+def downgrade():
+    op.drop_index("ix_outbox_jobs_state_run_after_id", table_name="outbox_jobs")
+    op.drop_index("ix_outbox_jobs_kind", table_name="outbox_jobs")
+    op.drop_table("outbox_jobs")
@@ -0,0 +1,24 @@
+"""per-claim lease token on outbox jobs
+
+Revision ID: 0016
+Revises: 0015
+Create Date: 2025-05-05 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0016"
+down_revision = "0015"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("outbox_jobs", sa.Column("lease_token", sa.String(length=32), nullable=True))
+
+
+def downgrade():
+    op.drop_column("outbox_jobs", "lease_token")
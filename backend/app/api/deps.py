@@ -1,18 +1,21 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
-from app.db.session import get_db
+from app.core.principal_cache import attach_principal, attach_principal_async, principal_cache
+from app.db.session import get_async_db, get_db
 from app.models.user import User
+from app.repositories.aio import user_repo as aio_user_repo
 
 settings = get_settings()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.api_v1_prefix}/auth/login")
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+def _decode_token(token: str) -> tuple[int, int]:
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
         user_id: str = payload.get("sub")
@@ -20,10 +23,14 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
     except JWTError as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token") from exc
+    return int(user_id), payload.get("token_version") or 0
+
 
-    user = db.get(User, int(user_id))
+def _check_principal(user: User | None, token_version: int) -> User:
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    if (user.token_version or 0) != token_version:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
     if user.is_deleted:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Account is deleted")
     if user.status != "active":
@@ -31,9 +38,29 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         if user.status == "disabled":
             detail = "Account is disabled"
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+    principal_cache.put(user)
     return user
 
 
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+    user_id, token_version = _decode_token(token)
+    snapshot = principal_cache.get(user_id, token_version)
+    if snapshot is not None:
+        return attach_principal(db, snapshot)
+    return _check_principal(db.get(User, user_id), token_version)
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    user_id, token_version = _decode_token(token)
+    snapshot = principal_cache.get(user_id, token_version)
+    if snapshot is not None:
+        return await attach_principal_async(db, snapshot)
+    return _check_principal(await aio_user_repo.get_user(db, user_id), token_version)
+
+
 def require_roles(*roles: str):
     def _checker(current_user: User = Depends(get_current_user)) -> User:
         if current_user.role not in roles:
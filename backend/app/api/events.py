@@ -0,0 +1,63 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+import orjson
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from app.core.config import get_settings
+from app.core.pubsub import Subscription
+from app.models.user import User
+from app.services.project_event_service import ACCESS_EVENT, PRIVILEGED_ROLES, is_visible
+
+settings = get_settings()
+
+# Server-Sent Events. The subscription is taken while the request is handled, so
+# nothing committed after the response starts is missed; the body then only waits
+# on the subscriber queue and never touches the database. Comments heartbeat the
+# connection through proxies; a "reset" event tells the client it fell behind (or
+# the server is stopping) and should refetch before reconnecting, a "refetch"
+# event that one list changed but the change was too large to carry inline.
+# Access is checked when the stream opens; an "access" event (visibility, archive
+# or NDA changed) resets the streams it may concern so the client checks again.
+
+RETRY_MILLISECONDS = 3000
+
+
+def _frame(kind: str, data: dict) -> bytes:
+    return b"event: " + kind.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+async def _stream(subscription: Subscription, user: User) -> AsyncIterator[bytes]:
+    try:
+        yield f"retry: {RETRY_MILLISECONDS}\n\n".encode()
+        while True:
+            try:
+                message = await subscription.get(settings.events_heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            if message is None:
+                yield _frame("reset", {})
+                return
+            if not is_visible(user, message):
+                continue
+            if message.get("type") == ACCESS_EVENT:
+                if user.role not in PRIVILEGED_ROLES:
+                    yield _frame("reset", {})
+                    return
+                continue
+            yield _frame(message.get("type", "refetch"), message.get("data") or {})
+    finally:
+        subscription.close()
+
+
+def event_stream_response(subscription: Subscription, user: User) -> StreamingResponse:
+    return StreamingResponse(
+        _stream(subscription, user),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # The body may never be iterated (client gone before streaming started),
+        # so the generator's finally is not enough to release the subscription.
+        background=BackgroundTask(subscription.close),
+    )
@@ -0,0 +1,69 @@
+import csv
+import io
+from datetime import date, datetime
+from typing import Iterator, Literal
+
+import orjson
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+# Streaming exports. Filters are resolved into a Select while the request is
+# still being handled (so bad input is a normal 4xx); the body is then produced
+# from a server-side cursor (yield_per => stream_results) in batches. Memory stays
+# flat however many rows match, and the first batch goes out before the query
+# has been read to the end. The generator runs after the request's own session
+# has been closed, so it opens a session of its own on the same bind.
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_BATCH_SIZE = 1000
+
+_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+# Spreadsheet apps evaluate a cell starting with one of these as a formula, so
+# user-entered text (names, titles) could run one; a leading quote keeps it text.
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value).decode()
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _stream(bind: Engine, stmt: Select, fmt: ExportFormat) -> Iterator[bytes]:
+    with Session(bind=bind) as db:
+        result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        keys = list(result.keys())
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if fmt == "csv":
+            # The BOM makes Excel read the file as UTF-8 (names are mostly Cyrillic).
+            buffer.write("\ufeff")
+            writer.writerow(keys)
+            yield buffer.getvalue().encode()
+        for rows in result.partitions():
+            if fmt == "ndjson":
+                yield b"".join(orjson.dumps(dict(zip(keys, row))) + b"\n" for row in rows)
+                continue
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows([_csv_cell(value) for value in row] for row in rows)
+            yield buffer.getvalue().encode()
+
+
+def export_response(db: Session, stmt: Select, fmt: ExportFormat, name: str) -> StreamingResponse:
+    filename = f"{name}-{datetime.utcnow():%Y%m%d-%H%M%S}.{fmt}"
+    return StreamingResponse(
+        _stream(db.get_bind(), stmt, fmt),
+        media_type=_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
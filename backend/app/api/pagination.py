@@ -0,0 +1,17 @@
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.api.serialization import json_list
+from app.repositories.pagination import Page
+
+
+def paginated(request: Request, response: Response, page: Page) -> list:
+    if page.next_cursor:
+        next_url = request.url.remove_query_params("skip").include_query_params(cursor=page.next_cursor)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
+
+
+def paginated_json(request: Request, response: Response, page: Page, model: type[BaseModel]) -> Response:
+    return json_list(response, model, paginated(request, response, page))
@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 
 from app.api.v1 import (
+    admin,
     approvals,
     assignments,
     auth,
@@ -30,3 +31,4 @@ api_router.include_router(univ.router)
 api_router.include_router(reviews.router)
 api_router.include_router(portfolio.router)
 api_router.include_router(hr.router)
+api_router.include_router(admin.router)
@@ -0,0 +1,27 @@
+from functools import lru_cache
+from typing import Any, Iterable
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+# Fast JSON path for list endpoints. With a plain `response_model`, FastAPI
+# validates the returned ORM rows into the model, dumps that to Python objects
+# and then encodes them again with the stdlib json module. Here rows are read
+# into the model once and pydantic-core writes the JSON bytes directly. Routes
+# keep `response_model` for the OpenAPI schema; returning a Response bypasses
+# FastAPI's own validation. Routers that opt in also set
+# default_response_class=ORJSONResponse for their remaining endpoints.
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[model])
+
+
+def json_list(response: Response, model: type[BaseModel], items: Iterable[Any]) -> Response:
+    adapter = list_adapter(model)
+    body = adapter.dump_json(adapter.validate_python(list(items), from_attributes=True))
+    # Headers set on the injected response (pagination links, ETag) are only merged
+    # by FastAPI for non-Response return values, so carry them over here.
+    headers = {key: value for key, value in response.headers.items() if key != "content-length"}
+    return Response(content=body, media_type="application/json", headers=headers)
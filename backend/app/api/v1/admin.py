@@ -0,0 +1,78 @@
+import json
+import re
+from datetime import datetime
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.orm import Session
+
+from app.api.deps import require_roles
+from app.api.exports import ExportFormat, export_response
+from app.api.pagination import paginated
+from app.db.session import get_db
+from app.models.user import User
+from app.repositories import audit_log_repo
+from app.repositories.audit_log_repo import AuditFilter
+from app.repositories.pagination import MAX_PAGE_SIZE
+from app.schemas.audit_log import AuditLogRead
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+_METADATA_KEY = re.compile(r"^\w+$")
+
+
+def _metadata_predicate(pairs: list[str]) -> dict[str, Any]:
+    # ?metadata=task_id=42&metadata=state=needs_changes; values are read as JSON
+    # when they parse (42, true, null) and as plain strings otherwise.
+    predicate = {}
+    for pair in pairs:
+        key, sep, raw = pair.partition("=")
+        if not sep or not _METADATA_KEY.match(key):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid metadata filter: {pair}")
+        try:
+            predicate[key] = json.loads(raw)
+        except ValueError:
+            predicate[key] = raw
+    return predicate
+
+
+def _audit_filter(
+    actor_id: int | None = None,
+    entity_type: str | None = None,
+    entity_id: int | None = None,
+    action: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    metadata: list[str] = Query([], description="key=value pairs matched against the event metadata"),
+) -> AuditFilter:
+    if entity_id is not None and entity_type is None:
+        # entity ids are only unique per type, and the index is (entity_type, entity_id, ...).
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="entity_id requires entity_type")
+    if since is not None and until is not None and since >= until:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="since must be before until")
+    return AuditFilter(actor_id, entity_type, entity_id, action, since, until, _metadata_predicate(metadata))
+
+
+@router.get("/audit", response_model=list[AuditLogRead])
+def list_audit_logs(
+    request: Request,
+    response: Response,
+    filters: AuditFilter = Depends(_audit_filter),
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+    _: User = Depends(require_roles("admin")),
+):
+    page = audit_log_repo.list_audit_logs(db, filters, cursor=cursor, limit=limit)
+    return paginated(request, response, page)
+
+
+@router.get("/audit/export")
+def export_audit_logs(
+    format: ExportFormat = "ndjson",
+    filters: AuditFilter = Depends(_audit_filter),
+    db: Session = Depends(get_db),
+    _: User = Depends(require_roles("admin")),
+):
+    stmt = audit_log_repo.export_audit_logs_query(db.get_bind().dialect.name, filters)
+    return export_response(db, stmt, format, "audit")
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user, require_roles
+from app.api.pagination import paginated
 from app.db.session import get_db
 from app.models.user import User
 from app.repositories import approval_repo, task_repo
+from app.repositories.pagination import MAX_PAGE_SIZE
 from app.schemas.approval import ApprovalCreate, ApprovalRead
 from app.services.approval_service import create_approval
 
@@ -31,9 +33,14 @@ def submit_approval(
 
 @router.get("/me", response_model=list[ApprovalRead])
 def list_my_approvals(
+    request: Request,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     if current_user.role != "student":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
-    return approval_repo.list_approvals_by_student(db, current_user.id)
+    page = approval_repo.list_approvals_by_student(db, current_user.id, cursor=cursor, limit=limit)
+    return paginated(request, response, page)
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user, require_roles
+from app.api.pagination import paginated
 from app.db.session import get_db
 from app.models.assignment import Assignment
 from app.models.user import User
 from app.repositories import assignment_repo, task_repo
+from app.repositories.pagination import MAX_PAGE_SIZE
 from app.schemas.assignment import AssignmentCreate, AssignmentRead, AssignmentUpdate
 from app.services.assignment_service import request_assignment, update_assignment_state
 
@@ -26,12 +28,16 @@ def create_assignment(
 
 @router.get("/me", response_model=list[AssignmentRead])
 def list_my_assignments(
-    skip: int = 0,
-    limit: int = 20,
+    request: Request,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    skip: int = Query(0, ge=0),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_roles("student", "curator", "mentor", "manager", "admin")),
 ):
-    return assignment_repo.list_assignments_for_student(db, current_user.id, skip, limit)
+    page = assignment_repo.list_assignments_for_student(db, current_user.id, cursor=cursor, limit=limit, skip=skip)
+    return paginated(request, response, page)
 
 
 @router.patch("/{assignment_id}", response_model=AssignmentRead)
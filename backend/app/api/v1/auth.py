@@ -1,52 +1,44 @@
-import time
-from fastapi import APIRouter, Body, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Body, Depends, HTTPException, status
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_current_user_async
 from app.core.config import get_settings
-from app.core.security import create_access_token, create_refresh_token, get_password_hash, verify_password
+from app.core.rate_limit import rate_limit
+from app.core.security import create_access_token, create_refresh_token
 from app.db.session import get_db
 from app.schemas.auth import ChangePasswordRequest, LoginRequest, TokenPair
 from app.models.user import User
 from app.schemas.user import UserCreate, UserRead
-from app.services.auth_service import authenticate_user, register_user
-from app.services.audit_service import log_action
+from app.services.auth_service import authenticate_user, change_password, register_user
 
 settings = get_settings()
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 RATE_LIMIT_WINDOW = 60
 RATE_LIMIT_MAX = 10
-_rate_limit_store: dict[str, list[float]] = {}
 
 
-def _enforce_rate_limit(request: Request, key: str):
-    now = time.time()
-    client_host = request.client.host if request and request.client else "unknown"
-    bucket_key = f"{key}:{client_host}"
-    events = _rate_limit_store.get(bucket_key, [])
-    events = [ts for ts in events if now - ts < RATE_LIMIT_WINDOW]
-    if len(events) >= RATE_LIMIT_MAX:
-        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Too many requests")
-    events.append(now)
-    _rate_limit_store[bucket_key] = events
-
-
-@router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def register(
+@router.post(
+    "/register",
+    response_model=UserRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("register", RATE_LIMIT_MAX, RATE_LIMIT_WINDOW))],
+)
+async def register(
     payload: UserCreate,
-    request: Request,
     db: Session = Depends(get_db),
 ):
-    _enforce_rate_limit(request, "register")
-    return register_user(db, payload.email, payload.full_name, payload.password)
+    return await register_user(db, payload.email, payload.full_name, payload.password)
 
 
-@router.post("/login", response_model=TokenPair)
-def login(payload: LoginRequest, request: Request, db: Session = Depends(get_db)):
-    _enforce_rate_limit(request, "login")
-    access, refresh = authenticate_user(db, payload.email, payload.password)
+@router.post(
+    "/login",
+    response_model=TokenPair,
+    dependencies=[Depends(rate_limit("login", RATE_LIMIT_MAX, RATE_LIMIT_WINDOW))],
+)
+async def login(payload: LoginRequest, db: Session = Depends(get_db)):
+    access, refresh = await authenticate_user(db, payload.email, payload.password)
     return TokenPair(access_token=access, refresh_token=refresh)
 
 
@@ -82,21 +74,15 @@ def logout():
 
 
 @router.get("/me", response_model=UserRead)
-def me(current_user=Depends(get_current_user)):
+async def me(current_user=Depends(get_current_user_async)):
     return current_user
 
 
 @router.post("/change-password")
-def change_password(
+async def change_password_endpoint(
     payload: ChangePasswordRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    if not verify_password(payload.old_password, current_user.password_hash):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid old password")
-    current_user.password_hash = get_password_hash(payload.new_password)
-    current_user.token_version = (current_user.token_version or 0) + 1
-    db.add(current_user)
-    db.commit()
-    log_action(db, actor_id=current_user.id, action="password_changed", entity_type="user", entity_id=current_user.id)
+    await change_password(db, current_user, payload.old_password, payload.new_password)
     return {"message": "Password updated"}
@@ -1,11 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user
-from app.db.session import get_db
-from app.models.comment import Comment
+from app.api.deps import get_current_user, get_current_user_async
+from app.api.pagination import paginated
+from app.db.session import get_async_db, get_db
+from app.db.unit_of_work import save
 from app.models.user import User
 from app.repositories import assignment_repo, comment_repo, task_repo
+from app.repositories.aio import assignment_repo as aio_assignment_repo
+from app.repositories.aio import comment_repo as aio_comment_repo
+from app.repositories.aio import task_repo as aio_task_repo
+from app.repositories.pagination import MAX_PAGE_SIZE
 from app.schemas.comment import CommentCreate, CommentRead, CommentUpdate
 from app.services.comment_service import create_comment
 
@@ -35,21 +41,25 @@ def create_comment_endpoint(
 
 
 @router.get("", response_model=list[CommentRead])
-def list_comments(
+async def list_comments(
     task_id: int,
-    skip: int = 0,
-    limit: int = 50,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    skip: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    task = task_repo.get_task(db, task_id)
+    task = await aio_task_repo.get_task(db, task_id)
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
     if task.nda_required and current_user.role == "student":
-        assignment = assignment_repo.find_assignment(db, task.id, current_user.id)
+        assignment = await aio_assignment_repo.find_assignment(db, task.id, current_user.id)
         if not assignment or not assignment.nda_accepted:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="NDA required for comments")
-    return comment_repo.list_comments(db, task_id, skip, limit)
+    page = await aio_comment_repo.list_comments(db, task_id, cursor=cursor, limit=limit, skip=skip)
+    return paginated(request, response, page)
 
 
 @router.patch("/{comment_id}", response_model=CommentRead)
@@ -71,9 +81,7 @@ def update_comment(
         comment.recipient_id = payload.recipient_id
     if payload.meeting_info is not None:
         comment.meeting_info = payload.meeting_info
-    db.add(comment)
-    db.commit()
-    db.refresh(comment)
+    save(db, comment)
     return comment
 
 
@@ -1,46 +1,61 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy import func
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy import Select
 from sqlalchemy.orm import Session
 
 from app.api.deps import require_roles
+from app.api.exports import ExportFormat, export_response
+from app.api.pagination import paginated
+from app.core.config import get_settings
 from app.db.session import get_db
-from app.models.assignment import Assignment
-from app.models.review import Review
 from app.models.user import User
+from app.repositories import student_stats_repo
+from app.repositories.pagination import MAX_PAGE_SIZE, keyset_page, keyset_query
 from app.schemas.hr import HrStudentSummary
 
 router = APIRouter(prefix="/hr", tags=["hr"])
+settings = get_settings()
+
+
+def _ranked_students(
+    skills: str | None = None,
+    min_rating: float | None = Query(None, ge=0),
+    min_completed: int | None = Query(None, ge=0),
+    ranking: Literal["average", "bayesian"] = "average",
+) -> tuple[Select, tuple]:
+    return student_stats_repo.ranked_students_query(
+        bayesian=ranking == "bayesian",
+        prior_weight=settings.hr_bayesian_prior_weight,
+        skills=[skill.strip() for skill in (skills or "").split(",") if skill.strip()],
+        min_rating=min_rating,
+        min_completed=min_completed,
+    )
 
 
 @router.get("/dashboard", response_model=list[HrStudentSummary])
 def hr_dashboard(
+    request: Request,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    ranked: tuple[Select, tuple] = Depends(_ranked_students),
+    db: Session = Depends(get_db),
+    _: User = Depends(require_roles("hr", "manager", "admin")),
+):
+    q, keys = ranked
+    rows = db.execute(keyset_query(q, keys, cursor, limit)).all()
+    page = keyset_page(rows, keys, limit)
+    items = [HrStudentSummary(**row._mapping) for row in page.items]
+    return paginated(request, response, page._replace(items=items))
+
+
+@router.get("/dashboard/export")
+def export_hr_dashboard(
+    format: ExportFormat = "csv",
+    ranked: tuple[Select, tuple] = Depends(_ranked_students),
     db: Session = Depends(get_db),
     _: User = Depends(require_roles("hr", "manager", "admin")),
 ):
-    students = db.query(User).filter(User.role == "student", User.status == "active").all()
-    response: list[HrStudentSummary] = []
-    for student in students:
-        completed = (
-            db.query(func.count(Assignment.id))
-            .filter(Assignment.student_id == student.id, Assignment.state == "done")
-            .scalar()
-            or 0
-        )
-        avg_rating = (
-            db.query(func.avg(Review.rating))
-            .join(Review.assignment)
-            .filter(Review.assignment.has(student_id=student.id))
-            .scalar()
-        )
-        response.append(
-            HrStudentSummary(
-                id=student.id,
-                full_name=student.full_name,
-                email=student.email,
-                skills=student.skills,
-                completed_projects=completed,
-                average_rating=float(avg_rating) if avg_rating is not None else None,
-            )
-        )
-    response.sort(key=lambda item: (item.average_rating or 0, item.completed_projects), reverse=True)
-    return response
+    q, keys = ranked
+    return export_response(db, q.order_by(*(key.desc() for key in keys)), format, "hr-students")
@@ -1,18 +1,26 @@
+import io
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
 from app.api.deps import require_roles
+from app.api.exports import ExportFormat, export_response
+from app.api.pagination import paginated_json
+from app.core.config import get_settings
+from app.core.principal_cache import invalidate_principal
 from app.db.session import get_db
-from app.models.assignment import Assignment
-from app.models.review import Review
-from app.models.task import Task
+from app.db.unit_of_work import save
 from app.models.user import User
-from app.repositories import assignment_repo, task_mentor_repo, task_repo, user_repo
+from app.repositories import assignment_repo, load_options, task_mentor_repo, task_repo, user_repo
+from app.repositories.dataloader import get_loader
+from app.repositories.pagination import MAX_PAGE_SIZE
 from app.schemas.assignment import AssignmentRead
+from app.schemas.imports import ImportReport
 from app.schemas.manager import (
+    ApplicationDecisionResult,
     ApplicationWithStudent,
+    BulkDecisionRequest,
     ManagerDashboard,
     ManagerUserCreate,
     StudentStats,
@@ -22,12 +30,16 @@ from app.schemas.manager import (
 from app.schemas.task import TaskCreate, TaskRead, TaskUpdate
 from app.schemas.team import TaskMentorRead
 from app.schemas.user import UserRead
-from app.services.assignment_service import decide_assignment
+from app.services import import_service, student_stats_service
+from app.services.assignment_service import bulk_decide_assignments, decide_assignment
 from app.services.audit_service import log_action
 from app.services.auth_service import create_user_with_role
+from app.services.dashboard_service import get_manager_dashboard
 from app.services.task_service import create_task, update_task
 
-router = APIRouter(prefix="/manager", tags=["manager"])
+settings = get_settings()
+
+router = APIRouter(prefix="/manager", tags=["manager"], default_response_class=ORJSONResponse)
 
 
 @router.get("/dashboard", response_model=ManagerDashboard)
@@ -35,35 +47,21 @@ def manager_dashboard(
     db: Session = Depends(get_db),
     _: User = Depends(require_roles("manager", "admin")),
 ):
-    total_projects = db.query(func.count(Task.id)).scalar() or 0
-    active_projects = db.query(func.count(Task.id)).filter(Task.status.in_(["open", "in_progress"])).scalar() or 0
-    pending_applications = (
-        db.query(func.count(Assignment.id)).filter(Assignment.state == "requested").scalar() or 0
-    )
-    students = (
-        db.query(func.count(User.id))
-        .filter(User.role == "student", User.status == "active")
-        .scalar()
-        or 0
-    )
-    mentors = db.query(func.count(User.id)).filter(User.role == "mentor").scalar() or 0
-    return ManagerDashboard(
-        total_projects=total_projects,
-        active_projects=active_projects,
-        pending_applications=pending_applications,
-        students=students,
-        mentors=mentors,
-    )
+    return get_manager_dashboard(db)
 
 
 @router.get("/projects", response_model=list[TaskRead])
 def list_projects(
-    skip: int = 0,
-    limit: int = 50,
+    request: Request,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    skip: int = Query(0, ge=0),
     db: Session = Depends(get_db),
     _: User = Depends(require_roles("manager", "admin")),
 ):
-    return task_repo.list_tasks(db, skip, limit, None, None, None)
+    page = task_repo.list_tasks(db, None, None, None, cursor=cursor, limit=limit, skip=skip)
+    return paginated_json(request, response, page, TaskRead)
 
 
 @router.post("/projects", response_model=TaskRead)
@@ -81,7 +79,7 @@ def get_project(
     db: Session = Depends(get_db),
     _: User = Depends(require_roles("manager", "admin")),
 ):
-    task = task_repo.get_task(db, task_id)
+    task = task_repo.get_task(db, task_id, load_options.TASK_READ)
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     return task
@@ -94,7 +92,7 @@ def update_project(
     db: Session = Depends(get_db),
     _: User = Depends(require_roles("manager", "admin")),
 ):
-    task = task_repo.get_task(db, task_id)
+    task = task_repo.get_task(db, task_id, load_options.TASK_READ)
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     return update_task(db, task, payload)
@@ -106,7 +104,7 @@ def archive_project(
     db: Session = Depends(get_db),
     _: User = Depends(require_roles("manager", "admin")),
 ):
-    task = task_repo.get_task(db, task_id)
+    task = task_repo.get_task(db, task_id, load_options.TASK_READ)
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     return update_task(db, task, TaskUpdate(status="closed", is_archived=True))
@@ -118,7 +116,7 @@ def unarchive_project(
     db: Session = Depends(get_db),
     _: User = Depends(require_roles("manager", "admin")),
 ):
-    task = task_repo.get_task(db, task_id)
+    task = task_repo.get_task(db, task_id, load_options.TASK_READ)
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     return update_task(db, task, TaskUpdate(status="open", is_archived=False))
@@ -134,6 +132,8 @@ def list_project_applications(
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     assignments = assignment_repo.list_assignments_for_task(db, task_id)
+    students = get_loader(db, User.id).load_many(assignment.student_id for assignment in assignments)
+    stats = student_stats_service.get_student_stats_map(db, list(students))
     result = []
     for assignment in assignments:
         result.append(
@@ -148,8 +148,8 @@ def list_project_applications(
                 decision_reason=assignment.decision_reason,
                 created_at=assignment.created_at,
                 updated_at=assignment.updated_at,
-                student=assignment.student,
-                stats=_student_stats(db, assignment.student_id),
+                student=students[assignment.student_id],
+                stats=stats[assignment.student_id],
             )
         )
     return result
@@ -196,6 +196,15 @@ def reject_application(
     return updated
 
 
+@router.post("/applications/bulk-decide", response_model=list[ApplicationDecisionResult])
+def bulk_decide_applications(
+    payload: BulkDecisionRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles("manager", "admin")),
+):
+    return bulk_decide_assignments(db, payload.decisions, decided_by=current_user.id)
+
+
 @router.patch("/applications/{assignment_id}/role", response_model=AssignmentRead)
 def update_application_role(
     assignment_id: int,
@@ -236,26 +245,28 @@ def create_curator(
 
 @router.get("/mentors", response_model=list[UserRead])
 def list_mentors(
+    request: Request,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     _: User = Depends(require_roles("manager", "admin")),
 ):
-    return (
-        db.query(User)
-        .filter(User.role == "mentor", User.status == "active", User.is_deleted.is_(False))
-        .all()
-    )
+    page = user_repo.list_users_by_role(db, "mentor", "active", cursor=cursor, limit=limit)
+    return paginated_json(request, response, page, UserRead)
 
 
 @router.get("/curators", response_model=list[UserRead])
 def list_curators(
+    request: Request,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     _: User = Depends(require_roles("manager", "admin")),
 ):
-    return (
-        db.query(User)
-        .filter(User.role == "curator", User.status == "active", User.is_deleted.is_(False))
-        .all()
-    )
+    page = user_repo.list_users_by_role(db, "curator", "active", cursor=cursor, limit=limit)
+    return paginated_json(request, response, page, UserRead)
 
 
 @router.get("/projects/{task_id}/mentors", response_model=list[TaskMentorRead])
@@ -268,14 +279,15 @@ def list_task_mentors(
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     links = task_mentor_repo.list_task_mentors(db, task_id)
+    mentors = get_loader(db, User.id).load_many(link.mentor_id for link in links)
     result = []
     for link in links:
         result.append(
             TaskMentorRead(
                 id=link.id,
                 mentor_id=link.mentor_id,
-                full_name=link.mentor.full_name,
-                email=link.mentor.email,
+                full_name=mentors[link.mentor_id].full_name,
+                email=mentors[link.mentor_id].email,
             )
         )
     return result
@@ -329,9 +341,8 @@ def delete_mentor(
     mentor.status = "disabled"
     mentor.is_deleted = True
     mentor.token_version = (mentor.token_version or 0) + 1
-    db.add(mentor)
-    db.commit()
-    db.refresh(mentor)
+    save(db, mentor)
+    invalidate_principal(db, mentor.id)
     return mentor
 
 
@@ -347,31 +358,61 @@ def delete_curator(
     curator.status = "disabled"
     curator.is_deleted = True
     curator.token_version = (curator.token_version or 0) + 1
-    db.add(curator)
-    db.commit()
-    db.refresh(curator)
+    save(db, curator)
+    invalidate_principal(db, curator.id)
     return curator
 
 
 @router.get("/students", response_model=list[StudentWithStats])
 def list_students(
+    request: Request,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     _: User = Depends(require_roles("manager", "admin")),
 ):
-    students = user_repo.list_users_by_role(db, "student", 0, 200)
-    response = []
-    for student in students:
+    page = user_repo.list_users_by_role(db, "student", cursor=cursor, limit=limit)
+    stats = student_stats_service.get_student_stats_map(db, [student.id for student in page.items])
+    items = []
+    for student in page.items:
         summary = StudentSummary.model_validate(student)
-        response.append(StudentWithStats(**summary.model_dump(), stats=_student_stats(db, student.id)))
-    return response
+        items.append(StudentWithStats(**summary.model_dump(), stats=stats[student.id]))
+    return paginated_json(request, response, page._replace(items=items), StudentWithStats)
+
+
+@router.get("/students/export")
+def export_students(
+    format: ExportFormat = "csv",
+    user_status: str | None = None,
+    db: Session = Depends(get_db),
+    _: User = Depends(require_roles("manager", "admin", "hr")),
+):
+    return export_response(db, user_repo.export_students_query(user_status), format, "students")
+
+
+@router.get("/applications/export")
+def export_applications(
+    format: ExportFormat = "csv",
+    task_id: int | None = None,
+    state: str | None = None,
+    db: Session = Depends(get_db),
+    _: User = Depends(require_roles("manager", "admin")),
+):
+    return export_response(db, assignment_repo.export_applications_query(task_id, state), format, "applications")
 
 
 @router.get("/students/pending", response_model=list[StudentSummary])
 def list_pending_students(
+    request: Request,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     _: User = Depends(require_roles("manager", "admin")),
 ):
-    return db.query(User).filter(User.role == "student", User.status == "pending").all()
+    page = user_repo.list_users_by_role(db, "student", "pending", cursor=cursor, limit=limit)
+    return paginated_json(request, response, page, StudentSummary)
 
 
 @router.post("/students/{student_id}/approve", response_model=UserRead)
@@ -384,9 +425,8 @@ def approve_student(
     if not student or student.role != "student":
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
     student.status = "active"
-    db.add(student)
-    db.commit()
-    db.refresh(student)
+    save(db, student)
+    invalidate_principal(db, student.id)
     log_action(
         db,
         actor_id=current_user.id,
@@ -407,9 +447,8 @@ def reject_student(
     if not student or student.role != "student":
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
     student.status = "disabled"
-    db.add(student)
-    db.commit()
-    db.refresh(student)
+    save(db, student)
+    invalidate_principal(db, student.id)
     log_action(
         db,
         actor_id=current_user.id,
@@ -429,47 +468,40 @@ def student_stats(
     student = db.get(User, student_id)
     if not student or student.role != "student":
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
-    return _student_stats(db, student_id)
+    return student_stats_service.get_student_stats(db, student_id)
+
+
+def _csv_lines(file: UploadFile, max_rows: int | None = None) -> io.TextIOWrapper:
+    # Parsed as it is read; utf-8-sig drops the BOM spreadsheet apps put in front.
+    if max_rows is not None:
+        # Counts physical lines, so a quoted multi-line cell only errs on the safe side.
+        rows = sum(1 for _ in file.file) - 1
+        file.file.seek(0)
+        if rows > max_rows:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"At most {max_rows} rows per upload; import larger files with python -m app.db.bulk_import",
+            )
+    return io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
 
 
-def _student_stats(db: Session, student_id: int) -> StudentStats:
-    total = db.query(func.count(Assignment.id)).filter(Assignment.student_id == student_id).scalar() or 0
-    approved = (
-        db.query(func.count(Assignment.id))
-        .filter(Assignment.student_id == student_id, Assignment.state == "active")
-        .scalar()
-        or 0
-    )
-    rejected = (
-        db.query(func.count(Assignment.id))
-        .filter(Assignment.student_id == student_id, Assignment.state == "canceled")
-        .scalar()
-        or 0
-    )
-    completed = (
-        db.query(func.count(Assignment.id))
-        .filter(Assignment.student_id == student_id, Assignment.state == "done")
-        .scalar()
-        or 0
-    )
-    review_count = (
-        db.query(func.count(Review.id))
-        .join(Review.assignment)
-        .filter(Review.assignment.has(student_id=student_id))
-        .scalar()
-        or 0
-    )
-    average_rating = (
-        db.query(func.avg(Review.rating))
-        .join(Review.assignment)
-        .filter(Review.assignment.has(student_id=student_id))
-        .scalar()
-    )
-    return StudentStats(
-        applications_total=total,
-        applications_approved=approved,
-        applications_rejected=rejected,
-        projects_completed=completed,
-        reviews_count=review_count,
-        average_rating=float(average_rating) if average_rating is not None else None,
-    )
+@router.post("/import/users", response_model=ImportReport)
+def import_users(
+    file: UploadFile,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles("manager", "admin")),
+):
+    # bcrypt makes user rows expensive, so a request only takes files it can
+    # finish in reasonable time.
+    lines = _csv_lines(file, settings.import_users_max_upload_rows)
+    return import_service.import_users(db, lines, actor_id=current_user.id)
+
+
+@router.post("/import/tasks", response_model=ImportReport)
+def import_tasks(
+    file: UploadFile,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles("manager", "admin")),
+):
+    return import_service.import_tasks(db, _csv_lines(file), actor_id=current_user.id, actor_role=current_user.role)
+
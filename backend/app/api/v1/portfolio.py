@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import require_roles
+from app.api.pagination import paginated
 from app.db.session import get_db
 from app.models.user import User
-from app.repositories import portfolio_repo, review_repo
+from app.models.review import Review
+from app.repositories import portfolio_repo
+from app.repositories.dataloader import get_loader
+from app.repositories.pagination import MAX_PAGE_SIZE
 from app.schemas.portfolio import PortfolioEntryRead
 
 router = APIRouter(prefix="/portfolio", tags=["portfolio"])
@@ -12,14 +16,19 @@ router = APIRouter(prefix="/portfolio", tags=["portfolio"])
 
 @router.get("/me", response_model=list[PortfolioEntryRead])
 def list_my_portfolio(
+    request: Request,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_roles("student")),
 ):
-    entries = portfolio_repo.list_portfolio_entries_for_student(db, current_user.id)
-    response = []
-    for entry in entries:
-        review = review_repo.get_review_by_assignment(db, entry.assignment_id)
-        response.append(
+    page = portfolio_repo.list_portfolio_entries_for_student(db, current_user.id, cursor=cursor, limit=limit)
+    reviews = get_loader(db, Review.assignment_id).load_many(entry.assignment_id for entry in page.items)
+    items = []
+    for entry in page.items:
+        review = reviews[entry.assignment_id]
+        items.append(
             PortfolioEntryRead(
                 id=entry.id,
                 student_id=entry.student_id,
@@ -31,4 +40,4 @@ def list_my_portfolio(
                 created_at=entry.created_at,
             )
         )
-    return response
+    return paginated(request, response, page._replace(items=items))
@@ -1,19 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user, require_roles
-from app.db.session import get_db
+from app.api.conditional import entity_tag, not_modified
+from app.api.deps import get_current_user, get_current_user_async, require_roles
+from app.api.events import event_stream_response
+from app.api.exports import ExportFormat, export_response
+from app.api.pagination import paginated_json
+from app.core.pubsub import get_broker
+from app.db.session import get_async_db, get_db
 from app.models.task import Task
-from app.models.task_mentor import TaskMentor
 from app.models.user import User
-from app.repositories import assignment_repo, task_repo
+from app.repositories import assignment_repo, load_options, tag_repo, task_repo
+from app.repositories.aio import assignment_repo as aio_assignment_repo
+from app.repositories.dataloader import get_loader
+from app.repositories.aio import task_repo as aio_task_repo
+from app.repositories.pagination import MAX_PAGE_SIZE
 from app.schemas.assignment import AssignmentRead, AssignmentRequest
-from app.schemas.task import TaskRead, TaskUpdate
+from app.schemas.task import TaskFacets, TaskRead, TaskUpdate
 from app.schemas.team import TeamMemberRead
+from app.services import project_event_service
 from app.services.assignment_service import request_assignment
 from app.services.task_service import update_task
 
-router = APIRouter(prefix="/projects", tags=["projects"])
+router = APIRouter(prefix="/projects", tags=["projects"], default_response_class=ORJSONResponse)
 
 
 def _can_view_contacts(current_user: User, task: Task, db: Session) -> bool:
@@ -29,83 +43,139 @@ def _can_view_contacts(current_user: User, task: Task, db: Session) -> bool:
     return True
 
 
+def _projects_query(
+    current_user: User,
+    status_filter: str | None,
+    tag: str | None,
+    tag_match: str,
+    query: str | None,
+) -> Select:
+    tags = tag_repo.tag_filter(tag, tag_match)
+    if current_user.role in {"manager", "admin", "hr", "academic_partnership_admin"}:
+        return task_repo.filter_tasks_query(status_filter, tags, query)
+    if current_user.role in {"univ_teacher", "univ_supervisor", "univ_admin"}:
+        return task_repo.filter_tasks_query(status_filter, tags, query)
+    if current_user.role == "curator":
+        return task_repo.filter_curator_tasks_query(current_user.id, status_filter, tags, query)
+    if current_user.role == "mentor":
+        return task_repo.filter_mentor_tasks_query(current_user.id, status_filter, tags, query)
+    return task_repo.filter_public_tasks_query(tags, query)
+
+
 @router.get("", response_model=list[TaskRead])
-def list_projects(
-    skip: int = 0,
-    limit: int = 20,
+async def list_projects(
+    request: Request,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    skip: int = Query(0, ge=0),
+    status_filter: str | None = None,
+    tag: str | None = None,
+    tag_match: Literal["any", "all"] = "any",
+    query: str | None = None,
+    search: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    query = (query or search or "").strip() or None
+    q = _projects_query(current_user, status_filter, tag, tag_match, query)
+    freshness = await aio_task_repo.task_freshness(db, q)
+    etag = entity_tag(
+        "projects", str(request.url.query), current_user.role, current_user.id, freshness.updated_at, freshness.total
+    )
+    if (cached := not_modified(request, response, etag, freshness.updated_at)) is not None:
+        return cached
+    page = await aio_task_repo.page_tasks(db, q, query, cursor=cursor, limit=limit, skip=skip)
+    return paginated_json(request, response, page, TaskRead)
+
+
+@router.get("/facets", response_model=TaskFacets)
+async def project_facets(
+    status_filter: str | None = None,
+    tag: str | None = None,
+    tag_match: Literal["any", "all"] = "any",
+    query: str | None = None,
+    search: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    query = (query or search or "").strip() or None
+    return await aio_task_repo.task_facets(db, _projects_query(current_user, status_filter, tag, tag_match, query))
+
+
+@router.get("/export")
+def export_projects(
+    format: ExportFormat = "csv",
     status_filter: str | None = None,
     tag: str | None = None,
+    tag_match: Literal["any", "all"] = "any",
     query: str | None = None,
     search: str | None = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     query = (query or search or "").strip() or None
-    if current_user.role in {"manager", "admin", "hr", "academic_partnership_admin"}:
-        return task_repo.list_tasks(db, skip, limit, status_filter, tag, query)
-    if current_user.role in {"univ_teacher", "univ_supervisor", "univ_admin"}:
-        return task_repo.list_tasks(db, skip, limit, status_filter, tag, query)
-    if current_user.role == "curator":
-        q = db.query(Task).filter(
-            (Task.curator_id == current_user.id) | (Task.created_by == current_user.id)
-        )
-        if status_filter:
-            q = q.filter(Task.status == status_filter)
-        if tag:
-            q = q.filter(Task.tags.ilike(f"%{tag}%"))
-        if query:
-            q = q.filter(Task.title.ilike(f"%{query}%"))
-        return q.offset(skip).limit(limit).all()
-    if current_user.role == "mentor":
-        q = (
-            db.query(Task)
-            .outerjoin(TaskMentor, TaskMentor.task_id == Task.id)
-            .filter((Task.mentor_id == current_user.id) | (TaskMentor.mentor_id == current_user.id))
-            .distinct()
-        )
-        if status_filter:
-            q = q.filter(Task.status == status_filter)
-        if tag:
-            q = q.filter(Task.tags.ilike(f"%{tag}%"))
-        if query:
-            q = q.filter(Task.title.ilike(f"%{query}%"))
-        return q.offset(skip).limit(limit).all()
-    q = (
-        db.query(Task)
-        .filter(Task.visibility == "public")
-        .filter(Task.status.in_(["open", "in_progress"]))
-        .filter(Task.is_archived.is_(False))
-    )
-    if query:
-        q = q.filter(Task.title.ilike(f"%{query}%"))
-    return q.offset(skip).limit(limit).all()
+    q = _projects_query(current_user, status_filter, tag, tag_match, query)
+    return export_response(db, task_repo.export_query(q), format, "projects")
 
 
 @router.get("/{project_id}", response_model=TaskRead)
-def get_project(
+async def get_project(
     project_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    task = task_repo.get_task(db, project_id)
-    if not task:
+    validator = await aio_task_repo.get_task_validator(db, project_id)
+    if not validator:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
-    if current_user.role == "student" and task.is_archived:
+    if current_user.role == "student" and validator.is_archived:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
-    if current_user.role == "student" and task.visibility != "public":
+    if current_user.role == "student" and validator.visibility != "public":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
-    if current_user.role == "student" and task.nda_required:
-        assignment = assignment_repo.find_assignment(db, task.id, current_user.id)
-        if not assignment or not assignment.nda_accepted:
-            task.description = "Доступно после подтверждения NDA"
-            task.goal = None
-            task.key_tasks = None
-            task.novelty = None
-            task.skills_required = None
-            task.course_alignment = None
+    nda_masked = False
+    if current_user.role == "student" and validator.nda_required:
+        assignment = await aio_assignment_repo.find_assignment(db, project_id, current_user.id)
+        nda_masked = not assignment or not assignment.nda_accepted
+    etag = entity_tag("project", project_id, validator.updated_at, "nda-masked" if nda_masked else "full")
+    if (cached := not_modified(request, response, etag, validator.updated_at)) is not None:
+        return cached
+    task = await aio_task_repo.get_task(db, project_id, load_options.TASK_READ)
+    if not task:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    if nda_masked:
+        task.description = "Доступно после подтверждения NDA"
+        task.goal = None
+        task.key_tasks = None
+        task.novelty = None
+        task.skills_required = None
+        task.course_alignment = None
     return task
 
 
+@router.get("/{project_id}/events")
+async def project_events(
+    project_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    validator = await aio_task_repo.get_task_validator(db, project_id)
+    if not validator:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    if current_user.role == "student":
+        if validator.is_archived:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+        if validator.visibility != "public":
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+        if validator.nda_required:
+            assignment = await aio_assignment_repo.find_assignment(db, project_id, current_user.id)
+            if not assignment or not assignment.nda_accepted:
+                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="NDA required for comments")
+    subscription = get_broker().subscribe(project_event_service.topic(project_id))
+    return event_stream_response(subscription, current_user)
+
+
 @router.patch("/{project_id}", response_model=TaskRead)
 def update_project(
     project_id: int,
@@ -113,7 +183,7 @@ def update_project(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_roles("curator", "manager", "admin")),
 ):
-    task = task_repo.get_task(db, project_id)
+    task = task_repo.get_task(db, project_id, load_options.TASK_READ)
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     if current_user.role == "curator" and task.curator_id not in {current_user.id, None}:
@@ -128,7 +198,7 @@ def archive_project(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_roles("curator", "manager", "admin")),
 ):
-    task = task_repo.get_task(db, project_id)
+    task = task_repo.get_task(db, project_id, load_options.TASK_READ)
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     if current_user.role == "curator" and task.curator_id not in {current_user.id, None}:
@@ -143,7 +213,7 @@ def unarchive_project(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_roles("curator", "manager", "admin")),
 ):
-    task = task_repo.get_task(db, project_id)
+    task = task_repo.get_task(db, project_id, load_options.TASK_READ)
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     if current_user.role == "curator" and task.curator_id not in {current_user.id, None}:
@@ -176,12 +246,15 @@ def list_project_team(
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     can_view_contacts = _can_view_contacts(current_user, task, db)
-    assignments = assignment_repo.list_assignments_for_task(db, project_id)
+    assignments = [
+        assignment
+        for assignment in assignment_repo.list_assignments_for_task(db, project_id)
+        if assignment.state in {"active", "done"}
+    ]
+    students = get_loader(db, User.id).load_many(assignment.student_id for assignment in assignments)
     team = []
     for assignment in assignments:
-        if assignment.state not in {"active", "done"}:
-            continue
-        student = assignment.student
+        student = students[assignment.student_id]
         team.append(
             TeamMemberRead(
                 user_id=student.id,
@@ -1,12 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user
-from app.db.session import get_db
+from app.api.deps import get_current_user, get_current_user_async
+from app.api.pagination import paginated
+from app.db.session import get_async_db, get_db
 from app.models.user import User
-from app.repositories import assignment_repo, comment_repo, task_repo
+from app.repositories import assignment_repo, task_repo
+from app.repositories.aio import assignment_repo as aio_assignment_repo
+from app.repositories.aio import comment_repo as aio_comment_repo
+from app.repositories.aio import task_repo as aio_task_repo
+from app.repositories.pagination import MAX_PAGE_SIZE
 from app.schemas.comment import CommentCreate, CommentRead
 from app.services.comment_service import create_comment
+from app.services.project_event_service import PRIVILEGED_ROLES
 
 router = APIRouter(prefix="/questions", tags=["questions"])
 
@@ -16,17 +23,7 @@ def _can_view_question(current_user: User, question) -> bool:
         return True
     if question.author_id == current_user.id or question.recipient_id == current_user.id:
         return True
-    return current_user.role in {
-        "manager",
-        "admin",
-        "mentor",
-        "curator",
-        "univ_teacher",
-        "univ_supervisor",
-        "univ_admin",
-        "hr",
-        "academic_partnership_admin",
-    }
+    return current_user.role in PRIVILEGED_ROLES
 
 
 @router.post("", response_model=CommentRead)
@@ -54,19 +51,23 @@ def create_question(
 
 
 @router.get("", response_model=list[CommentRead])
-def list_questions(
+async def list_questions(
     task_id: int,
-    skip: int = 0,
-    limit: int = 50,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    skip: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    task = task_repo.get_task(db, task_id)
+    task = await aio_task_repo.get_task(db, task_id)
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
     if task.nda_required and current_user.role == "student":
-        assignment = assignment_repo.find_assignment(db, task.id, current_user.id)
+        assignment = await aio_assignment_repo.find_assignment(db, task.id, current_user.id)
         if not assignment or not assignment.nda_accepted:
             return []
-    questions = comment_repo.list_questions(db, task_id, skip, limit)
-    return [question for question in questions if _can_view_question(current_user, question)]
+    page = await aio_comment_repo.list_questions(db, task_id, cursor=cursor, limit=limit, skip=skip)
+    visible = [question for question in page.items if _can_view_question(current_user, question)]
+    return paginated(request, response, page._replace(items=visible))
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import require_roles
+from app.api.pagination import paginated
 from app.db.session import get_db
 from app.models.user import User
 from app.repositories import assignment_repo, review_repo
+from app.repositories.pagination import MAX_PAGE_SIZE
 from app.schemas.review import ReviewCreate, ReviewRead
 from app.services.review_service import create_review
 
@@ -34,15 +36,24 @@ def create_review_endpoint(
 @router.get("/student/{student_id}", response_model=list[ReviewRead])
 def list_reviews_for_student(
     student_id: int,
+    request: Request,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     _: User = Depends(require_roles("mentor", "curator", "manager", "admin")),
 ):
-    return review_repo.list_reviews_for_student(db, student_id)
+    return paginated(request, response, review_repo.list_reviews_for_student(db, student_id, cursor=cursor, limit=limit))
 
 
 @router.get("/me", response_model=list[ReviewRead])
 def list_my_reviews(
+    request: Request,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_roles("student")),
 ):
-    return review_repo.list_reviews_for_student(db, current_user.id)
+    page = review_repo.list_reviews_for_student(db, current_user.id, cursor=cursor, limit=limit)
+    return paginated(request, response, page)
@@ -1,15 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user, require_roles
-from app.db.session import get_db
-from app.models.task import Task
+from app.api.conditional import entity_tag, not_modified
+from app.api.deps import get_current_user_async, require_roles
+from app.api.pagination import paginated_json
+from app.db.session import get_async_db, get_db
 from app.models.user import User
-from app.repositories import task_repo
+from app.repositories import load_options, tag_repo, task_repo
+from app.repositories.aio import task_repo as aio_task_repo
+from app.repositories.pagination import MAX_PAGE_SIZE
 from app.schemas.task import TaskCreate, TaskRead, TaskUpdate
 from app.services.task_service import create_task, update_task
 
-router = APIRouter(prefix="/tasks", tags=["tasks"])
+router = APIRouter(prefix="/tasks", tags=["tasks"], default_response_class=ORJSONResponse)
 
 
 @router.post("", response_model=TaskRead)
@@ -22,21 +29,43 @@ def create_task_endpoint(
 
 
 @router.get("", response_model=list[TaskRead])
-def list_tasks(
-    skip: int = 0,
-    limit: int = 20,
+async def list_tasks(
+    request: Request,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    skip: int = Query(0, ge=0),
     status_filter: str | None = None,
     tag: str | None = None,
+    tag_match: Literal["any", "all"] = "any",
     query: str | None = None,
-    db: Session = Depends(get_db),
-    _: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    return task_repo.list_tasks(db, skip, limit, status_filter, tag, query)
+    q = task_repo.filter_tasks_query(status_filter, tag_repo.tag_filter(tag, tag_match), query)
+    freshness = await aio_task_repo.task_freshness(db, q)
+    etag = entity_tag("tasks", str(request.url.query), current_user.role, freshness.updated_at, freshness.total)
+    if (cached := not_modified(request, response, etag, freshness.updated_at)) is not None:
+        return cached
+    page = await aio_task_repo.page_tasks(db, q, query, cursor=cursor, limit=limit, skip=skip)
+    return paginated_json(request, response, page, TaskRead)
 
 
 @router.get("/{task_id}", response_model=TaskRead)
-def get_task(task_id: int, db: Session = Depends(get_db), _: User = Depends(get_current_user)):
-    task = task_repo.get_task(db, task_id)
+async def get_task(
+    task_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    _: User = Depends(get_current_user_async),
+):
+    validator = await aio_task_repo.get_task_validator(db, task_id)
+    if not validator:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    etag = entity_tag("task", task_id, validator.updated_at, "full")
+    if (cached := not_modified(request, response, etag, validator.updated_at)) is not None:
+        return cached
+    task = await aio_task_repo.get_task(db, task_id, load_options.TASK_READ)
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
     return task
@@ -49,7 +78,7 @@ def update_task_endpoint(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_roles("curator", "manager", "admin")),
 ):
-    task = task_repo.get_task(db, task_id)
+    task = task_repo.get_task(db, task_id, load_options.TASK_READ)
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
     if current_user.role == "curator" and task.curator_id not in {current_user.id, None}:
@@ -77,7 +106,7 @@ def archive_task_endpoint(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_roles("curator", "manager", "admin")),
 ):
-    task = task_repo.get_task(db, task_id)
+    task = task_repo.get_task(db, task_id, load_options.TASK_READ)
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
     if current_user.role == "curator" and task.curator_id not in {current_user.id, None}:
@@ -92,7 +121,7 @@ def unarchive_task_endpoint(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_roles("curator", "manager", "admin")),
 ):
-    task = task_repo.get_task(db, task_id)
+    task = task_repo.get_task(db, task_id, load_options.TASK_READ)
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
     if current_user.role == "curator" and task.curator_id not in {current_user.id, None}:
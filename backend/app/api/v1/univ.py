@@ -1,22 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
 from app.api.deps import require_roles
+from app.api.pagination import paginated_json
 from app.db.session import get_db
 from app.models.user import User
 from app.repositories import approval_repo
+from app.repositories.pagination import MAX_PAGE_SIZE
 from app.schemas.approval import ApprovalRead, ApprovalUpdate
 from app.services.approval_service import update_approval_state
 
-router = APIRouter(prefix="/univ", tags=["univ"])
+router = APIRouter(prefix="/univ", tags=["univ"], default_response_class=ORJSONResponse)
 
 
 @router.get("/approvals", response_model=list[ApprovalRead])
 def list_approvals(
+    request: Request,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    skip: int = Query(0, ge=0),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_roles("univ_teacher", "univ_supervisor", "univ_admin")),
 ):
-    return approval_repo.list_approvals(db, 0, 200)
+    page = approval_repo.list_approvals(db, cursor=cursor, limit=limit, skip=skip)
+    return paginated_json(request, response, page, ApprovalRead)
 
 
 @router.patch("/approvals/{approval_id}", response_model=ApprovalRead)
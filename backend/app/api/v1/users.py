@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user, require_roles
+from app.api.pagination import paginated
+from app.core.principal_cache import invalidate_principal
 from app.db.session import get_db
+from app.db.unit_of_work import save
 from app.models.user import User
 from app.repositories import user_repo
+from app.repositories.pagination import MAX_PAGE_SIZE
 from app.schemas.user import StudentProfileRead, UserProfileRead, UserProfileUpdate, UserRead, UserUpdateRole
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -12,12 +16,15 @@ router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("", response_model=list[UserRead])
 def list_users(
-    skip: int = 0,
-    limit: int = 20,
+    request: Request,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    skip: int = Query(0, ge=0),
     db: Session = Depends(get_db),
     _: User = Depends(require_roles("manager", "admin", "curator")),
 ):
-    return user_repo.list_users(db, skip, limit)
+    return paginated(request, response, user_repo.list_users(db, cursor=cursor, limit=limit, skip=skip))
 
 
 @router.patch("/{user_id}/role", response_model=UserRead)
@@ -29,9 +36,8 @@ def update_role(
 ):
     user = db.get(User, user_id)
     user.role = payload.role
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    save(db, user)
+    invalidate_principal(db, user.id)
     return user
 
 
@@ -49,9 +55,8 @@ def update_profile(
     update_data = payload.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(current_user, field, value)
-    db.add(current_user)
-    db.commit()
-    db.refresh(current_user)
+    save(db, current_user)
+    invalidate_principal(db, current_user.id)
     return current_user
 
 
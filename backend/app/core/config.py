@@ -1,4 +1,5 @@
 from functools import lru_cache
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,10 +11,62 @@ class Settings(BaseSettings):
     api_v1_prefix: str = "/api/v1"
 
     database_url: str
+    async_database_url: str | None = None  # derived from database_url when unset
     secret_key: str
     access_token_expire_minutes: int = 30
     refresh_token_expire_minutes: int = 60 * 24 * 7
 
+    principal_cache_ttl_seconds: int = 30
+    principal_cache_max_entries: int = 10000
+
+    password_hash_executor: str = "thread"  # "thread" or "process"
+    password_hash_workers: int = 4
+    password_hash_max_queue: int = 32
+
+    rate_limit_backend: str = "memory"  # "memory", "sqlite" or "redis"
+    rate_limit_url: str | None = None  # sqlite file path or redis://host:port/db
+    rate_limit_max_keys: int = 10000
+    rate_limit_fail_open: bool = True  # let requests through (True) or answer 503 (False) when the store is down
+
+    activity_flush_interval_seconds: float = 5.0
+    activity_flush_max_users: int = 500
+
+    audit_mode: str = "async"  # "async" (batched background writes) or "strict" (caller's transaction)
+    audit_flush_size: int = 500
+    audit_flush_interval_seconds: float = 1.0
+    audit_queue_max_size: int = 10000
+    audit_retention_months: int = 24
+    audit_partitions_ahead: int = 3
+    audit_partition_check_hours: float = 24.0  # how often the app runs `audit_partitions ensure`; 0 = cron only
+
+    import_batch_size: int = 500
+    import_hash_workers: int = 4
+    import_users_max_upload_rows: int = 1000  # larger files go through `python -m app.db.bulk_import`
+
+    outbox_worker_enabled: bool = True  # False when jobs run in a separate `python -m app.db.outbox work` process
+    outbox_concurrency: int = 4
+    outbox_poll_interval_seconds: float = 1.0
+    outbox_lease_seconds: float = 60.0
+    outbox_max_attempts: int = 5
+    outbox_backoff_base_seconds: float = 2.0
+    outbox_backoff_max_seconds: float = 600.0
+    outbox_retention_hours: int = 72
+
+    events_backend: str = "memory"  # "memory" (single worker) or "postgres" (LISTEN/NOTIFY across workers)
+    events_heartbeat_seconds: float = 15.0
+    events_subscriber_queue_size: int = 256
+
+    sql_timing_headers: bool | None = None  # defaults to on in development
+    sql_statement_shapes: bool | None = None  # repeated-statement warnings; defaults to on in development
+    sql_warn_query_count: int = 50
+    sql_warn_total_ms: float = 500.0
+    sql_warn_repeated_statements: int = 10
+
+    manager_dashboard_cache_ttl_seconds: float = 10.0  # 0 disables the cache
+    manager_dashboard_max_stale_seconds: float = 60.0
+
+    hr_bayesian_prior_weight: float = Field(5.0, gt=0)  # pseudo-reviews at the global mean rating
+
     cors_origins: str = "http://localhost:3000,http://127.0.0.1:3000"
     cors_origin_regex: str | None = None  # e.g. "^https?://(localhost|127\\.0\\.0\\.1|192\\.168\\.\\d+\\.\\d+)(:\\d+)?$"
 
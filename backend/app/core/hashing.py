@@ -0,0 +1,187 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# Worker processes are spawned, not forked: forking a server that already runs
+# threads can copy a lock some other thread holds, and the child then deadlocks.
+_process_context = multiprocessing.get_context("spawn")
+
+
+def _timed_hash(password: str, submitted_at: float) -> tuple[str, float, float]:
+    started_at = time.time()
+    hashed = pwd_context.hash(password)
+    return hashed, started_at - submitted_at, time.time() - started_at
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _timed_verify(plain_password: str, hashed_password: str, submitted_at: float) -> tuple[bool, float, float]:
+    started_at = time.time()
+    ok = pwd_context.verify(plain_password, hashed_password)
+    return ok, started_at - submitted_at, time.time() - started_at
+
+
+class HashingMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.rejected = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.hash_time_total = 0.0
+        self.hash_time_max = 0.0
+
+    def observe(self, queue_wait: float, hash_time: float) -> None:
+        with self._lock:
+            self.completed += 1
+            self.queue_wait_total += queue_wait
+            self.queue_wait_max = max(self.queue_wait_max, queue_wait)
+            self.hash_time_total += hash_time
+            self.hash_time_max = max(self.hash_time_max, hash_time)
+
+    def observe_rejected(self) -> None:
+        with self._lock:
+            self.rejected += 1
+
+    def snapshot(self, in_flight: int) -> dict:
+        with self._lock:
+            completed = self.completed or 1
+            return {
+                "in_flight": in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "queue_wait_avg_ms": round(self.queue_wait_total / completed * 1000, 2),
+                "queue_wait_max_ms": round(self.queue_wait_max * 1000, 2),
+                "hash_time_avg_ms": round(self.hash_time_total / completed * 1000, 2),
+                "hash_time_max_ms": round(self.hash_time_max * 1000, 2),
+            }
+
+
+class HashingPool:
+    def __init__(self, kind: str, workers: int, max_queue: int):
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.metrics = HashingMetrics()
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        self._in_flight = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_process_context)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.workers,
+                            thread_name_prefix="password-hash",
+                        )
+        return self._executor
+
+    def _submit(self, fn, *args) -> Future:
+        # Admission control: at most workers + max_queue hashes are pending; beyond
+        # that callers get a 503 immediately instead of piling up. The slot is
+        # released by the future itself, so async callers never hold a thread.
+        if not self._slots.acquire(blocking=False):
+            self.metrics.observe_rejected()
+            logger.warning("Password hashing queue is full (%s in flight)", self._in_flight)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication is temporarily overloaded, please retry",
+            )
+        with self._lock:
+            self._in_flight += 1
+        try:
+            future = self._get_executor().submit(fn, *args, time.time())
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, future: Future | None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+        if future is not None and not future.cancelled() and future.exception() is None:
+            _, queue_wait, hash_time = future.result()
+            self.metrics.observe(queue_wait, hash_time)
+
+    def hash(self, password: str) -> str:
+        return self._submit(_timed_hash, password).result()[0]
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return self._submit(_timed_verify, plain_password, hashed_password).result()[0]
+
+    async def hash_async(self, password: str) -> str:
+        return (await asyncio.wrap_future(self._submit(_timed_hash, password)))[0]
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        return (await asyncio.wrap_future(self._submit(_timed_verify, plain_password, hashed_password)))[0]
+
+    def stats(self) -> dict:
+        return {
+            "executor": self.kind,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            **self.metrics.snapshot(self._in_flight),
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+hashing_pool = HashingPool(
+    settings.password_hash_executor,
+    settings.password_hash_workers,
+    settings.password_hash_max_queue,
+)
+
+
+class BulkHasher:
+    # Bulk imports get their own pool so bcrypt runs on every core without
+    # queueing behind, or starving, interactive logins in hashing_pool. The pool is
+    # started on first use and kept for the life of the process.
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def hash_many(self, passwords: list[str]) -> list[str]:
+        if self.workers <= 1:
+            return [_hash(password) for password in passwords]
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_process_context)
+            executor = self._executor
+        return list(executor.map(_hash, passwords, chunksize=max(1, len(passwords) // (self.workers * 4))))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+bulk_hasher = BulkHasher(settings.import_hash_workers)
@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.config import get_settings
+from app.db.unit_of_work import after_commit
+from app.models.user import User
+
+settings = get_settings()
+
+
+class PrincipalCache:
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[int, tuple[int, float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, user_id: int, token_version: int) -> dict | None:
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            cached_version, expires_at, snapshot = entry
+            if cached_version != token_version or expires_at <= now:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return snapshot
+
+    def put(self, user: User) -> None:
+        if not self.enabled:
+            return
+        snapshot = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[user.id] = (user.token_version or 0, expires_at, snapshot)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache(settings.principal_cache_ttl_seconds, settings.principal_cache_max_entries)
+
+
+def detached_principal(snapshot: dict) -> User:
+    # A clean detached instance can be merged with load=False (no SELECT), so routes
+    # get a session-bound User they can modify like a freshly loaded one.
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return user
+
+
+def attach_principal(db: Session, snapshot: dict) -> User:
+    return db.merge(detached_principal(snapshot), load=False)
+
+
+async def attach_principal_async(db: AsyncSession, snapshot: dict) -> User:
+    return await db.merge(detached_principal(snapshot), load=False)
+
+
+def invalidate_principal(db: Session, user_id: int) -> None:
+    # Drop now and again once the transaction commits, so a concurrent request
+    # cannot re-cache the pre-commit row.
+    principal_cache.invalidate(user_id)
+    after_commit(db, lambda: principal_cache.invalidate(user_id))
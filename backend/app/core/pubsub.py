@@ -0,0 +1,218 @@
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from collections import defaultdict
+from functools import lru_cache
+
+from sqlalchemy.engine import make_url
+
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "app_events"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more.
+MAX_NOTIFY_BYTES = 7900
+
+
+def _encode(topic: str, message: dict) -> str:
+    return json.dumps({"topic": topic, "message": message}, default=str, ensure_ascii=False, separators=(",", ":"))
+
+
+def notify_payload(topic: str, message: dict) -> str:
+    payload = _encode(topic, message)
+    if len(payload.encode()) <= MAX_NOTIFY_BYTES:
+        return payload
+    # Too big for NOTIFY: tell subscribers what changed, without the content, so
+    # they refetch that list. The audience still applies.
+    refetch = {"type": "refetch", "data": {"type": message.get("type")}, "audience": message.get("audience")}
+    return _encode(topic, refetch)
+
+
+class Subscription:
+    def __init__(self, broker: "MemoryBroker", topic: str, max_size: int):
+        self.broker = broker
+        self.topic = topic
+        self.overflowed = False
+        self.closed = False
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue(max_size)
+
+    def _deliver(self, message: dict | None) -> None:
+        # Runs on the subscriber's event loop. A consumer that cannot keep up is
+        # cut off rather than buffered without bound; it reconnects and refetches.
+        if self.overflowed:
+            return
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            self._queue.get_nowait()
+            self._queue.put_nowait(None)
+
+    def push(self, message: dict | None) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._deliver, message)
+        except RuntimeError:
+            # The subscriber's loop is already closed.
+            self.broker.unsubscribe(self)
+
+    async def get(self, timeout: float) -> dict | None:
+        # None means the stream is over: overflow or broker shutdown.
+        return await asyncio.wait_for(self._queue.get(), timeout)
+
+    def close(self) -> None:
+        # Called by the stream and again by the response's background task; the
+        # second call is a no-op.
+        if not self.closed:
+            self.closed = True
+            self.broker.unsubscribe(self)
+
+
+# In-process fan-out: publish() may be called from any thread (sync endpoints run
+# in the threadpool) and hands the message to every subscriber's event loop.
+class MemoryBroker:
+    def __init__(self, queue_size: int = 256):
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic: str) -> Subscription:
+        subscription = Subscription(self, topic, self.queue_size)
+        with self._lock:
+            self._subscribers[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.topic]
+
+    def subscriber_count(self, topic: str | None = None) -> int:
+        with self._lock:
+            if topic is not None:
+                return len(self._subscribers.get(topic, ()))
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def fan_out(self, topic: str, message: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(topic, ()))
+        for subscription in subscribers:
+            subscription.push(message)
+
+    def publish(self, topic: str, message: dict) -> None:
+        self.fan_out(topic, message)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            subscribers = [s for topic_subscribers in self._subscribers.values() for s in topic_subscribers]
+            self._subscribers.clear()
+        for subscription in subscribers:
+            subscription.push(None)
+
+
+# Every worker LISTENs on one channel and fans notifications out to its own
+# subscribers, so a commit in any worker reaches streams held by all of them.
+# publish() only NOTIFYs; the local copy arrives through the listener as well.
+class PostgresBroker(MemoryBroker):
+    def __init__(self, url: str, queue_size: int = 256, reconnect_seconds: float = 1.0):
+        super().__init__(queue_size)
+        self.dsn = make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self.reconnect_seconds = reconnect_seconds
+        self._publisher = None
+        self._publish_lock = threading.Lock()
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+
+    def _connect(self):
+        import psycopg2
+
+        conn = psycopg2.connect(self.dsn)
+        conn.autocommit = True
+        return conn
+
+    def subscribe(self, topic: str) -> Subscription:
+        self._ensure_listener()
+        return super().subscribe(topic)
+
+    def publish(self, topic: str, message: dict) -> None:
+        payload = notify_payload(topic, message)
+        with self._publish_lock:
+            for attempt in range(2):
+                try:
+                    if self._publisher is None or self._publisher.closed:
+                        self._publisher = self._connect()
+                    with self._publisher.cursor() as cursor:
+                        cursor.execute("SELECT pg_notify(%s, %s)", (NOTIFY_CHANNEL, payload))
+                    return
+                except Exception:
+                    self._publisher = None
+                    if attempt:
+                        logger.exception("Dropping event for %s after a failed NOTIFY", topic)
+
+    def _ensure_listener(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._listen, name="events-listen", daemon=True)
+            self._thread.start()
+
+    def _listen(self) -> None:
+        while not self._stopping:
+            try:
+                conn = self._connect()
+            except Exception:
+                logger.exception("Cannot connect the event listener, retrying")
+                time.sleep(self.reconnect_seconds)
+                continue
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                while not self._stopping:
+                    if select.select([conn], [], [], self.reconnect_seconds) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        envelope = json.loads(notify.payload)
+                        self.fan_out(envelope["topic"], envelope["message"])
+            except Exception:
+                if not self._stopping:
+                    logger.exception("Event listener connection lost, reconnecting")
+                    time.sleep(self.reconnect_seconds)
+            finally:
+                conn.close()
+
+    def shutdown(self) -> None:
+        self._stopping = True
+        if self._thread is not None:
+            self._thread.join(timeout=self.reconnect_seconds + 5)
+            self._thread = None
+        with self._publish_lock:
+            if self._publisher is not None:
+                self._publisher.close()
+                self._publisher = None
+        super().shutdown()
+
+
+def build_broker(kind: str, url: str, queue_size: int) -> MemoryBroker:
+    if kind == "memory":
+        return MemoryBroker(queue_size)
+    if kind == "postgres":
+        return PostgresBroker(url, queue_size)
+    raise ValueError(f"Unknown events backend: {kind}")
+
+
+@lru_cache
+def get_broker() -> MemoryBroker:
+    return build_broker(settings.events_backend, settings.database_url, settings.events_subscriber_queue_size)
@@ -0,0 +1,263 @@
+import logging
+import socket
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from urllib.parse import urlparse
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class MemoryBackend:
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, limit: int, window: float) -> tuple[bool, float]:
+        now = time.monotonic()
+        rate = limit / window
+        with self._lock:
+            tokens, updated_at, _ = self._buckets.pop(key, (limit, now, window))
+            tokens = min(limit, tokens + (now - updated_at) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now, window)
+            self._evict(now)
+        return allowed, 0.0 if allowed else (1 - tokens) / rate
+
+    def _evict(self, now: float) -> None:
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        while self._buckets:
+            key, (_, updated_at, window) = next(iter(self._buckets.items()))
+            if now - updated_at < window:
+                break
+            del self._buckets[key]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class SQLiteBackend:
+    def __init__(self, path: str, prune_every: int = 1000):
+        self.path = path
+        self.prune_every = prune_every
+        self._local = threading.local()
+        self._hits = 0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key: str, limit: int, window: float) -> tuple[bool, float]:
+        now = time.time()
+        rate = limit / window
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated_at FROM rate_limits WHERE key = ?", (key,)).fetchone()
+            tokens = float(limit) if row is None else min(limit, row[0] + (now - row[1]) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            conn.execute(
+                "INSERT INTO rate_limits (key, tokens, updated_at, expires_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, "
+                "updated_at = excluded.updated_at, expires_at = excluded.expires_at",
+                (key, tokens, now, now + window),
+            )
+            self._hits += 1
+            if self._hits % self.prune_every == 0:
+                conn.execute("DELETE FROM rate_limits WHERE expires_at < ?", (now,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return allowed, 0.0 if allowed else (1 - tokens) / rate
+
+    def reset(self) -> None:
+        self._connect().execute("DELETE FROM rate_limits")
+
+
+class RedisBackend:
+    def __init__(self, url: str, timeout: float = 1.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._sock: socket.socket | None = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> None:
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._reader = self._sock.makefile("rb")
+        try:
+            if self.password:
+                self._execute([("AUTH", self.password)])
+            if self.db:
+                self._execute([("SELECT", str(self.db))])
+        except BaseException:
+            # Never keep a connection that is unauthenticated or on the wrong db.
+            self._close()
+            raise
+
+    def _close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = None
+        self._reader = None
+
+    @staticmethod
+    def _encode(args: tuple) -> bytes:
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    def _read_reply(self):
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by rate limit server")
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b"+":
+            return payload.decode()
+        if prefix == b"-":
+            # Returned, not raised, so the rest of the pipeline's replies are read.
+            return RuntimeError(payload.decode())
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2].decode()
+        if prefix == b"*":
+            return [self._read_reply() for _ in range(int(payload))]
+        raise RuntimeError(f"Unexpected reply from rate limit server: {line!r}")
+
+    def _execute(self, commands: list[tuple]) -> list:
+        self._sock.sendall(b"".join(self._encode(command) for command in commands))
+        replies = [self._read_reply() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RuntimeError):
+                raise reply
+        return replies
+
+    def pipeline(self, commands: list[tuple], *, retry: bool = True) -> list:
+        # A dropped connection is reopened and the batch resent only when resending
+        # is harmless: Redis may have run the batch before the reply was lost.
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    return self._execute(commands)
+                except Exception as exc:
+                    # Whatever went wrong, the connection may be out of step with
+                    # its replies; a fresh one is opened for the next call.
+                    self._close()
+                    if attempt or not retry or not isinstance(exc, OSError):
+                        raise
+
+    def hit(self, key: str, limit: int, window: float) -> tuple[bool, float]:
+        now = time.time()
+        slot = int(now // window)
+        elapsed = now - slot * window
+        current_key = f"rl:{key}:{slot}"
+        # Not retried: a resent INCR would count the request twice.
+        count, _, previous = self.pipeline(
+            [
+                ("INCR", current_key),
+                ("EXPIRE", current_key, int(window * 2) + 1),
+                ("GET", f"rl:{key}:{slot - 1}"),
+            ],
+            retry=False,
+        )
+        weighted = int(previous or 0) * (1 - elapsed / window) + count
+        allowed = weighted <= limit
+        return allowed, 0.0 if allowed else window - elapsed
+
+    def reset(self) -> None:
+        # Deletes this limiter's counters only; the database may be shared.
+        cursor = "0"
+        while True:
+            [(cursor, keys)] = self.pipeline([("SCAN", cursor, "MATCH", "rl:*", "COUNT", 500)])
+            if keys:
+                self.pipeline([("DEL", *keys)])
+            if cursor == "0":
+                return
+
+
+class RateLimiter:
+    def __init__(self, backend, fail_open: bool = True):
+        self.backend = backend
+        self.fail_open = fail_open
+
+    def check(self, key: str, limit: int, window: float) -> None:
+        try:
+            allowed, retry_after = self.backend.hit(key, limit, window)
+        except (OSError, RuntimeError, sqlite3.Error) as exc:
+            # The shared store is down: either let requests through unthrottled
+            # (fail open) or turn them away (fail closed), but never a bare 500.
+            mode = "open" if self.fail_open else "closed"
+            logger.warning("Rate limit backend unavailable (%s), failing %s", exc, mode)
+            if self.fail_open:
+                return
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Service temporarily unavailable, please retry",
+            ) from exc
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests",
+                headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+            )
+
+
+def build_backend(kind: str, url: str | None, max_keys: int):
+    if kind == "memory":
+        return MemoryBackend(max_keys)
+    if kind == "sqlite":
+        return SQLiteBackend(url or "rate_limits.sqlite3")
+    if kind == "redis":
+        return RedisBackend(url or "redis://localhost:6379/0")
+    raise ValueError(f"Unknown rate limit backend: {kind}")
+
+
+@lru_cache
+def get_rate_limiter() -> RateLimiter:
+    backend = build_backend(settings.rate_limit_backend, settings.rate_limit_url, settings.rate_limit_max_keys)
+    return RateLimiter(backend, settings.rate_limit_fail_open)
+
+
+def rate_limit(scope: str, limit: int, window: float = 60):
+    def _dependency(request: Request) -> None:
+        client_host = request.client.host if request.client else "unknown"
+        get_rate_limiter().check(f"{scope}:{client_host}", limit, window)
+
+    return _dependency
@@ -1,20 +1,28 @@
 from datetime import datetime, timedelta
 from jose import jwt
-from passlib.context import CryptContext
 
 from app.core.config import get_settings
+from app.core.hashing import hashing_pool
 
 settings = get_settings()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return hashing_pool.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return hashing_pool.hash(password)
+
+
+# Async variants for request handlers: the hash runs in hashing_pool while the
+# event loop keeps serving, instead of parking a threadpool thread per login.
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await hashing_pool.verify_async(plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await hashing_pool.hash_async(password)
 
 
 def create_access_token(subject: str, role: str, token_version: int | None = None) -> str:
@@ -0,0 +1,81 @@
+import logging
+import threading
+import time
+from collections.abc import Callable, Hashable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+# Fresh values are served for ttl_seconds; after that the stale value keeps being
+# served for up to max_stale_seconds while a single background refresh runs.
+# Misses are computed once per key, whatever the concurrency.
+class StaleWhileRevalidateCache:
+    def __init__(self, ttl_seconds: float, max_stale_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self._entries: dict[Hashable, tuple[Any, float]] = {}
+        self._generations: dict[Hashable, int] = {}
+        self._refreshing: set[Hashable] = set()
+        self._key_locks: dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        if not self.enabled:
+            return loader()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                age = now - stored_at
+                if age < self.ttl_seconds:
+                    return value
+                if age < self.ttl_seconds + self.max_stale_seconds:
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        generation = self._generations.get(key, 0)
+                        threading.Thread(
+                            target=self._refresh, args=(key, loader, generation), daemon=True
+                        ).start()
+                    return value
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and time.monotonic() - entry[1] < self.ttl_seconds:
+                    return entry[0]
+                generation = self._generations.get(key, 0)
+            value = loader()
+            self._store(key, value, generation)
+            return value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                self._generations[key] = self._generations.get(key, 0) + 1
+            self._entries.clear()
+
+    def _store(self, key: Hashable, value: Any, generation: int) -> None:
+        with self._lock:
+            # A refresh that started before an invalidation must not resurrect old data.
+            if self._generations.get(key, 0) == generation:
+                self._entries[key] = (value, time.monotonic())
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Any], generation: int) -> None:
+        try:
+            self._store(key, loader(), generation)
+        except Exception:
+            logger.exception("Background refresh of %r failed; serving stale value", key)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
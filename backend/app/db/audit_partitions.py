@@ -0,0 +1,237 @@
+import argparse
+import logging
+import sys
+import threading
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import get_settings
+from app.db.session import engine
+
+# audit_logs is range-partitioned by month on Postgres (migration 0013): one
+# audit_logs_YYYY_MM partition per month plus a DEFAULT partition that catches
+# rows nobody created a partition for. Retention detaches or drops whole
+# partitions, which is a catalog change regardless of how many rows they hold.
+#
+# SQLite (development and tests) has no declarative partitioning. There the
+# live table stays unpartitioned and retention moves each expired month into
+# its own audit_logs_YYYY_MM table (archive) or deletes it by the created_at
+# index; both are range operations rather than O(1).
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+PARENT = "audit_logs"
+DEFAULT_PARTITION = "audit_logs_default"
+
+
+def month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARENT}_{month.year:04d}_{month.month:02d}"
+
+
+def _month_of(name: str) -> datetime | None:
+    try:
+        year, month = name.removeprefix(f"{PARENT}_").split("_")
+        return datetime(int(year), int(month), 1)
+    except ValueError:
+        return None
+
+
+def list_partitions(conn: Connection) -> list[tuple[str, datetime]]:
+    if conn.dialect.name == "postgresql":
+        names = conn.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE parent.relname = :parent"
+            ),
+            {"parent": PARENT},
+        ).scalars()
+    else:
+        names = conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE :pattern ESCAPE '\\'"),
+            {"pattern": f"{PARENT}\\_%"},
+        ).scalars()
+    partitions = [(name, _month_of(name)) for name in names]
+    return sorted((name, month) for name, month in partitions if month is not None)
+
+
+def _default_months(conn: Connection) -> list[datetime]:
+    rows = conn.execute(text(f"SELECT DISTINCT date_trunc('month', created_at) FROM {DEFAULT_PARTITION}")).scalars()
+    return sorted(month_start(month) for month in rows)
+
+
+def _create_partition(conn: Connection, month: datetime) -> str:
+    # Postgres refuses CREATE ... PARTITION OF for a range that already has rows
+    # in DEFAULT, so the partition is built standalone, the month's rows are moved
+    # out of DEFAULT into it, and only then is it attached.
+    name = partition_name(month)
+    bounds = {"start": month, "end": add_months(month, 1)}
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    conn.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            "WHERE created_at >= :start AND created_at < :end RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ),
+        bounds,
+    )
+    conn.execute(
+        text(
+            f"ALTER TABLE {PARENT} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+        )
+    )
+    return name
+
+
+def ensure_partitions(conn: Connection, *, months_ahead: int, now: datetime | None = None) -> list[str]:
+    # Creates the partitions for the current month and the next months_ahead, plus
+    # one for every month that has already spilled into DEFAULT (so retention can
+    # expire those rows like any other month and DEFAULT stays empty).
+    if conn.dialect.name != "postgresql":
+        return []
+    current = month_start(now or datetime.utcnow())
+    existing = {name for name, _ in list_partitions(conn)}
+    wanted = {add_months(current, offset) for offset in range(months_ahead + 1)}
+    wanted.update(_default_months(conn))
+    created = []
+    for month in sorted(wanted):
+        if partition_name(month) not in existing:
+            created.append(_create_partition(conn, month))
+    return created
+
+
+def run_maintenance(bind: Engine, *, months_ahead: int) -> list[str]:
+    # One transaction under an advisory lock, so several app workers running the
+    # same schedule do not race on CREATE TABLE.
+    with bind.begin() as conn:
+        if conn.dialect.name != "postgresql":
+            return []
+        if not conn.execute(text("SELECT pg_try_advisory_xact_lock(hashtext(:key))"), {"key": PARENT}).scalar():
+            return []
+        return ensure_partitions(conn, months_ahead=months_ahead)
+
+
+class PartitionMaintainer:
+    # Runs ensure_partitions at startup and then every interval, so inserts never
+    # depend on someone remembering to run `python -m app.db.audit_partitions ensure`.
+    def __init__(self, interval_seconds: float, months_ahead: int):
+        self.interval_seconds = interval_seconds
+        self.months_ahead = months_ahead
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self, bind: Engine) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(bind,), name="audit-partitions", daemon=True)
+        self._thread.start()
+
+    def _run(self, bind: Engine) -> None:
+        while True:
+            try:
+                created = run_maintenance(bind, months_ahead=self.months_ahead)
+                if created:
+                    logger.info("Created audit partitions: %s", ", ".join(created))
+            except Exception:
+                logger.exception("Audit partition maintenance failed")
+            if self._stop.wait(self.interval_seconds):
+                return
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+partition_maintainer = PartitionMaintainer(
+    settings.audit_partition_check_hours * 3600, settings.audit_partitions_ahead
+)
+
+
+def apply_retention(
+    conn: Connection, *, keep_months: int, archive: bool, now: datetime | None = None
+) -> list[str]:
+    # Everything older than the first day of (current month - keep_months) expires.
+    cutoff = add_months(month_start(now or datetime.utcnow()), -keep_months)
+    if conn.dialect.name == "postgresql":
+        return _expire_pg_partitions(conn, cutoff, archive)
+    return _expire_sqlite_months(conn, cutoff, archive)
+
+
+def _expire_pg_partitions(conn: Connection, cutoff: datetime, archive: bool) -> list[str]:
+    # Rows that fell into DEFAULT get their monthly partition first, so they
+    # expire with their month instead of living in DEFAULT forever.
+    for month in _default_months(conn):
+        if month < cutoff:
+            _create_partition(conn, month)
+    expired = []
+    for name, month in list_partitions(conn):
+        if month >= cutoff:
+            continue
+        # A detached partition is an ordinary table that can be dumped and dropped later.
+        conn.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+        if not archive:
+            conn.execute(text(f"DROP TABLE {name}"))
+        expired.append(name)
+    return expired
+
+
+def _expire_sqlite_months(conn: Connection, cutoff: datetime, archive: bool) -> list[str]:
+    oldest = conn.execute(text(f"SELECT min(created_at) FROM {PARENT}")).scalar()
+    if oldest is None:
+        return []
+    expired = []
+    month = month_start(datetime.fromisoformat(str(oldest)))
+    while month < cutoff:
+        bounds = {"start": month, "end": add_months(month, 1)}
+        period = "created_at >= :start AND created_at < :end"
+        if archive:
+            name = partition_name(month)
+            conn.execute(text(f"CREATE TABLE IF NOT EXISTS {name} AS SELECT * FROM {PARENT} WHERE 0"))
+            conn.execute(text(f"INSERT INTO {name} SELECT * FROM {PARENT} WHERE {period}"), bounds)
+        if conn.execute(text(f"DELETE FROM {PARENT} WHERE {period}"), bounds).rowcount:
+            expired.append(partition_name(month))
+        month = add_months(month, 1)
+    return expired
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Maintain audit_logs partitions")
+    parser.add_argument("command", choices=["ensure", "retention", "list"])
+    parser.add_argument("--months-ahead", type=int, default=settings.audit_partitions_ahead)
+    parser.add_argument("--keep-months", type=int, default=settings.audit_retention_months)
+    parser.add_argument("--archive", action="store_true", help="detach expired partitions instead of dropping them")
+    args = parser.parse_args(argv)
+    with engine.begin() as conn:
+        if args.command == "list":
+            for name, _ in list_partitions(conn):
+                print(name)
+            return 0
+        if args.command == "ensure":
+            created = ensure_partitions(conn, months_ahead=args.months_ahead)
+            print(f"Created {len(created)} audit partitions: {', '.join(created) or '-'}")
+            return 0
+        expired = apply_retention(conn, keep_months=args.keep_months, archive=args.archive)
+    verb = "Archived" if args.archive else "Dropped"
+    print(f"{verb} {len(expired)} audit periods: {', '.join(expired) or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
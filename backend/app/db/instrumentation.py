@@ -0,0 +1,161 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|\$\d+|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|\$\d+|:\w+))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    return _PLACEHOLDER_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryStats:
+    # With track_shapes=False only the count and time are kept, so the regex in
+    # statement_shape() never runs on the hot path.
+    def __init__(self, track_shapes: bool = True):
+        self.count = 0
+        self.total_time = 0.0
+        self.track_shapes = track_shapes
+        self.shapes: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        shape = statement_shape(statement) if self.track_shapes else None
+        with self._lock:
+            self.count += 1
+            self.total_time += elapsed
+            if shape is not None:
+                self.shapes[shape] += 1
+
+    @property
+    def total_ms(self) -> float:
+        return self.total_time * 1000
+
+    def most_repeated(self) -> tuple[str, int] | None:
+        with self._lock:
+            common = self.shapes.most_common(1)
+        return common[0] if common else None
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("sql_query_stats", default=None)
+_observers: list[QueryStats] = []
+_observers_lock = threading.Lock()
+_installed = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started_at"].pop()
+    stats = _current.get()
+    if stats is None:
+        return
+    elapsed = time.perf_counter() - started
+    stats.record(statement, elapsed)
+    with _observers_lock:
+        observers = list(_observers)
+    for observer in observers:
+        observer.record(statement, elapsed)
+
+
+def _handle_error(exception_context):
+    started = exception_context.connection.info.get("query_started_at") if exception_context.connection else None
+    if started:
+        started.pop()
+
+
+def install_sql_instrumentation() -> None:
+    global _installed
+    if _installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+    _installed = True
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current.get()
+
+
+# Only statements issued while serving a request are observed, so background
+# flushes do not leak into a test's query budget.
+@contextmanager
+def track_queries():
+    stats = QueryStats()
+    with _observers_lock:
+        _observers.append(stats)
+    try:
+        yield stats
+    finally:
+        with _observers_lock:
+            _observers.remove(stats)
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app, emit_headers: bool | None = None):
+        self.app = app
+        if emit_headers is None:
+            emit_headers = settings.sql_timing_headers
+        if emit_headers is None:
+            emit_headers = settings.environment == "development"
+        self.emit_headers = emit_headers
+        track_shapes = settings.sql_statement_shapes
+        if track_shapes is None:
+            track_shapes = settings.environment == "development"
+        # Shapes only feed the repeated-statement warning; production just counts.
+        self.track_shapes = track_shapes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats(self.track_shapes)
+        token = _current.set(stats)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start" and self.emit_headers:
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries"')
+                headers.append("X-DB-Query-Count", str(stats.count))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            self._report(scope, stats)
+
+    def _report(self, scope, stats: QueryStats) -> None:
+        repeated = stats.most_repeated()
+        if (
+            stats.count <= settings.sql_warn_query_count
+            and stats.total_ms <= settings.sql_warn_total_ms
+            and (repeated is None or repeated[1] <= settings.sql_warn_repeated_statements)
+        ):
+            return
+        logger.warning(
+            "%s %s issued %s queries in %.1f ms; most repeated (%sx): %s",
+            scope.get("method"),
+            scope.get("path"),
+            stats.count,
+            stats.total_ms,
+            repeated[1] if repeated else 0,
+            repeated[0][:300] if repeated else "-",
+        )
@@ -0,0 +1,58 @@
+import argparse
+import signal
+import sys
+import threading
+from datetime import datetime
+
+from app.db.session import SessionLocal, engine
+from app.db.unit_of_work import unit_of_work
+from app.repositories import outbox_repo
+from app.services.outbox_service import outbox_worker
+
+
+def work(once: bool) -> int:
+    # A dedicated worker process; run web workers with OUTBOX_WORKER_ENABLED=false.
+    outbox_worker.bind = engine
+    if once:
+        outbox_worker.drain()
+        print(f"Ran outbox jobs: {outbox_worker.stats()}")
+        return 0
+    stopped = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stopped.set())
+    outbox_worker.start(engine)
+    stopped.wait()
+    outbox_worker.shutdown()
+    return 0
+
+
+def status() -> int:
+    with SessionLocal() as db:
+        counts = outbox_repo.job_counts(db)
+    for state in ("pending", "running", "done", "failed"):
+        print(f"{state}: {counts.get(state, 0)}")
+    return 1 if counts.get("failed") else 0
+
+
+def retry_failed(kind: str | None) -> int:
+    with SessionLocal() as db, unit_of_work(db):
+        count = outbox_repo.retry_failed_jobs(db, kind, now=datetime.utcnow())
+    print(f"Rescheduled {count} failed outbox jobs")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run and inspect outbox jobs")
+    parser.add_argument("command", choices=["work", "status", "retry-failed"])
+    parser.add_argument("--once", action="store_true", help="run due jobs and exit")
+    parser.add_argument("--kind", help="only retry jobs of this kind")
+    args = parser.parse_args(argv)
+    if args.command == "work":
+        return work(args.once)
+    if args.command == "status":
+        return status()
+    return retry_failed(args.kind)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
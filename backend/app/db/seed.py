@@ -3,7 +3,8 @@ from datetime import datetime, timedelta
 from app.db.session import SessionLocal
 from app.models.assignment import Assignment
 from app.models.task import Task
-from app.repositories import assignment_repo, task_repo, user_repo
+from app.repositories import assignment_repo, tag_repo, task_repo, user_repo
+from app.services import student_stats_service
 from app.services.auth_service import create_user_with_role
 from app.services.approval_service import create_approval
 
@@ -33,7 +34,7 @@ def seed():
                 status="active",
             )
 
-        if not task_repo.list_tasks(db, 0, 1, None, None, None):
+        if not task_repo.list_tasks(db, None, None, None, limit=1).items:
             task = Task(
                 title="AI ассистент для кампуса",
                 description="Разработка прототипа AI-ассистента для сопровождения студенческих проектов.",
@@ -46,13 +47,13 @@ def seed():
                 practice_possible=True,
                 course_project_possible=True,
                 nda_required=True,
-                tags="ai, nlp",
                 status="open",
                 created_by=created["manager"].id,
                 mentor_id=created["mentor"].id,
                 deadline=datetime.utcnow() + timedelta(days=60),
                 visibility="public",
             )
+            tag_repo.set_task_tags(db, task, "ai, nlp")
             task = task_repo.create_task(db, task)
             assignment = Assignment(
                 task_id=task.id,
@@ -61,6 +62,7 @@ def seed():
                 nda_accepted=True,
             )
             assignment_repo.create_assignment(db, assignment)
+            student_stats_service.assignment_created(db, assignment.student_id, assignment.state)
             create_approval(
                 db,
                 task_id=task.id,
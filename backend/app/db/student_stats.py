@@ -0,0 +1,44 @@
+import argparse
+import sys
+
+from app.db.session import SessionLocal
+from app.repositories import student_stats_repo
+
+
+def rebuild() -> int:
+    db = SessionLocal()
+    try:
+        count = student_stats_repo.rebuild(db)
+        db.commit()
+    finally:
+        db.close()
+    print(f"Rebuilt student_stats for {count} students")
+    return 0
+
+
+def check() -> int:
+    db = SessionLocal()
+    try:
+        drift = student_stats_repo.find_drift(db)
+    finally:
+        db.close()
+    for item in drift:
+        print(
+            f"student {item['student_id']}: {item['column']} stored={item['stored']} expected={item['expected']}"
+        )
+    if drift:
+        print(f"{len(drift)} drifted counters; run `python -m app.db.student_stats rebuild`")
+        return 1
+    print("student_stats is consistent")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Maintain the student_stats read model")
+    parser.add_argument("command", choices=["rebuild", "check"])
+    args = parser.parse_args(argv)
+    return rebuild() if args.command == "rebuild" else check()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+import html
+import re
+
+from sqlalchemy import DDL, Boolean, Float, Text, bindparam, event
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import TypeDecorator
+
+# Full-text search over tasks. Postgres keeps a weighted tsvector (Russian and
+# English stems) in a generated column with a GIN index; SQLite keeps an FTS5
+# external-content index in sync through triggers. Both are maintained by the
+# database itself, so task create/update needs no application code.
+#
+# This is the DDL for fresh databases (create_all); migration 0010 keeps its own
+# frozen copy, so a change here needs a new migration as well.
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+# The database marks matches with control characters; the text around them is
+# escaped before they become tags, so task text can never inject markup.
+_MATCH_START = "\x02"
+_MATCH_END = "\x03"
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+POSTGRES_SEARCH_VECTOR = """
+    setweight(to_tsvector('russian', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('russian', coalesce(skills_required, '') || ' ' || coalesce(goal, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(skills_required, '') || ' ' || coalesce(goal, '')), 'B') ||
+    setweight(to_tsvector('russian', coalesce(description, '') || ' ' || coalesce(key_tasks, '')), 'C') ||
+    setweight(to_tsvector('english', coalesce(description, '') || ' ' || coalesce(key_tasks, '')), 'C')
+"""
+
+POSTGRES_DDL = (
+    f"ALTER TABLE tasks ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({POSTGRES_SEARCH_VECTOR}) STORED",
+    "CREATE INDEX ix_tasks_search_vector ON tasks USING gin (search_vector)",
+)
+
+_FTS_COLUMNS = "title, description, goal, key_tasks, skills_required"
+_NEW_ROW = "new.id, new.title, new.description, new.goal, new.key_tasks, new.skills_required"
+_OLD_ROW = "'delete', old.id, old.title, old.description, old.goal, old.key_tasks, old.skills_required"
+
+SQLITE_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5({_FTS_COLUMNS}, "
+    "content='tasks', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    f"INSERT INTO tasks_fts(rowid, {_FTS_COLUMNS}) VALUES ({_NEW_ROW}); END",
+    f"CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    f"INSERT INTO tasks_fts(tasks_fts, rowid, {_FTS_COLUMNS}) VALUES ({_OLD_ROW}); END",
+    f"CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF {_FTS_COLUMNS} ON tasks BEGIN "
+    f"INSERT INTO tasks_fts(tasks_fts, rowid, {_FTS_COLUMNS}) VALUES ({_OLD_ROW}); "
+    f"INSERT INTO tasks_fts(rowid, {_FTS_COLUMNS}) VALUES ({_NEW_ROW}); END",
+    "INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')",
+)
+
+# bm25 column weights, in _FTS_COLUMNS order, mirroring the tsvector weights above.
+_SQLITE_WEIGHTS = "10.0, 2.0, 4.0, 2.0, 4.0"
+
+
+def register_search_ddl(table) -> None:
+    for statement in POSTGRES_DDL:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+    for statement in SQLITE_DDL:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    event.listen(table, "before_drop", DDL("DROP TABLE IF EXISTS tasks_fts").execute_if(dialect="sqlite"))
+
+
+def is_searchable(query: str | None) -> bool:
+    return bool(query and _WORD.search(query))
+
+
+def _fts5_query(query: str) -> str:
+    # Every word becomes a quoted prefix term so user input can never be parsed as
+    # FTS5 syntax, and "разраб" still finds "разработка".
+    return " ".join(f'"{word}"*' for word in _WORD.findall(query))
+
+
+class _TaskSearchFunction(FunctionElement):
+    inherit_cache = True
+
+    def __init__(self, query: str):
+        super().__init__(
+            bindparam("search_query", query, type_=Text),
+            bindparam("search_fts", _fts5_query(query), type_=Text),
+        )
+
+
+class search_match(_TaskSearchFunction):
+    type = Boolean()
+    name = "search_match"
+    inherit_cache = True
+
+
+class search_rank(_TaskSearchFunction):
+    type = Float()
+    name = "search_rank"
+    inherit_cache = True
+
+
+class _Highlighted(TypeDecorator):
+    impl = Text
+    cache_ok = True
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        escaped = html.escape(value, quote=False)
+        return escaped.replace(_MATCH_START, HIGHLIGHT_START).replace(_MATCH_END, HIGHLIGHT_END)
+
+
+class search_snippet(_TaskSearchFunction):
+    type = _Highlighted()
+    name = "search_snippet"
+    inherit_cache = True
+
+
+def _args(element, compiler, **kw) -> tuple[str, str]:
+    query, fts = element.clauses.clauses
+    return compiler.process(query, **kw), compiler.process(fts, **kw)
+
+
+def _tsquery(element, compiler, **kw) -> str:
+    query, _ = _args(element, compiler, **kw)
+    return f"(websearch_to_tsquery('russian', {query}) || websearch_to_tsquery('english', {query}))"
+
+
+def _fts_lookup(element, compiler, expression: str, **kw) -> str:
+    _, fts = _args(element, compiler, **kw)
+    return f"(SELECT {expression} FROM tasks_fts WHERE tasks_fts MATCH {fts} AND tasks_fts.rowid = tasks.id)"
+
+
+@compiles(search_match, "postgresql")
+def _pg_match(element, compiler, **kw):
+    return f"tasks.search_vector @@ {_tsquery(element, compiler, **kw)}"
+
+
+@compiles(search_rank, "postgresql")
+def _pg_rank(element, compiler, **kw):
+    return f"ts_rank_cd(tasks.search_vector, {_tsquery(element, compiler, **kw)})"
+
+
+@compiles(search_snippet, "postgresql")
+def _pg_snippet(element, compiler, **kw):
+    options = f"StartSel={_MATCH_START}, StopSel={_MATCH_END}, MaxFragments=2, MaxWords=20, MinWords=5"
+    return (
+        "ts_headline('russian', concat_ws(' ', tasks.title, tasks.description, tasks.goal, tasks.key_tasks), "
+        f"{_tsquery(element, compiler, **kw)}, '{options}')"
+    )
+
+
+@compiles(search_match, "sqlite")
+def _sqlite_match(element, compiler, **kw):
+    _, fts = _args(element, compiler, **kw)
+    return f"tasks.id IN (SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH {fts})"
+
+
+@compiles(search_rank, "sqlite")
+def _sqlite_rank(element, compiler, **kw):
+    # bm25() is "lower is better"; negate it so both backends sort by rank DESC.
+    return _fts_lookup(element, compiler, f"-bm25(tasks_fts, {_SQLITE_WEIGHTS})", **kw)
+
+
+@compiles(search_snippet, "sqlite")
+def _sqlite_snippet(element, compiler, **kw):
+    expression = f"snippet(tasks_fts, -1, '{_MATCH_START}', '{_MATCH_END}', '…', 16)"
+    return _fts_lookup(element, compiler, expression, **kw)
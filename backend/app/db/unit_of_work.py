@@ -0,0 +1,65 @@
+from collections.abc import Callable
+from contextlib import contextmanager
+
+from sqlalchemy.orm import Session
+
+UNIT_OF_WORK_KEY = "unit_of_work"
+AFTER_COMMIT_KEY = "after_commit"
+
+
+@contextmanager
+def unit_of_work(db: Session):
+    db.info[UNIT_OF_WORK_KEY] = True
+    db.info[AFTER_COMMIT_KEY] = []
+    try:
+        yield db
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
+    else:
+        for callback in db.info[AFTER_COMMIT_KEY]:
+            callback()
+    finally:
+        db.info.pop(UNIT_OF_WORK_KEY, None)
+        db.info.pop(AFTER_COMMIT_KEY, None)
+
+
+def in_unit_of_work(db: Session) -> bool:
+    return bool(db.info.get(UNIT_OF_WORK_KEY))
+
+
+def save(db: Session, obj, *, flush: bool = True):
+    db.add(obj)
+    if in_unit_of_work(db):
+        if flush:
+            db.flush()
+    else:
+        db.commit()
+        db.refresh(obj)
+    return obj
+
+
+def delete(db: Session, obj) -> None:
+    db.delete(obj)
+    if in_unit_of_work(db):
+        db.flush()
+    else:
+        db.commit()
+
+
+def checkpoint(db: Session) -> None:
+    # Commits the work so far and runs its after-commit callbacks; the unit of
+    # work stays open for what follows (long imports commit batch by batch).
+    db.commit()
+    if in_unit_of_work(db):
+        callbacks, db.info[AFTER_COMMIT_KEY] = db.info[AFTER_COMMIT_KEY], []
+        for callback in callbacks:
+            callback()
+
+
+def after_commit(db: Session, callback: Callable[[], None]) -> None:
+    if in_unit_of_work(db):
+        db.info[AFTER_COMMIT_KEY].append(callback)
+    else:
+        callback()
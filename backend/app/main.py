@@ -1,35 +1,86 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.api.router import api_router
 from app.core.config import get_settings
+from app.core.hashing import bulk_hasher, hashing_pool
 from app.core.logging import configure_logging
+from app.core.pubsub import get_broker
+from app.db.audit_partitions import partition_maintainer
+from app.db.instrumentation import QueryStatsMiddleware, install_sql_instrumentation
+from app.db.session import dispose_async_engine, engine
+from app.services.activity_service import activity_tracker
+from app.services.audit_service import audit_pipeline
+from app.services.outbox_service import outbox_worker
 
 settings = get_settings()
 configure_logging()
+install_sql_instrumentation()
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    if settings.outbox_worker_enabled:
+        outbox_worker.start(engine)
+    if settings.audit_partition_check_hours > 0:
+        partition_maintainer.start(engine)
+    yield
+    partition_maintainer.shutdown()
+    get_broker().shutdown()
+    # Producers stop before the audit pipeline they write into, so rows queued
+    # by the last jobs and logins are still written.
+    outbox_worker.shutdown()
+    activity_tracker.shutdown()
+    audit_pipeline.shutdown()
+    hashing_pool.shutdown()
+    bulk_hasher.shutdown()
+    await dispose_async_engine()
+
 
-app = FastAPI(title=settings.app_name, openapi_url=f"{settings.api_v1_prefix}/openapi.json")
+app = FastAPI(
+    title=settings.app_name,
+    openapi_url=f"{settings.api_v1_prefix}/openapi.json",
+    lifespan=lifespan,
+)
 
 cors_kw: dict = {
     "allow_credentials": True,
     "allow_methods": ["*"],
     "allow_headers": ["*"],
+    "expose_headers": ["Link", "X-Next-Cursor", "ETag", "Last-Modified"],
 }
 if settings.cors_origin_regex:
     cors_kw["allow_origin_regex"] = settings.cors_origin_regex
 else:
     cors_kw["allow_origins"] = [o.strip() for o in settings.cors_origins.split(",") if o.strip()]
 app.add_middleware(CORSMiddleware, **cors_kw)
+app.add_middleware(QueryStatsMiddleware)
 
 app.include_router(api_router, prefix=settings.api_v1_prefix)
 
 
 @app.exception_handler(HTTPException)
 def http_exception_handler(request: Request, exc: HTTPException):
-    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail, "error": True})
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail, "error": True},
+        headers=exc.headers,
+    )
 
 
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+
+@app.get("/health/hashing")
+def hashing_health():
+    return hashing_pool.stats()
+
+
+@app.get("/health/outbox")
+def outbox_health():
+    return outbox_worker.stats()
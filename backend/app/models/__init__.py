@@ -2,8 +2,11 @@ from app.models.approval import Approval
 from app.models.assignment import Assignment
 from app.models.audit_log import AuditLog
 from app.models.comment import Comment
+from app.models.outbox_job import OutboxJob
 from app.models.portfolio_entry import PortfolioEntry
 from app.models.review import Review
+from app.models.student_stat import StudentStat
+from app.models.tag import Tag, TaskTag
 from app.models.task import Task
 from app.models.task_mentor import TaskMentor
 from app.models.user import User
@@ -14,10 +17,14 @@ __all__ = [
     "Assignment",
     "AuditLog",
     "Comment",
+    "OutboxJob",
     "PortfolioEntry",
     "Review",
+    "StudentStat",
+    "Tag",
     "Task",
     "TaskMentor",
+    "TaskTag",
     "User",
     "UserSkill",
 ]
@@ -1,6 +1,7 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -8,13 +9,28 @@ from app.models.base import Base
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    # On Postgres the table is range-partitioned by created_at (migration 0013,
+    # app/db/audit_partitions.py), so every index leads with or ends in created_at.
+    __table_args__ = (
+        Index("ix_audit_logs_created_at_id", "created_at", "id"),
+        Index("ix_audit_logs_actor_created_at_id", "actor_id", "created_at", "id"),
+        Index("ix_audit_logs_entity_created_at_id", "entity_type", "entity_id", "created_at", "id"),
+        Index(
+            "ix_audit_logs_metadata",
+            "metadata",
+            postgresql_using="gin",
+            postgresql_ops={"metadata": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    actor_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True, index=True)
+    actor_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True)
     action: Mapped[str] = mapped_column(String(255), index=True)
-    entity_type: Mapped[str | None] = mapped_column(String(255), nullable=True, index=True)
-    entity_id: Mapped[int | None] = mapped_column(nullable=True, index=True)
-    metadata_json: Mapped[str | None] = mapped_column("metadata", Text, nullable=True)
+    entity_type: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    entity_id: Mapped[int | None] = mapped_column(nullable=True)
+    metadata_json: Mapped[dict | None] = mapped_column(
+        "metadata", JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"), nullable=True
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
     actor = relationship("User")
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Text, UniqueConstraint
+from sqlalchemy import DateTime, ForeignKey, Index, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -8,7 +8,10 @@ from app.models.base import Base
 
 class PortfolioEntry(Base):
     __tablename__ = "portfolio_entries"
-    __table_args__ = (UniqueConstraint("assignment_id", name="uq_portfolio_assignment"),)
+    __table_args__ = (
+        UniqueConstraint("assignment_id", name="uq_portfolio_assignment"),
+        Index("ix_portfolio_entries_student_created_at_id", "student_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     student_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
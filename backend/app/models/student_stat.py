@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class StudentStat(Base):
+    # Read model for per-student application/review statistics, kept current by
+    # the assignment and review services (see app.services.student_stats_service).
+    __tablename__ = "student_stats"
+
+    student_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    applications_total: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    requested_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    active_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    done_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    canceled_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    reviews_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    rating_sum: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -1,12 +1,16 @@
 from datetime import datetime
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, String, Text
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Index, String, Text
+from sqlalchemy.orm import Mapped, mapped_column, query_expression, relationship
 
+from app.db.task_search import register_search_ddl
 from app.models.base import Base
 
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(String(255), index=True)
@@ -20,7 +24,8 @@ class Task(Base):
     practice_possible: Mapped[bool] = mapped_column(default=False)
     course_project_possible: Mapped[bool] = mapped_column(default=False)
     nda_required: Mapped[bool] = mapped_column(default=False)
-    tags: Mapped[str | None] = mapped_column(String(255), index=True)
+    # Display copy of the normalized tags; filtering goes through task_tags.
+    tags: Mapped[str | None] = mapped_column(String(255))
     status: Mapped[str] = mapped_column(
         Enum("open", "in_progress", "completed", "closed", name="task_status"),
         default="open",
@@ -37,11 +42,15 @@ class Task(Base):
     )
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # Only populated by full-text search queries (see app.db.task_search).
+    search_rank: Mapped[float | None] = query_expression()
+    search_snippet: Mapped[str | None] = query_expression()
 
     created_by_user = relationship("User", back_populates="created_tasks", foreign_keys=[created_by])
     curator = relationship("User", foreign_keys=[curator_id])
     mentor = relationship("User", back_populates="mentored_tasks", foreign_keys=[mentor_id])
     mentor_links = relationship("TaskMentor", back_populates="task", cascade="all, delete-orphan")
+    tag_items = relationship("Tag", secondary="task_tags", order_by="Tag.name")
     assignments = relationship("Assignment", back_populates="task")
     comments = relationship("Comment", back_populates="task")
 
@@ -62,3 +71,6 @@ class Task(Base):
             if link.mentor and link.mentor.full_name not in names:
                 names.append(link.mentor.full_name)
         return names
+
+
+register_search_ddl(Task.__table__)
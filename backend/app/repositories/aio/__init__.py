@@ -0,0 +1,8 @@
+from app.repositories.aio import assignment_repo, comment_repo, task_repo, user_repo
+
+__all__ = [
+    "assignment_repo",
+    "comment_repo",
+    "task_repo",
+    "user_repo",
+]
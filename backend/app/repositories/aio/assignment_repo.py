@@ -0,0 +1,8 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.assignment import Assignment
+from app.repositories import assignment_repo
+
+
+async def find_assignment(db: AsyncSession, task_id: int, student_id: int) -> Assignment | None:
+    return (await db.scalars(assignment_repo.find_assignment_query(task_id, student_id))).first()
@@ -0,0 +1,18 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories import comment_repo
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, Page, keyset_page
+
+
+async def list_comments(
+    db: AsyncSession, task_id: int, *, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE, skip: int = 0
+) -> Page:
+    q = comment_repo.list_comments_query(task_id, cursor=cursor, limit=limit, skip=skip)
+    return keyset_page((await db.scalars(q)).all(), comment_repo.PAGE_KEYS, limit)
+
+
+async def list_questions(
+    db: AsyncSession, task_id: int, *, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE, skip: int = 0
+) -> Page:
+    q = comment_repo.list_questions_query(task_id, cursor=cursor, limit=limit, skip=skip)
+    return keyset_page((await db.scalars(q)).all(), comment_repo.PAGE_KEYS, limit)
@@ -0,0 +1,35 @@
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import Task
+from app.repositories import task_repo
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, Page, keyset_page
+
+
+async def get_task(db: AsyncSession, task_id: int, options=()) -> Task | None:
+    return await db.get(Task, task_id, options=options)
+
+
+async def get_task_validator(db: AsyncSession, task_id: int):
+    return (await db.execute(task_repo.validator_query(task_id))).first()
+
+
+async def task_freshness(db: AsyncSession, q: Select):
+    return (await db.execute(task_repo.freshness_query(q))).one()
+
+
+async def page_tasks(
+    db: AsyncSession,
+    q: Select,
+    query: str | None,
+    *,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    skip: int = 0,
+) -> Page:
+    rows = (await db.scalars(task_repo.page_query(q, query, cursor=cursor, limit=limit, skip=skip))).all()
+    return keyset_page(rows, task_repo.page_keys(query), limit)
+
+
+async def task_facets(db: AsyncSession, q: Select) -> dict:
+    return task_repo.facets_from_rows((await db.execute(task_repo.facets_query(q))).all())
@@ -1,37 +1,34 @@
 from sqlalchemy.orm import Session
 
+from app.db.unit_of_work import save
 from app.models.approval import Approval
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, Page, keyset_page, keyset_query
+
+PAGE_KEYS = (Approval.created_at, Approval.id)
 
 
 def create_approval(db: Session, approval: Approval) -> Approval:
-    db.add(approval)
-    db.commit()
-    db.refresh(approval)
-    return approval
+    return save(db, approval)
 
 
 def update_approval(db: Session, approval: Approval) -> Approval:
-    db.add(approval)
-    db.commit()
-    db.refresh(approval)
-    return approval
+    return save(db, approval)
 
 
 def get_approval(db: Session, approval_id: int) -> Approval | None:
     return db.get(Approval, approval_id)
 
 
-def list_approvals(db: Session, skip: int, limit: int) -> list[Approval]:
-    return db.query(Approval).order_by(Approval.created_at.desc()).offset(skip).limit(limit).all()
+def list_approvals(db: Session, *, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE, skip: int = 0) -> Page:
+    rows = keyset_query(db.query(Approval), PAGE_KEYS, cursor, limit, skip).all()
+    return keyset_page(rows, PAGE_KEYS, limit)
 
 
-def list_approvals_by_student(db: Session, student_id: int) -> list[Approval]:
-    return (
-        db.query(Approval)
-        .filter(Approval.requested_by == student_id)
-        .order_by(Approval.created_at.desc())
-        .all()
-    )
+def list_approvals_by_student(
+    db: Session, student_id: int, *, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE
+) -> Page:
+    q = db.query(Approval).filter(Approval.requested_by == student_id)
+    return keyset_page(keyset_query(q, PAGE_KEYS, cursor, limit).all(), PAGE_KEYS, limit)
 
 
 def list_approvals_by_reviewer(db: Session, reviewer_id: int) -> list[Approval]:
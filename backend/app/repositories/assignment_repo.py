@@ -1,35 +1,99 @@
+from datetime import datetime
+
+from sqlalchemy import Row, Select, select, update
 from sqlalchemy.orm import Session, joinedload
 
+from app.db.unit_of_work import save
 from app.models.assignment import Assignment
+from app.models.task import Task
+from app.models.user import User
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, Page, keyset_page, keyset_query
+
+PAGE_KEYS = (Assignment.created_at, Assignment.id)
 
 
 def create_assignment(db: Session, assignment: Assignment) -> Assignment:
-    db.add(assignment)
-    db.commit()
-    db.refresh(assignment)
-    return assignment
+    return save(db, assignment)
 
 
 def get_assignment(db: Session, assignment_id: int) -> Assignment | None:
     return db.get(Assignment, assignment_id)
 
 
+def find_assignment_query(task_id: int, student_id: int) -> Select:
+    return select(Assignment).where(Assignment.task_id == task_id, Assignment.student_id == student_id).limit(1)
+
+
 def find_assignment(db: Session, task_id: int, student_id: int) -> Assignment | None:
-    return (
-        db.query(Assignment)
-        .filter(Assignment.task_id == task_id, Assignment.student_id == student_id)
-        .first()
+    return db.scalars(find_assignment_query(task_id, student_id)).first()
+
+
+def list_assignments_for_student(
+    db: Session, student_id: int, *, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE, skip: int = 0
+) -> Page:
+    q = db.query(Assignment).options(joinedload(Assignment.task)).filter(Assignment.student_id == student_id)
+    return keyset_page(keyset_query(q, PAGE_KEYS, cursor, limit, skip).all(), PAGE_KEYS, limit)
+
+
+def export_applications_query(task_id: int | None = None, state: str | None = None) -> Select:
+    q = (
+        select(
+            Assignment.id,
+            Assignment.task_id,
+            Task.title.label("task_title"),
+            Assignment.student_id,
+            User.full_name.label("student_name"),
+            User.email.label("student_email"),
+            Assignment.state,
+            Assignment.team_role,
+            Assignment.nda_accepted,
+            Assignment.decision_at,
+            Assignment.decided_by,
+            Assignment.decision_reason,
+            Assignment.created_at,
+            Assignment.updated_at,
+        )
+        .join(Task, Task.id == Assignment.task_id)
+        .join(User, User.id == Assignment.student_id)
+        .order_by(Assignment.created_at.desc(), Assignment.id.desc())
+    )
+    if task_id is not None:
+        q = q.where(Assignment.task_id == task_id)
+    if state is not None:
+        q = q.where(Assignment.state == state)
+    return q
+
+
+def lock_assignments(db: Session, assignment_ids: list[int]) -> dict[int, Row]:
+    # Row locks (Postgres) so concurrent single decisions wait for the bulk one.
+    q = (
+        select(Assignment.id, Assignment.state, Assignment.student_id, Assignment.task_id)
+        .where(Assignment.id.in_(assignment_ids))
+        .with_for_update()
     )
+    return {row.id: row for row in db.execute(q)}
 
 
-def list_assignments_for_student(db: Session, student_id: int, skip: int, limit: int):
-    return (
-        db.query(Assignment)
-        .options(joinedload(Assignment.task))
-        .filter(Assignment.student_id == student_id)
-        .offset(skip)
-        .limit(limit)
-        .all()
+def bulk_decide(
+    db: Session,
+    assignment_ids: list[int],
+    *,
+    state: str,
+    decided_by: int,
+    reason: str | None,
+    decided_at: datetime,
+) -> None:
+    db.execute(
+        update(Assignment)
+        .where(Assignment.id.in_(assignment_ids))
+        .values(
+            state=state,
+            decision_at=decided_at,
+            decided_by=decided_by,
+            decision_reason=reason,
+            updated_at=decided_at,
+        )
+        .execution_options(synchronize_session=False)
     )
 
 
@@ -38,7 +102,4 @@ def list_assignments_for_task(db: Session, task_id: int):
 
 
 def update_assignment(db: Session, assignment: Assignment) -> Assignment:
-    db.add(assignment)
-    db.commit()
-    db.refresh(assignment)
-    return assignment
+    return save(db, assignment)
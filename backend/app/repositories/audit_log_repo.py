@@ -1,10 +1,82 @@
+from datetime import datetime
+
+from typing import Any, NamedTuple
+
+from sqlalchemy import Select, and_, func, insert, select, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Session
 
+from app.db.unit_of_work import save
 from app.models.audit_log import AuditLog
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, Page, keyset_page, keyset_query
+
+PAGE_KEYS = (AuditLog.created_at, AuditLog.id)
+
+
+class AuditFilter(NamedTuple):
+    actor_id: int | None = None
+    entity_type: str | None = None
+    entity_id: int | None = None
+    action: str | None = None
+    since: datetime | None = None
+    until: datetime | None = None
+    metadata: dict[str, Any] | None = None
 
 
 def create_audit_log(db: Session, audit_log: AuditLog) -> AuditLog:
-    db.add(audit_log)
-    db.commit()
-    db.refresh(audit_log)
-    return audit_log
+    return save(db, audit_log, flush=False)
+
+
+def bulk_create_audit_logs(db: Session, rows: list[dict]) -> None:
+    # executemany of a single INSERT; SQLAlchemy batches it into multi-row VALUES.
+    db.execute(insert(AuditLog), rows)
+
+
+def metadata_matches(dialect: str, predicate: dict[str, Any]):
+    # Postgres answers containment (@>) from the jsonb_path_ops GIN index; SQLite
+    # falls back to JSON1 lookups on each key.
+    if dialect == "postgresql":
+        return type_coerce(AuditLog.metadata_json, JSONB).contains(predicate)
+    return and_(*(func.json_extract(AuditLog.metadata_json, f'$."{key}"') == value for key, value in predicate.items()))
+
+
+def filter_audit_logs_query(dialect: str, filters: AuditFilter) -> Select:
+    # Every filter is an equality prefix of one of the (..., created_at, id)
+    # indexes and the time range bounds created_at, so Postgres prunes to the
+    # partitions the range touches and walks the index newest first.
+    q = select(AuditLog)
+    if filters.actor_id is not None:
+        q = q.where(AuditLog.actor_id == filters.actor_id)
+    if filters.entity_type is not None:
+        q = q.where(AuditLog.entity_type == filters.entity_type)
+    if filters.entity_id is not None:
+        q = q.where(AuditLog.entity_id == filters.entity_id)
+    if filters.action is not None:
+        q = q.where(AuditLog.action == filters.action)
+    if filters.since is not None:
+        q = q.where(AuditLog.created_at >= filters.since)
+    if filters.until is not None:
+        q = q.where(AuditLog.created_at < filters.until)
+    if filters.metadata:
+        q = q.where(metadata_matches(dialect, filters.metadata))
+    return q
+
+
+def list_audit_logs(
+    db: Session, filters: AuditFilter, *, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE
+) -> Page:
+    q = filter_audit_logs_query(db.get_bind().dialect.name, filters)
+    return keyset_page(db.scalars(keyset_query(q, PAGE_KEYS, cursor, limit)).all(), PAGE_KEYS, limit)
+
+
+def export_audit_logs_query(dialect: str, filters: AuditFilter) -> Select:
+    q = filter_audit_logs_query(dialect, filters)
+    return q.with_only_columns(
+        AuditLog.id,
+        AuditLog.created_at,
+        AuditLog.actor_id,
+        AuditLog.action,
+        AuditLog.entity_type,
+        AuditLog.entity_id,
+        AuditLog.metadata_json.label("metadata"),
+    ).order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
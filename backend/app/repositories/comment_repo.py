@@ -1,41 +1,40 @@
+from sqlalchemy import Select, select
 from sqlalchemy.orm import Session
 
+from app.db.unit_of_work import delete, save
 from app.models.comment import Comment
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, Page, keyset_page, keyset_query
+
+PAGE_KEYS = (Comment.created_at, Comment.id)
 
 
 def create_comment(db: Session, comment: Comment) -> Comment:
-    db.add(comment)
-    db.commit()
-    db.refresh(comment)
-    return comment
+    return save(db, comment)
 
 
 def get_comment(db: Session, comment_id: int) -> Comment | None:
     return db.get(Comment, comment_id)
 
 
-def list_comments(db: Session, task_id: int, skip: int, limit: int):
-    return (
-        db.query(Comment)
-        .filter(Comment.task_id == task_id, Comment.is_private.is_(False))
-        .order_by(Comment.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+def list_comments_query(task_id: int, *, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE, skip: int = 0) -> Select:
+    q = select(Comment).where(Comment.task_id == task_id, Comment.is_private.is_(False))
+    return keyset_query(q, PAGE_KEYS, cursor, limit, skip)
+
+
+def list_questions_query(task_id: int, *, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE, skip: int = 0) -> Select:
+    q = select(Comment).where(Comment.task_id == task_id)
+    return keyset_query(q, PAGE_KEYS, cursor, limit, skip)
+
+
+def list_comments(db: Session, task_id: int, *, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE, skip: int = 0) -> Page:
+    rows = db.scalars(list_comments_query(task_id, cursor=cursor, limit=limit, skip=skip)).all()
+    return keyset_page(rows, PAGE_KEYS, limit)
 
 
-def list_questions(db: Session, task_id: int, skip: int, limit: int):
-    return (
-        db.query(Comment)
-        .filter(Comment.task_id == task_id)
-        .order_by(Comment.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+def list_questions(db: Session, task_id: int, *, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE, skip: int = 0) -> Page:
+    rows = db.scalars(list_questions_query(task_id, cursor=cursor, limit=limit, skip=skip)).all()
+    return keyset_page(rows, PAGE_KEYS, limit)
 
 
 def delete_comment(db: Session, comment: Comment):
-    db.delete(comment)
-    db.commit()
+    delete(db, comment)
@@ -0,0 +1,59 @@
+from collections.abc import Hashable, Iterable
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+LOADERS_KEY = "dataloaders"
+MAX_BATCH_SIZE = 500
+
+
+class DataLoader:
+    # Batches lookups of one entity by one unique column: keys are queued with
+    # prime()/load_many() and resolved together with a single IN (...) query,
+    # and every result (including misses) is memoized for the session's lifetime.
+
+    def __init__(self, db: Session, column: InstrumentedAttribute):
+        self.db = db
+        self.column = column
+        self.entity = column.class_
+        self._cache: dict[Hashable, Any] = {}
+        self._pending: set[Hashable] = set()
+
+    def prime(self, keys: Iterable[Hashable]) -> "DataLoader":
+        self._pending.update(key for key in keys if key is not None and key not in self._cache)
+        return self
+
+    def load(self, key: Hashable) -> Any:
+        if key is None:
+            return None
+        if key not in self._cache:
+            self._pending.add(key)
+            self._dispatch()
+        return self._cache[key]
+
+    def load_many(self, keys: Iterable[Hashable]) -> dict[Hashable, Any]:
+        keys = list(keys)
+        self.prime(keys)
+        self._dispatch()
+        return {key: self._cache.get(key) for key in keys}
+
+    def _dispatch(self) -> None:
+        pending = list(self._pending)
+        self._pending.clear()
+        for start in range(0, len(pending), MAX_BATCH_SIZE):
+            batch = pending[start : start + MAX_BATCH_SIZE]
+            found = {
+                getattr(row, self.column.key): row
+                for row in self.db.scalars(select(self.entity).where(self.column.in_(batch)))
+            }
+            for key in batch:
+                self._cache[key] = found.get(key)
+
+
+def get_loader(db: Session, column: InstrumentedAttribute) -> DataLoader:
+    # Loaders live in session.info, so they are scoped to the request's session.
+    loaders = db.info.setdefault(LOADERS_KEY, {})
+    if column not in loaders:
+        loaders[column] = DataLoader(db, column)
+    return loaders[column]
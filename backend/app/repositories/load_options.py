@@ -0,0 +1,14 @@
+from sqlalchemy.orm import selectinload
+
+from app.models.task import Task
+from app.models.task_mentor import TaskMentor
+
+# Loader profiles: option sets matching what a response schema reads from the ORM
+# object, so serialization never falls back to per-row lazy loads.
+
+# TaskRead: curator_full_name, mentor_full_name and mentor_names.
+TASK_READ = (
+    selectinload(Task.curator),
+    selectinload(Task.mentor),
+    selectinload(Task.mentor_links).selectinload(TaskMentor.mentor),
+)
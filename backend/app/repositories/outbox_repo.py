@@ -0,0 +1,133 @@
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import Row, delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.outbox_job import OutboxJob
+
+CLAIMABLE_STATES = ("pending", "running")
+
+
+def create_job(db: Session, kind: str, payload: dict, *, run_after: datetime, max_attempts: int) -> None:
+    # A Core insert: the job rides in the caller's transaction without adding an
+    # ORM object (and a refresh) to its session.
+    db.execute(
+        insert(OutboxJob),
+        [{"kind": kind, "payload": payload, "run_after": run_after, "max_attempts": max_attempts}],
+    )
+
+
+def create_jobs(db: Session, rows: list[dict]) -> None:
+    if rows:
+        db.execute(insert(OutboxJob), rows)
+
+
+def fail_exhausted_leases(db: Session, *, now: datetime) -> int:
+    # A running job whose lease ran out on its last attempt killed or hung its
+    # worker every time; it fails instead of being leased forever.
+    result = db.execute(
+        update(OutboxJob)
+        .where(OutboxJob.state == "running", OutboxJob.run_after <= now, OutboxJob.attempts >= OutboxJob.max_attempts)
+        .values(
+            state="failed",
+            finished_at=now,
+            locked_by=None,
+            lease_token=None,
+            last_error="Lease expired on the last attempt",
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def claim_jobs(db: Session, worker_id: str, limit: int, *, lease_seconds: float, now: datetime) -> list[Row]:
+    # Postgres: FOR UPDATE SKIP LOCKED lets concurrent workers take disjoint
+    # batches without waiting on each other. SQLite has no row locks, but the
+    # UPDATE runs under its single writer lock and re-checks the claim predicate,
+    # so each due row is leased by exactly one worker.
+    fail_exhausted_leases(db, now=now)
+    due = (
+        OutboxJob.state.in_(CLAIMABLE_STATES),
+        OutboxJob.run_after <= now,
+        OutboxJob.attempts < OutboxJob.max_attempts,
+    )
+    candidates = (
+        select(OutboxJob.id)
+        .where(*due)
+        .order_by(OutboxJob.run_after, OutboxJob.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    stmt = (
+        update(OutboxJob)
+        .where(OutboxJob.id.in_(candidates.scalar_subquery()), *due)
+        .values(
+            state="running",
+            attempts=OutboxJob.attempts + 1,
+            run_after=now + timedelta(seconds=lease_seconds),
+            locked_by=worker_id,
+            lease_token=uuid.uuid4().hex,
+        )
+        .returning(
+            OutboxJob.id,
+            OutboxJob.kind,
+            OutboxJob.payload,
+            OutboxJob.attempts,
+            OutboxJob.max_attempts,
+            OutboxJob.lease_token,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return list(db.execute(stmt))
+
+
+def _owned(job_id: int, lease_token: str):
+    # The token, not the worker id, identifies the claim: worker ids are shared by
+    # every thread of a process, so they cannot tell a re-claimed job apart.
+    return OutboxJob.id == job_id, OutboxJob.state == "running", OutboxJob.lease_token == lease_token
+
+
+def complete_job(db: Session, job_id: int, lease_token: str, *, now: datetime) -> bool:
+    # False when the lease expired and the job was claimed again.
+    result = db.execute(
+        update(OutboxJob)
+        .where(*_owned(job_id, lease_token))
+        .values(state="done", finished_at=now, locked_by=None, lease_token=None, last_error=None)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def fail_job(
+    db: Session, job_id: int, lease_token: str, error: str, *, retry_at: datetime | None, now: datetime
+) -> None:
+    values = {"locked_by": None, "lease_token": None, "last_error": error}
+    if retry_at is None:
+        values.update(state="failed", finished_at=now)
+    else:
+        values.update(state="pending", run_after=retry_at)
+    db.execute(
+        update(OutboxJob)
+        .where(*_owned(job_id, lease_token))
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def prune_done_jobs(db: Session, before: datetime) -> int:
+    result = db.execute(delete(OutboxJob).where(OutboxJob.state == "done", OutboxJob.finished_at < before))
+    return result.rowcount
+
+
+def retry_failed_jobs(db: Session, kind: str | None = None, *, now: datetime) -> int:
+    q = update(OutboxJob).where(OutboxJob.state == "failed")
+    if kind:
+        q = q.where(OutboxJob.kind == kind)
+    result = db.execute(q.values(state="pending", attempts=0, run_after=now, finished_at=None))
+    return result.rowcount
+
+
+def job_counts(db: Session) -> dict[str, int]:
+    rows = db.execute(select(OutboxJob.state, func.count()).group_by(OutboxJob.state))
+    return {state: count for state, count in rows}
@@ -0,0 +1,56 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, NamedTuple, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, Label, Select, tuple_
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 200
+
+
+class Page(NamedTuple):
+    items: list[Any]
+    next_cursor: str | None
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(keys):
+            raise ValueError(cursor)
+        return tuple(
+            datetime.fromisoformat(value) if isinstance(key.type, DateTime) else value
+            for key, value in zip(keys, payload)
+        )
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+
+def keyset_query(q: Select, keys: Sequence, cursor: str | None, limit: int, skip: int = 0) -> Select:
+    # Newest first on an indexed (timestamp, id) pair; one extra row tells us whether
+    # another page exists. skip is only honoured for callers that have no cursor yet.
+    # Labelled keys (e.g. a search rank) are compared on their expression and read
+    # back from the attribute of the same name.
+    exprs = [key.element if isinstance(key, Label) else key for key in keys]
+    q = q.order_by(*(expr.desc() for expr in exprs))
+    if cursor:
+        q = q.where(tuple_(*exprs) < tuple_(*decode_cursor(cursor, keys)))
+    elif skip:
+        q = q.offset(skip)
+    return q.limit(limit + 1)
+
+
+def keyset_page(rows: Sequence, keys: Sequence, limit: int) -> Page:
+    items = list(rows[:limit])
+    if len(rows) <= limit or not items:
+        return Page(items, None)
+    return Page(items, encode_cursor([getattr(items[-1], key.key) for key in keys]))
@@ -1,23 +1,39 @@
+from datetime import datetime
+
+from sqlalchemy import Text, exists, insert, literal, select
 from sqlalchemy.orm import Session
 
+from app.db.unit_of_work import save
+from app.models.assignment import Assignment
 from app.models.portfolio_entry import PortfolioEntry
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, Page, keyset_page, keyset_query
+
+PAGE_KEYS = (PortfolioEntry.created_at, PortfolioEntry.id)
 
 
 def create_portfolio_entry(db: Session, entry: PortfolioEntry) -> PortfolioEntry:
-    db.add(entry)
-    db.commit()
-    db.refresh(entry)
-    return entry
+    return save(db, entry)
 
 
 def get_portfolio_entry_by_assignment(db: Session, assignment_id: int) -> PortfolioEntry | None:
     return db.query(PortfolioEntry).filter(PortfolioEntry.assignment_id == assignment_id).first()
 
 
-def list_portfolio_entries_for_student(db: Session, student_id: int) -> list[PortfolioEntry]:
-    return (
-        db.query(PortfolioEntry)
-        .filter(PortfolioEntry.student_id == student_id)
-        .order_by(PortfolioEntry.created_at.desc())
-        .all()
+def create_entries_for_assignments(db: Session, assignment_ids: list[int], summary: str | None) -> int:
+    # INSERT ... SELECT straight from the assignments, skipping ones that already
+    # have an entry, so running the same job twice adds nothing.
+    rows = select(
+        Assignment.student_id, Assignment.task_id, Assignment.id, literal(summary, Text), literal(datetime.utcnow())
+    ).where(
+        Assignment.id.in_(assignment_ids),
+        ~exists().where(PortfolioEntry.assignment_id == Assignment.id),
     )
+    columns = ["student_id", "task_id", "assignment_id", "summary", "created_at"]
+    return db.execute(insert(PortfolioEntry).from_select(columns, rows)).rowcount
+
+
+def list_portfolio_entries_for_student(
+    db: Session, student_id: int, *, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE
+) -> Page:
+    q = db.query(PortfolioEntry).filter(PortfolioEntry.student_id == student_id)
+    return keyset_page(keyset_query(q, PAGE_KEYS, cursor, limit).all(), PAGE_KEYS, limit)
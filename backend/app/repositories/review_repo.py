@@ -1,27 +1,25 @@
 from sqlalchemy.orm import Session
 
+from app.db.unit_of_work import save
 from app.models.review import Review
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, Page, keyset_page, keyset_query
+
+PAGE_KEYS = (Review.created_at, Review.id)
 
 
 def create_review(db: Session, review: Review) -> Review:
-    db.add(review)
-    db.commit()
-    db.refresh(review)
-    return review
+    return save(db, review)
 
 
 def get_review_by_assignment(db: Session, assignment_id: int) -> Review | None:
     return db.query(Review).filter(Review.assignment_id == assignment_id).first()
 
 
-def list_reviews_for_student(db: Session, student_id: int) -> list[Review]:
-    return (
-        db.query(Review)
-        .join(Review.assignment)
-        .filter(Review.assignment.has(student_id=student_id))
-        .order_by(Review.created_at.desc())
-        .all()
-    )
+def list_reviews_for_student(
+    db: Session, student_id: int, *, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE
+) -> Page:
+    q = db.query(Review).join(Review.assignment).filter(Review.assignment.has(student_id=student_id))
+    return keyset_page(keyset_query(q, PAGE_KEYS, cursor, limit).all(), PAGE_KEYS, limit)
 
 
 def list_reviews_for_task(db: Session, task_id: int) -> list[Review]:
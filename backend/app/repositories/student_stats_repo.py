@@ -0,0 +1,160 @@
+from datetime import datetime
+
+from sqlalchemy import Float, Select, and_, case, cast, delete, func, insert, literal, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.assignment import Assignment
+from app.models.review import Review
+from app.models.student_stat import StudentStat
+from app.models.user import User
+
+STATE_COLUMNS = {
+    "requested": "requested_count",
+    "active": "active_count",
+    "done": "done_count",
+    "canceled": "canceled_count",
+}
+COUNTER_COLUMNS = ("applications_total", *STATE_COLUMNS.values(), "reviews_count", "rating_sum")
+
+_UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _ensure_row(db: Session, student_id: int) -> None:
+    dialect_insert = _UPSERT_DIALECTS.get(db.get_bind().dialect.name)
+    if dialect_insert is not None:
+        stmt = dialect_insert(StudentStat).values(student_id=student_id, updated_at=datetime.utcnow())
+        db.execute(stmt.on_conflict_do_nothing(index_elements=[StudentStat.student_id]))
+    elif db.get(StudentStat, student_id) is None:
+        db.add(StudentStat(student_id=student_id))
+        db.flush()
+
+
+def apply_deltas(db: Session, student_id: int, deltas: dict[str, int]) -> None:
+    # Relative UPDATEs so concurrent transactions never overwrite each other's counts.
+    deltas = {column: delta for column, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    _ensure_row(db, student_id)
+    values = {column: getattr(StudentStat, column) + delta for column, delta in deltas.items()}
+    db.execute(
+        update(StudentStat)
+        .where(StudentStat.student_id == student_id)
+        .values(**values, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def get_stats(db: Session, student_id: int) -> StudentStat | None:
+    return db.get(StudentStat, student_id)
+
+
+def get_stats_map(db: Session, student_ids: list[int]) -> dict[int, StudentStat]:
+    if not student_ids:
+        return {}
+    rows = db.scalars(select(StudentStat).where(StudentStat.student_id.in_(student_ids)))
+    return {row.student_id: row for row in rows}
+
+
+def expected_stats_query() -> Select:
+    reviews = (
+        select(
+            Assignment.student_id.label("student_id"),
+            func.count(Review.id).label("reviews_count"),
+            func.coalesce(func.sum(Review.rating), 0).label("rating_sum"),
+        )
+        .join(Assignment, Assignment.id == Review.assignment_id)
+        .group_by(Assignment.student_id)
+        .subquery()
+    )
+    state_counts = [
+        func.coalesce(func.sum(case((Assignment.state == state, 1), else_=0)), 0).label(column)
+        for state, column in STATE_COLUMNS.items()
+    ]
+    return (
+        select(
+            Assignment.student_id.label("student_id"),
+            func.count(Assignment.id).label("applications_total"),
+            *state_counts,
+            func.coalesce(func.max(reviews.c.reviews_count), 0).label("reviews_count"),
+            func.coalesce(func.max(reviews.c.rating_sum), 0).label("rating_sum"),
+        )
+        .outerjoin(reviews, reviews.c.student_id == Assignment.student_id)
+        .group_by(Assignment.student_id)
+    )
+
+
+def rebuild(db: Session) -> int:
+    expected = expected_stats_query().subquery()
+    db.execute(delete(StudentStat))
+    result = db.execute(
+        insert(StudentStat).from_select(
+            ["student_id", *COUNTER_COLUMNS, "updated_at"],
+            select(*(expected.c[name] for name in ("student_id", *COUNTER_COLUMNS)), func.now()),
+        )
+    )
+    return result.rowcount
+
+
+def find_drift(db: Session) -> list[dict]:
+    expected = {row.student_id: row._mapping for row in db.execute(expected_stats_query())}
+    stored = {row.student_id: row for row in db.scalars(select(StudentStat))}
+    drift = []
+    for student_id in sorted(expected.keys() | stored.keys()):
+        want = expected.get(student_id)
+        have = stored.get(student_id)
+        for column in COUNTER_COLUMNS:
+            expected_value = want[column] if want is not None else 0
+            stored_value = getattr(have, column) if have is not None else 0
+            if expected_value != stored_value:
+                drift.append(
+                    {"student_id": student_id, "column": column, "expected": expected_value, "stored": stored_value}
+                )
+    return drift
+
+
+def ranked_students_query(
+    *,
+    bayesian: bool,
+    prior_weight: float,
+    skills: list[str],
+    min_rating: float | None,
+    min_completed: int | None,
+) -> tuple[Select, tuple]:
+    # Ranking reads only the compact student_stats rows joined to active students.
+    reviews = func.coalesce(StudentStat.reviews_count, 0)
+    rating_sum = func.coalesce(StudentStat.rating_sum, 0)
+    completed = func.coalesce(StudentStat.done_count, 0)
+    average = cast(rating_sum, Float) / func.nullif(reviews, 0)
+    if bayesian:
+        mean = cast(func.sum(StudentStat.rating_sum), Float) / func.nullif(func.sum(StudentStat.reviews_count), 0)
+        global_mean = select(func.coalesce(mean, 0.0)).scalar_subquery()
+        # nullif: a zero weight leaves unreviewed students unscored (0) instead of
+        # dividing by zero.
+        weighted = (literal(prior_weight) * global_mean + rating_sum) / func.nullif(literal(prior_weight) + reviews, 0)
+        score = func.coalesce(weighted, 0.0)
+    else:
+        score = func.coalesce(average, 0.0)
+    score = cast(score, Float)
+
+    q = (
+        select(
+            User.id,
+            User.full_name,
+            User.email,
+            User.skills,
+            completed.label("completed_projects"),
+            average.label("average_rating"),
+            score.label("score"),
+        )
+        .outerjoin(StudentStat, StudentStat.student_id == User.id)
+        .where(User.role == "student", User.status == "active", User.is_deleted.is_(False))
+    )
+    for skill in skills:
+        q = q.where(User.skills.ilike(f"%{skill}%"))
+    if min_rating is not None:
+        q = q.where(and_(reviews > 0, average >= min_rating))
+    if min_completed is not None:
+        q = q.where(completed >= min_completed)
+    keys = (score.label("score"), completed.label("completed_projects"), User.id)
+    return q, keys
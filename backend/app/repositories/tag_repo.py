@@ -0,0 +1,63 @@
+from typing import NamedTuple
+
+from sqlalchemy import ColumnElement, func, select
+from sqlalchemy.orm import Session
+
+from app.models.tag import Tag, TaskTag
+from app.models.task import Task
+
+MAX_TAG_LENGTH = 64
+
+
+class TagFilter(NamedTuple):
+    names: list[str]
+    match_all: bool = False
+
+
+def parse_tags(raw: str | None) -> list[str]:
+    names = []
+    for part in (raw or "").split(","):
+        name = part.strip().lower()[:MAX_TAG_LENGTH]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def tag_filter(raw: str | None, match: str = "any") -> TagFilter | None:
+    names = parse_tags(raw)
+    return TagFilter(names, match == "all") if names else None
+
+
+def tag_filter_clause(tags: TagFilter) -> ColumnElement:
+    task_ids = (
+        select(TaskTag.task_id)
+        .join(Tag, Tag.id == TaskTag.tag_id)
+        .where(Tag.name.in_(tags.names))
+    )
+    if tags.match_all:
+        task_ids = task_ids.group_by(TaskTag.task_id).having(func.count() == len(tags.names))
+    return Task.id.in_(task_ids)
+
+
+def get_or_create_tags(db: Session, names: list[str]) -> list[Tag]:
+    existing = {tag.name: tag for tag in db.scalars(select(Tag).where(Tag.name.in_(names)))} if names else {}
+    for name in names:
+        if name not in existing:
+            existing[name] = Tag(name=name)
+            db.add(existing[name])
+    return [existing[name] for name in names]
+
+
+def set_task_tags(db: Session, task: Task, raw: str | None) -> None:
+    names = parse_tags(raw)
+    task.tag_items = get_or_create_tags(db, names)
+    task.tags = ", ".join(names) or None
+
+
+def set_tasks_tags(db: Session, tasks: list[tuple[Task, str | None]]) -> None:
+    # Bulk variant of set_task_tags: one tag lookup for the whole batch.
+    parsed = [(task, parse_tags(raw)) for task, raw in tasks]
+    tags = {tag.name: tag for tag in get_or_create_tags(db, sorted({name for _, names in parsed for name in names}))}
+    for task, names in parsed:
+        task.tag_items = [tags[name] for name in names]
+        task.tags = ", ".join(names) or None
@@ -1,21 +1,20 @@
 from sqlalchemy.orm import Session
 
+from app.db.unit_of_work import delete, save
 from app.models.task_mentor import TaskMentor
+from app.repositories.task_repo import touch_task
 
 
 def add_task_mentor(db: Session, task_id: int, mentor_id: int) -> TaskMentor:
-    link = TaskMentor(task_id=task_id, mentor_id=mentor_id)
-    db.add(link)
-    db.commit()
-    db.refresh(link)
-    return link
+    touch_task(db, task_id)
+    return save(db, TaskMentor(task_id=task_id, mentor_id=mentor_id))
 
 
 def remove_task_mentor(db: Session, task_id: int, mentor_id: int) -> None:
     link = db.query(TaskMentor).filter(TaskMentor.task_id == task_id, TaskMentor.mentor_id == mentor_id).first()
     if link:
-        db.delete(link)
-        db.commit()
+        touch_task(db, task_id)
+        delete(db, link)
 
 
 def list_task_mentors(db: Session, task_id: int) -> list[TaskMentor]:
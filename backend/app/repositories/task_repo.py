@@ -1,37 +1,198 @@
-from sqlalchemy.orm import Session
+from datetime import datetime
 
+from sqlalchemy import Select, String, cast, func, literal, null, select, union_all, update
+from sqlalchemy.orm import Session, aliased, with_expression
+
+from app.db import task_search
+from app.db.unit_of_work import delete, save
+from app.models.tag import Tag, TaskTag
 from app.models.task import Task
+from app.models.task_mentor import TaskMentor
+from app.models.user import User
+from app.repositories import load_options, tag_repo
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, Page, keyset_page, keyset_query
+from app.repositories.tag_repo import TagFilter
+
+PAGE_KEYS = (Task.created_at, Task.id)
 
 
 def create_task(db: Session, task: Task) -> Task:
-    db.add(task)
-    db.commit()
-    db.refresh(task)
-    return task
+    return save(db, task)
+
+
+def get_task(db: Session, task_id: int, options=()) -> Task | None:
+    return db.get(Task, task_id, options=options)
 
 
-def get_task(db: Session, task_id: int) -> Task | None:
-    return db.get(Task, task_id)
+def page_keys(query: str | None) -> tuple:
+    if task_search.is_searchable(query):
+        return (task_search.search_rank(query).label("search_rank"), Task.id)
+    return PAGE_KEYS
 
 
-def list_tasks(db: Session, skip: int, limit: int, status: str | None, tag: str | None, query: str | None):
-    q = db.query(Task)
+def _apply_filters(q: Select, status: str | None, tags: TagFilter | None, query: str | None) -> Select:
     if status:
-        q = q.filter(Task.status == status)
-    if tag:
-        q = q.filter(Task.tags.ilike(f"%{tag}%"))
-    if query:
-        q = q.filter(Task.title.ilike(f"%{query}%"))
-    return q.offset(skip).limit(limit).all()
+        q = q.where(Task.status == status)
+    if tags:
+        q = q.where(tag_repo.tag_filter_clause(tags))
+    if task_search.is_searchable(query):
+        q = q.where(task_search.search_match(query))
+    return q
+
+
+# Filter builders return a bare select(Task) so the same filter can feed a page
+# (page_query) or an aggregate (facets_query).
+
+
+def filter_tasks_query(status: str | None, tags: TagFilter | None, query: str | None) -> Select:
+    return _apply_filters(select(Task), status, tags, query)
+
+
+def filter_curator_tasks_query(
+    curator_id: int, status: str | None, tags: TagFilter | None, query: str | None
+) -> Select:
+    q = select(Task).where((Task.curator_id == curator_id) | (Task.created_by == curator_id))
+    return _apply_filters(q, status, tags, query)
+
+
+def filter_mentor_tasks_query(
+    mentor_id: int, status: str | None, tags: TagFilter | None, query: str | None
+) -> Select:
+    q = select(Task).where(
+        (Task.mentor_id == mentor_id)
+        | Task.id.in_(select(TaskMentor.task_id).where(TaskMentor.mentor_id == mentor_id))
+    )
+    return _apply_filters(q, status, tags, query)
+
+
+def filter_public_tasks_query(tags: TagFilter | None, query: str | None) -> Select:
+    q = (
+        select(Task)
+        .where(Task.visibility == "public")
+        .where(Task.status.in_(["open", "in_progress"]))
+        .where(Task.is_archived.is_(False))
+    )
+    return _apply_filters(q, None, tags, query)
+
+
+def validator_query(task_id: int) -> Select:
+    # Just what a conditional GET needs to authorize the caller and build the ETag.
+    return select(Task.updated_at, Task.is_archived, Task.visibility, Task.nda_required).where(Task.id == task_id)
+
+
+def freshness_query(q: Select) -> Select:
+    # max(updated_at) changes on any insert or update in the filtered set, the
+    # count on deletes and on rows leaving the filter.
+    listed = q.subquery()
+    return select(func.max(listed.c.updated_at).label("updated_at"), func.count().label("total"))
+
+
+def page_query(
+    q: Select,
+    query: str | None,
+    *,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    skip: int = 0,
+) -> Select:
+    q = q.options(*load_options.TASK_READ)
+    if task_search.is_searchable(query):
+        q = q.options(
+            with_expression(Task.search_rank, task_search.search_rank(query)),
+            with_expression(Task.search_snippet, task_search.search_snippet(query)),
+        ).execution_options(populate_existing=True)
+    return keyset_query(q, page_keys(query), cursor, limit, skip)
+
+
+def export_query(q: Select) -> Select:
+    # Flat, spreadsheet-friendly columns for a filter; the long text fields stay out.
+    curator = aliased(User)
+    mentor = aliased(User)
+    return (
+        q.with_only_columns(
+            Task.id,
+            Task.title,
+            Task.status,
+            Task.visibility,
+            Task.tags,
+            Task.nda_required,
+            Task.is_archived,
+            Task.deadline,
+            curator.full_name.label("curator"),
+            mentor.full_name.label("mentor"),
+            Task.created_at,
+            Task.updated_at,
+        )
+        .join_from(Task, curator, curator.id == Task.curator_id, isouter=True)
+        .join_from(Task, mentor, mentor.id == Task.mentor_id, isouter=True)
+        .order_by(Task.created_at.desc(), Task.id.desc())
+    )
+
+
+def facets_query(q: Select) -> Select:
+    # Tag, status and total counts for one filter in a single round trip.
+    filtered = q.with_only_columns(Task.id, Task.status).cte("filtered_tasks")
+    by_tag = (
+        select(literal("tag").label("facet"), Tag.name.label("value"), func.count().label("count"))
+        .select_from(filtered)
+        .join(TaskTag, TaskTag.task_id == filtered.c.id)
+        .join(Tag, Tag.id == TaskTag.tag_id)
+        .group_by(Tag.name)
+    )
+    by_status = select(literal("status"), cast(filtered.c.status, String), func.count()).group_by(
+        filtered.c.status
+    )
+    total = select(literal("total"), cast(null(), String), func.count()).select_from(filtered)
+    return union_all(by_tag, by_status, total)
+
+
+def facets_from_rows(rows) -> dict:
+    facets = {"total": 0, "statuses": [], "tags": []}
+    for facet, value, count in rows:
+        if facet == "total":
+            facets["total"] = count
+        elif facet == "status":
+            facets["statuses"].append({"value": value, "count": count})
+        else:
+            facets["tags"].append({"value": value, "count": count})
+    facets["tags"].sort(key=lambda item: (-item["count"], item["value"]))
+    facets["statuses"].sort(key=lambda item: (-item["count"], item["value"]))
+    return facets
+
+
+def list_tasks(
+    db: Session,
+    status: str | None,
+    tags: TagFilter | None,
+    query: str | None,
+    *,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    skip: int = 0,
+) -> Page:
+    q = page_query(filter_tasks_query(status, tags, query), query, cursor=cursor, limit=limit, skip=skip)
+    return keyset_page(db.scalars(q).all(), page_keys(query), limit)
 
 
 def update_task(db: Session, task: Task) -> Task:
-    db.add(task)
-    db.commit()
-    db.refresh(task)
-    return task
+    return save(db, task)
+
+
+def touch_task(db: Session, task_id: int) -> None:
+    # For changes to rows rendered inside TaskRead (mentors) so the task's ETag moves.
+    db.execute(update(Task).where(Task.id == task_id).values(updated_at=datetime.utcnow()))
+
+
+def touch_tasks_of_users_query(user_ids: list[int]):
+    # Tasks that render one of these users' names (curator, mentor, mentor list).
+    mentored = select(TaskMentor.task_id).where(TaskMentor.mentor_id.in_(user_ids))
+    return (
+        update(Task)
+        .where((Task.curator_id.in_(user_ids)) | (Task.mentor_id.in_(user_ids)) | (Task.id.in_(mentored)))
+        .values(updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
 
 
 def delete_task(db: Session, task: Task):
-    db.delete(task)
-    db.commit()
+    delete(db, task)
@@ -1,6 +1,12 @@
+from sqlalchemy import Select, insert, select
 from sqlalchemy.orm import Session
 
+from app.db.unit_of_work import save
+from app.models.student_stat import StudentStat
 from app.models.user import User
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, Page, keyset_page, keyset_query
+
+PAGE_KEYS = (User.created_at, User.id)
 
 
 def get_by_email(db: Session, email: str, include_deleted: bool = False) -> User | None:
@@ -10,22 +16,70 @@ def get_by_email(db: Session, email: str, include_deleted: bool = False) -> User
     return query.first()
 
 
-def list_users(db: Session, skip: int, limit: int):
-    return db.query(User).filter(User.is_deleted.is_(False)).offset(skip).limit(limit).all()
+def list_users(db: Session, *, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE, skip: int = 0) -> Page:
+    q = db.query(User).filter(User.is_deleted.is_(False))
+    return keyset_page(keyset_query(q, PAGE_KEYS, cursor, limit, skip).all(), PAGE_KEYS, limit)
 
 
-def list_users_by_role(db: Session, role: str, skip: int, limit: int):
-    return (
-        db.query(User)
-        .filter(User.role == role, User.is_deleted.is_(False))
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+def list_users_by_role(
+    db: Session,
+    role: str,
+    user_status: str | None = None,
+    *,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page:
+    q = db.query(User).filter(User.role == role, User.is_deleted.is_(False))
+    if user_status:
+        q = q.filter(User.status == user_status)
+    return keyset_page(keyset_query(q, PAGE_KEYS, cursor, limit).all(), PAGE_KEYS, limit)
 
 
 def create_user(db: Session, user: User) -> User:
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
+    return save(db, user)
+
+
+def existing_emails(db: Session, emails: list[str]) -> set[str]:
+    # Soft-deleted accounts still own their email (unique constraint), so they count.
+    if not emails:
+        return set()
+    return set(db.scalars(select(User.email).where(User.email.in_(emails))))
+
+
+def roles_by_id(db: Session, user_ids: set[int]) -> dict[int, str]:
+    if not user_ids:
+        return {}
+    rows = db.execute(select(User.id, User.role).where(User.id.in_(user_ids), User.is_deleted.is_(False)))
+    return {user_id: role for user_id, role in rows}
+
+
+def bulk_create_users(db: Session, rows: list[dict]) -> list[int]:
+    # One executemany; SQLAlchemy sends it as multi-row INSERT ... RETURNING batches.
+    return list(db.scalars(insert(User).returning(User.id, sort_by_parameter_order=True), rows))
+
+
+def export_students_query(user_status: str | None = None) -> Select:
+    q = (
+        select(
+            User.id,
+            User.email,
+            User.full_name,
+            User.faculty,
+            User.course,
+            User.skills,
+            User.status,
+            User.created_at,
+            User.last_active_at,
+            StudentStat.applications_total,
+            StudentStat.active_count,
+            StudentStat.done_count,
+            StudentStat.reviews_count,
+            StudentStat.rating_sum,
+        )
+        .outerjoin(StudentStat, StudentStat.student_id == User.id)
+        .where(User.role == "student", User.is_deleted.is_(False))
+        .order_by(User.created_at.desc(), User.id.desc())
+    )
+    if user_status:
+        q = q.where(User.status == user_status)
+    return q
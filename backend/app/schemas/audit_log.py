@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class AuditLogRead(BaseModel):
+    id: int
+    actor_id: int | None = None
+    action: str
+    entity_type: str | None = None
+    entity_id: int | None = None
+    metadata: dict[str, Any] | None = Field(default=None, validation_alias="metadata_json")
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -8,3 +8,4 @@ class HrStudentSummary(BaseModel):
     skills: str | None = None
     completed_projects: int
     average_rating: float | None = None
+    score: float
@@ -0,0 +1,23 @@
+from pydantic import BaseModel, EmailStr, Field
+
+
+class UserImportRow(BaseModel):
+    email: EmailStr
+    full_name: str = Field(min_length=2, max_length=255)
+    password: str = Field(min_length=8, max_length=128)
+    role: str = "student"
+    status: str = "active"
+    faculty: str | None = Field(default=None, max_length=255)
+    skills: str | None = Field(default=None, max_length=500)
+    course: str | None = Field(default=None, max_length=255)
+
+
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    total: int
+    created: int
+    errors: list[ImportRowError]
@@ -1,4 +1,6 @@
 from datetime import datetime
+from typing import Literal
+
 from pydantic import BaseModel, EmailStr, Field
 
 
@@ -64,3 +66,21 @@ class ApplicationWithStudent(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ApplicationDecision(BaseModel):
+    assignment_id: int
+    state: Literal["active", "canceled"]
+    reason: str | None = Field(default=None, max_length=2000)
+
+
+class BulkDecisionRequest(BaseModel):
+    decisions: list[ApplicationDecision] = Field(min_length=1, max_length=1000)
+
+
+class ApplicationDecisionResult(BaseModel):
+    assignment_id: int
+    ok: bool
+    state: str | None = None
+    error: str | None = None
+
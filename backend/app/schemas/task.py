@@ -61,6 +61,19 @@ class TaskRead(TaskBase):
     curator_full_name: str | None = None
     mentor_full_name: str | None = None
     mentor_names: list[str] | None = None
+    search_rank: float | None = None
+    search_snippet: str | None = None
 
     class Config:
         from_attributes = True
+
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class TaskFacets(BaseModel):
+    total: int
+    statuses: list[FacetCount]
+    tags: list[FacetCount]
@@ -0,0 +1,101 @@
+import logging
+import threading
+from datetime import datetime
+
+from sqlalchemy import update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.user import User
+from app.services.audit_service import log_action
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+# Coalesces last_active_at: however often a user logs in between flushes, one
+# UPDATE row per user is written. The login audit entries go through the audit
+# pipeline like every other audit row.
+class ActivityTracker:
+    def __init__(self, flush_interval: float, flush_max_users: int):
+        self.flush_interval = flush_interval
+        self.flush_max_users = flush_max_users
+        self._last_active: dict[int, datetime] = {}
+        self._retry: dict[int, datetime] | None = None
+        self._bind: Engine | None = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+
+    def record_login(self, db: Session, user_id: int, at: datetime | None = None) -> None:
+        at = at or datetime.utcnow()
+        log_action(db, actor_id=user_id, action="user_login", entity_type="user", entity_id=user_id)
+        with self._lock:
+            self._bind = db.get_bind()
+            previous = self._last_active.get(user_id)
+            if previous is None or previous < at:
+                self._last_active[user_id] = at
+            full = len(self._last_active) >= self.flush_max_users
+        self._ensure_worker()
+        if full:
+            self._wakeup.set()
+
+    def flush(self) -> None:
+        with self._flush_lock:
+            with self._lock:
+                fresh, self._last_active = self._last_active, {}
+                retry, self._retry = self._retry, None
+                bind = self._bind
+            last_active = dict(fresh)
+            for user_id, at in (retry or {}).items():
+                last_active[user_id] = max(at, last_active.get(user_id, at))
+            if bind is None or not last_active:
+                return
+            try:
+                with Session(bind=bind) as session:
+                    session.execute(
+                        update(User),
+                        [{"id": user_id, "last_active_at": at} for user_id, at in last_active.items()],
+                    )
+                    session.commit()
+            except Exception:
+                if retry:
+                    # Only the batch that has now failed twice is dropped; what was
+                    # recorded since gets its own retry on the next flush.
+                    logger.exception("Dropping %s activity updates after a failed retry", len(retry))
+                    last_active = fresh
+                else:
+                    logger.exception("Failed to flush activity updates, will retry")
+                if last_active:
+                    with self._lock:
+                        self._retry = last_active
+
+    def _ensure_worker(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="activity-flush", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def shutdown(self) -> None:
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+            self._thread = None
+        self.flush()
+
+
+activity_tracker = ActivityTracker(settings.activity_flush_interval_seconds, settings.activity_flush_max_users)
@@ -1,12 +1,17 @@
+from collections import defaultdict
 from datetime import datetime
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.db.unit_of_work import after_commit
 from app.models.assignment import Assignment
 from app.models.task import Task
 from app.repositories import assignment_repo
-from app.services.audit_service import log_action
-from app.services.portfolio_service import create_portfolio_entry_for_assignment
+from app.schemas.manager import ApplicationDecision, ApplicationDecisionResult
+from app.services.audit_service import log_action, log_actions
+from app.services import project_event_service, student_stats_service
+from app.services.dashboard_service import DASHBOARD_KEY, dashboard_cache
+from app.services.portfolio_service import schedule_portfolio_entries
 
 
 def request_assignment(
@@ -30,6 +35,7 @@ def request_assignment(
         nda_accepted=bool(nda_accepted),
     )
     created = assignment_repo.create_assignment(db, assignment)
+    student_stats_service.assignment_created(db, student_id, created.state)
     log_action(
         db,
         actor_id=student_id,
@@ -42,15 +48,13 @@ def request_assignment(
 
 
 def update_assignment_state(db: Session, assignment: Assignment, state: str) -> Assignment:
+    previous = assignment.state
     assignment.state = state
     assignment.updated_at = datetime.utcnow()
     updated = assignment_repo.update_assignment(db, assignment)
+    student_stats_service.assignment_moved(db, assignment.student_id, previous, state)
     if state == "active":
-        create_portfolio_entry_for_assignment(
-            db,
-            assignment,
-            summary="Назначен в команду проекта.",
-        )
+        schedule_portfolio_entries(db, [assignment.id])
     return updated
 
 
@@ -62,18 +66,16 @@ def decide_assignment(
     decided_by: int,
     reason: str | None = None,
 ) -> Assignment:
+    previous = assignment.state
     assignment.state = state
     assignment.decision_at = datetime.utcnow()
     assignment.decided_by = decided_by
     assignment.decision_reason = reason
     assignment.updated_at = datetime.utcnow()
     updated = assignment_repo.update_assignment(db, assignment)
+    student_stats_service.assignment_moved(db, assignment.student_id, previous, state)
     if state == "active":
-        create_portfolio_entry_for_assignment(
-            db,
-            assignment,
-            summary="Назначен в команду проекта.",
-        )
+        schedule_portfolio_entries(db, [assignment.id])
     log_action(
         db,
         actor_id=decided_by,
@@ -83,3 +85,69 @@ def decide_assignment(
         metadata={"state": state},
     )
     return updated
+
+
+def bulk_decide_assignments(
+    db: Session, decisions: list[ApplicationDecision], *, decided_by: int
+) -> list[ApplicationDecisionResult]:
+    # The same effects as decide_assignment for every item, but set-based: one
+    # locking SELECT, one UPDATE per (state, reason) group, one portfolio job,
+    # per-student stats deltas and one batch of audit rows, all in the caller's
+    # transaction. Items that cannot be applied are reported, not raised.
+    current = assignment_repo.lock_assignments(db, [decision.assignment_id for decision in decisions])
+    results = []
+    applied = []
+    seen = set()
+    for decision in decisions:
+        row = current.get(decision.assignment_id)
+        if decision.assignment_id in seen:
+            error = "Duplicate assignment in request"
+        elif row is None:
+            error = "Application not found"
+        elif row.state == decision.state:
+            error = f"Application is already {decision.state}"
+        else:
+            error = None
+        seen.add(decision.assignment_id)
+        if error:
+            state = row.state if row else None
+            results.append(ApplicationDecisionResult(assignment_id=decision.assignment_id, ok=False, state=state, error=error))
+            continue
+        results.append(ApplicationDecisionResult(assignment_id=decision.assignment_id, ok=True, state=decision.state))
+        applied.append((decision, row))
+    if not applied:
+        return results
+
+    decided_at = datetime.utcnow()
+    groups: dict[tuple[str, str | None], list[int]] = defaultdict(list)
+    for decision, row in applied:
+        groups[(decision.state, decision.reason)].append(row.id)
+    for (state, reason), assignment_ids in groups.items():
+        assignment_repo.bulk_decide(
+            db, assignment_ids, state=state, decided_by=decided_by, reason=reason, decided_at=decided_at
+        )
+
+    student_stats_service.assignments_moved(db, [(row.student_id, row.state, decision.state) for decision, row in applied])
+
+    activated = [row.id for decision, row in applied if decision.state == "active"]
+    if activated:
+        schedule_portfolio_entries(db, activated)
+
+    entries = []
+    for decision, row in applied:
+        base = {"actor_id": decided_by, "entity_type": "assignment", "entity_id": row.id}
+        entries.append({**base, "action": "assignment_decided", "metadata": {"state": decision.state, "bulk": True}})
+        action = "assignment_approved" if decision.state == "active" else "assignment_rejected"
+        entries.append({**base, "action": action})
+    log_actions(db, entries)
+    project_event_service.queue_events(
+        db,
+        [
+            project_event_service.team_event(row.id, row.task_id, row.student_id, decision.state, row.state)
+            for decision, row in applied
+        ],
+    )
+    # Core UPDATEs bypass the ORM flush events the dashboard cache listens to.
+    after_commit(db, lambda: dashboard_cache.invalidate(DASHBOARD_KEY))
+    return results
+
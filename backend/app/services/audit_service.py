@@ -1,9 +1,107 @@
-import json
+import logging
+import queue
+import threading
+from datetime import datetime
+
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
+from app.db.unit_of_work import after_commit
 from app.models.audit_log import AuditLog
 from app.repositories import audit_log_repo
 
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class AuditPipeline:
+    def __init__(self, flush_size: int, flush_interval: float, max_queue: int):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue[dict] = queue.Queue(maxsize=max_queue)
+        self._bind: Engine | None = None
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+
+    def enqueue(self, bind: Engine, row: dict) -> None:
+        self._bind = bind
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            # Backpressure instead of data loss: write this row on the caller's thread.
+            self._write(bind, [row])
+            return
+        self._ensure_worker()
+        if self._queue.qsize() >= self.flush_size:
+            self._wakeup.set()
+
+    def enqueue_many(self, bind: Engine, rows: list[dict]) -> None:
+        for row in rows:
+            self.enqueue(bind, row)
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def flush(self) -> None:
+        with self._flush_lock:
+            while True:
+                batch = []
+                while len(batch) < self.flush_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if not batch or self._bind is None:
+                    return
+                self._write(self._bind, batch)
+
+    def _write(self, bind: Engine, rows: list[dict]) -> None:
+        for attempt in (1, 2):
+            try:
+                with Session(bind=bind) as session:
+                    audit_log_repo.bulk_create_audit_logs(session, rows)
+                    session.commit()
+                return
+            except Exception:
+                if attempt == 2:
+                    logger.exception("Dropping %s audit rows after a failed retry", len(rows))
+                else:
+                    logger.warning("Failed to write %s audit rows, retrying", len(rows), exc_info=True)
+
+    def _ensure_worker(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._flush_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="audit-flush", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def shutdown(self) -> None:
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+            self._thread = None
+        self.flush()
+
+
+audit_pipeline = AuditPipeline(
+    settings.audit_flush_size,
+    settings.audit_flush_interval_seconds,
+    settings.audit_queue_max_size,
+)
+
 
 def log_action(
     db: Session,
@@ -13,13 +111,44 @@ def log_action(
     entity_type: str | None = None,
     entity_id: int | None = None,
     metadata: dict | None = None,
-) -> AuditLog:
-    payload = json.dumps(metadata, ensure_ascii=False) if metadata else None
-    audit_log = AuditLog(
-        actor_id=actor_id,
-        action=action,
-        entity_type=entity_type,
-        entity_id=entity_id,
-        metadata_json=payload,
-    )
-    return audit_log_repo.create_audit_log(db, audit_log)
+    durable: bool = False,
+) -> None:
+    row = {
+        "actor_id": actor_id,
+        "action": action,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "metadata_json": metadata or None,
+        "created_at": datetime.utcnow(),
+    }
+    if durable or settings.audit_mode == "strict":
+        # Joins the caller's transaction: the row commits or rolls back with the action.
+        audit_log_repo.create_audit_log(db, AuditLog(**row))
+        return
+    # Queued only once the action itself has committed, so rolled-back work is never audited.
+    bind = db.get_bind()
+    after_commit(db, lambda: audit_pipeline.enqueue(bind, row))
+
+
+def log_actions(db: Session, entries: list[dict], *, durable: bool = False) -> None:
+    # Bulk form of log_action; each entry takes log_action's keyword arguments.
+    now = datetime.utcnow()
+    rows = [
+        {
+            "actor_id": entry.get("actor_id"),
+            "action": entry["action"],
+            "entity_type": entry.get("entity_type"),
+            "entity_id": entry.get("entity_id"),
+            "metadata_json": entry.get("metadata") or None,
+            "created_at": now,
+        }
+        for entry in entries
+    ]
+    if not rows:
+        return
+    if durable or settings.audit_mode == "strict":
+        audit_log_repo.bulk_create_audit_logs(db, rows)
+        return
+    bind = db.get_bind()
+    after_commit(db, lambda: audit_pipeline.enqueue_many(bind, rows))
+
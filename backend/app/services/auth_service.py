@@ -1,34 +1,49 @@
-from datetime import datetime
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from app.core.security import create_access_token, create_refresh_token, get_password_hash, verify_password
+from app.core.principal_cache import invalidate_principal
+from app.core.security import (
+    create_access_token,
+    create_refresh_token,
+    get_password_hash,
+    get_password_hash_async,
+    verify_password_async,
+)
+from app.db.unit_of_work import save
 from app.models.user import User
 from app.repositories import user_repo
+from app.services.activity_service import activity_tracker
 from app.services.audit_service import log_action
 
 
-def register_user(db: Session, email: str, full_name: str, password: str) -> User:
-    existing = user_repo.get_by_email(db, email, include_deleted=True)
+async def register_user(db: Session, email: str, full_name: str, password: str) -> User:
+    # Async so the bcrypt hash is awaited instead of holding a threadpool thread;
+    # the short database steps still run in the threadpool.
+    existing = await run_in_threadpool(user_repo.get_by_email, db, email, include_deleted=True)
     if existing and not existing.is_deleted:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
-    if existing and existing.is_deleted:
+    password_hash = await get_password_hash_async(password)
+    return await run_in_threadpool(_store_registration, db, existing, email, full_name, password_hash)
+
+
+def _store_registration(db: Session, existing: User | None, email: str, full_name: str, password_hash: str) -> User:
+    if existing is not None:
         existing.email = email
         existing.full_name = full_name
-        existing.password_hash = get_password_hash(password)
+        existing.password_hash = password_hash
         existing.role = "student"
         existing.status = "pending"
         existing.is_deleted = False
         existing.token_version = (existing.token_version or 0) + 1
-        db.add(existing)
-        db.commit()
-        db.refresh(existing)
+        save(db, existing)
+        invalidate_principal(db, existing.id)
         log_action(db, actor_id=existing.id, action="user_reactivated", entity_type="user", entity_id=existing.id)
         return existing
     user = User(
         email=email,
         full_name=full_name,
-        password_hash=get_password_hash(password),
+        password_hash=password_hash,
         role="student",
         status="pending",
     )
@@ -63,9 +78,8 @@ def create_user_with_role(
         existing.course = course
         existing.is_deleted = False
         existing.token_version = (existing.token_version or 0) + 1
-        db.add(existing)
-        db.commit()
-        db.refresh(existing)
+        save(db, existing)
+        invalidate_principal(db, existing.id)
         log_action(db, actor_id=existing.id, action="user_reactivated", entity_type="user", entity_id=existing.id)
         return existing
     user = User(
@@ -83,9 +97,9 @@ def create_user_with_role(
     return created
 
 
-def authenticate_user(db: Session, email: str, password: str) -> tuple[str, str]:
-    user = user_repo.get_by_email(db, email, include_deleted=True)
-    if not user or not verify_password(password, user.password_hash):
+async def authenticate_user(db: Session, email: str, password: str) -> tuple[str, str]:
+    user = await run_in_threadpool(user_repo.get_by_email, db, email, include_deleted=True)
+    if not user or not await verify_password_async(password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     if user.is_deleted:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Account is deleted")
@@ -96,10 +110,22 @@ def authenticate_user(db: Session, email: str, password: str) -> tuple[str, str]
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Account is pending approval",
         )
-    user.last_active_at = datetime.utcnow()
-    db.add(user)
-    db.commit()
-    log_action(db, actor_id=user.id, action="user_login", entity_type="user", entity_id=user.id)
+    await run_in_threadpool(activity_tracker.record_login, db, user.id)
     access = create_access_token(str(user.id), user.role, user.token_version)
     refresh = create_refresh_token(str(user.id), user.role, user.token_version)
     return access, refresh
+
+
+async def change_password(db: Session, user: User, old_password: str, new_password: str) -> None:
+    if not await verify_password_async(old_password, user.password_hash):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid old password")
+    password_hash = await get_password_hash_async(new_password)
+    await run_in_threadpool(_store_password, db, user, password_hash)
+
+
+def _store_password(db: Session, user: User, password_hash: str) -> None:
+    user.password_hash = password_hash
+    user.token_version = (user.token_version or 0) + 1
+    save(db, user)
+    invalidate_principal(db, user.id)
+    log_action(db, actor_id=user.id, action="password_changed", entity_type="user", entity_id=user.id)
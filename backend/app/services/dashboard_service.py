@@ -0,0 +1,81 @@
+from sqlalchemy import event, func, inspect, select, true
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.swr_cache import StaleWhileRevalidateCache
+from app.models.assignment import Assignment
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.manager import ManagerDashboard
+
+settings = get_settings()
+
+DASHBOARD_KEY = "manager_dashboard"
+_DIRTY_KEY = "manager_dashboard_dirty"
+
+# Columns whose changes move a dashboard counter.
+_WATCHED = {
+    Task: {"status"},
+    Assignment: {"state"},
+    User: {"role", "status"},
+}
+
+dashboard_cache = StaleWhileRevalidateCache(
+    settings.manager_dashboard_cache_ttl_seconds,
+    settings.manager_dashboard_max_stale_seconds,
+)
+
+
+def manager_dashboard_query():
+    tasks = select(
+        func.count(Task.id).label("total_projects"),
+        func.count(Task.id).filter(Task.status.in_(["open", "in_progress"])).label("active_projects"),
+    ).subquery()
+    assignments = select(
+        func.count(Assignment.id).filter(Assignment.state == "requested").label("pending_applications"),
+    ).subquery()
+    users = select(
+        func.count(User.id).filter(User.role == "student", User.status == "active").label("students"),
+        func.count(User.id).filter(User.role == "mentor").label("mentors"),
+    ).subquery()
+    # Three one-row aggregates glued together: one statement, one round trip.
+    return select(tasks, assignments, users).select_from(tasks.join(assignments, true()).join(users, true()))
+
+
+def _load(bind: Engine | Connection) -> ManagerDashboard:
+    with Session(bind=bind) as session:
+        row = session.execute(manager_dashboard_query()).one()
+    return ManagerDashboard(**row._mapping)
+
+
+def get_manager_dashboard(db: Session) -> ManagerDashboard:
+    bind = db.get_bind()
+    return dashboard_cache.get(DASHBOARD_KEY, lambda: _load(bind))
+
+
+def _touches_dashboard(obj) -> bool:
+    watched = _WATCHED.get(type(obj))
+    if watched is None:
+        return False
+    state = inspect(obj)
+    if state.pending or state.deleted or state.was_deleted:
+        return True
+    return any(state.attrs[name].history.has_changes() for name in watched)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_dirty(session: Session, flush_context) -> None:
+    if any(_touches_dashboard(obj) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    if session.info.pop(_DIRTY_KEY, False):
+        dashboard_cache.invalidate(DASHBOARD_KEY)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_on_rollback(session: Session, previous_transaction) -> None:
+    session.info.pop(_DIRTY_KEY, None)
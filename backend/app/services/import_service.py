@@ -0,0 +1,179 @@
+import csv
+from collections.abc import Iterable, Iterator
+from itertools import islice
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.hashing import bulk_hasher
+from app.db.unit_of_work import after_commit, checkpoint
+from app.models.task import Task
+from app.models.user import User
+from app.repositories import tag_repo, user_repo
+from app.schemas.imports import ImportReport, ImportRowError, UserImportRow
+from app.schemas.task import TaskCreate
+from app.services.audit_service import log_action
+from app.services.dashboard_service import DASHBOARD_KEY, dashboard_cache
+from app.services.task_service import build_task
+
+settings = get_settings()
+
+# Imports never create admins; that stays a deliberate, one-at-a-time action.
+IMPORTABLE_ROLES = set(User.__table__.c.role.type.enums) - {"admin"}
+USER_STATUSES = set(User.__table__.c.status.type.enums)
+TASK_STATUSES = set(Task.__table__.c.status.type.enums)
+TASK_VISIBILITIES = set(Task.__table__.c.visibility.type.enums)
+
+
+def _clean(raw: dict) -> dict:
+    # Header names are case-insensitive and empty cells mean "not given".
+    return {key.strip().lower(): value.strip() for key, value in raw.items() if key and value and value.strip()}
+
+
+def _batches(lines: Iterable[str], size: int) -> Iterator[list[tuple[int, dict]]]:
+    # Streams the CSV: only one batch of parsed rows is held at a time. Row numbers
+    # are the CSV line numbers (the header is line 1), as a spreadsheet shows them.
+    reader = csv.DictReader(lines)
+    while True:
+        batch = [(reader.line_num, _clean(raw)) for raw in islice(reader, size)]
+        if not batch:
+            return
+        yield batch
+
+
+def _describe(exc: ValidationError) -> str:
+    error = exc.errors()[0]
+    field = ".".join(str(part) for part in error["loc"])
+    return f"{field}: {error['msg']}" if field else error["msg"]
+
+
+def _report(total: int, created: int, errors: list[ImportRowError]) -> ImportReport:
+    # Errors are found in passes (row checks, then the existing-email lookup), so
+    # they are put back in file order for the report.
+    errors.sort(key=lambda error: error.row)
+    return ImportReport(total=total, created=created, errors=errors)
+
+
+def import_users(
+    db: Session,
+    lines: Iterable[str],
+    *,
+    actor_id: int | None,
+    batch_size: int = settings.import_batch_size,
+    commit_batches: bool = True,
+) -> ImportReport:
+    # With commit_batches each batch is committed as soon as it is inserted, so a
+    # large file never holds one long transaction and a late failure keeps the
+    # batches before it. The CLI's dry run turns it off and rolls everything back.
+    total, created, errors = 0, 0, []
+    seen: set[str] = set()
+    for batch in _batches(lines, batch_size):
+        valid = []
+        for line, raw in batch:
+            total += 1
+            try:
+                row = UserImportRow(**raw)
+            except ValidationError as exc:
+                errors.append(ImportRowError(row=line, error=_describe(exc)))
+                continue
+            if row.role not in IMPORTABLE_ROLES:
+                errors.append(ImportRowError(row=line, error=f"role: unsupported role {row.role!r}"))
+            elif row.status not in USER_STATUSES:
+                errors.append(ImportRowError(row=line, error=f"status: unsupported status {row.status!r}"))
+            elif row.email in seen:
+                errors.append(ImportRowError(row=line, error="email: duplicate in file"))
+            else:
+                seen.add(row.email)
+                valid.append((line, row))
+
+        existing = user_repo.existing_emails(db, [row.email for _, row in valid])
+        for line, row in valid:
+            if row.email in existing:
+                errors.append(ImportRowError(row=line, error="email: already registered"))
+        valid = [(line, row) for line, row in valid if row.email not in existing]
+        if not valid:
+            continue
+
+        hashes = bulk_hasher.hash_many([row.password for _, row in valid])
+        user_ids = user_repo.bulk_create_users(
+            db,
+            [
+                {
+                    **row.model_dump(exclude={"password"}),
+                    "password_hash": password_hash,
+                }
+                for (_, row), password_hash in zip(valid, hashes)
+            ],
+        )
+        created += len(user_ids)
+        log_action(
+            db,
+            actor_id=actor_id,
+            action="users_imported",
+            entity_type="user",
+            metadata={"count": len(user_ids), "ids": user_ids, "rows": [valid[0][0], valid[-1][0]]},
+        )
+        # Core inserts bypass the ORM flush events the dashboard cache listens to.
+        after_commit(db, lambda: dashboard_cache.invalidate(DASHBOARD_KEY))
+        if commit_batches:
+            checkpoint(db)
+    return _report(total, created, errors)
+
+
+def import_tasks(
+    db: Session,
+    lines: Iterable[str],
+    *,
+    actor_id: int,
+    actor_role: str | None = None,
+    batch_size: int = settings.import_batch_size,
+    commit_batches: bool = True,
+) -> ImportReport:
+    total, created, errors = 0, 0, []
+    for batch in _batches(lines, batch_size):
+        valid = []
+        for line, raw in batch:
+            total += 1
+            try:
+                row = TaskCreate(**raw)
+            except ValidationError as exc:
+                errors.append(ImportRowError(row=line, error=_describe(exc)))
+                continue
+            if row.status not in TASK_STATUSES:
+                errors.append(ImportRowError(row=line, error=f"status: unsupported status {row.status!r}"))
+            elif row.visibility not in TASK_VISIBILITIES:
+                errors.append(ImportRowError(row=line, error=f"visibility: unsupported value {row.visibility!r}"))
+            else:
+                valid.append((line, row))
+
+        roles = user_repo.roles_by_id(
+            db, {user_id for _, row in valid for user_id in (row.curator_id, row.mentor_id) if user_id is not None}
+        )
+        tasks = []
+        for line, row in valid:
+            if row.curator_id is not None and row.curator_id not in roles:
+                errors.append(ImportRowError(row=line, error=f"curator_id: user {row.curator_id} not found"))
+            elif row.mentor_id is not None and roles.get(row.mentor_id) != "mentor":
+                errors.append(ImportRowError(row=line, error=f"mentor_id: mentor {row.mentor_id} not found"))
+            else:
+                tasks.append((line, build_task(row, actor_id, actor_role), row.tags))
+        if not tasks:
+            continue
+
+        tag_repo.set_tasks_tags(db, [(task, raw_tags) for _, task, raw_tags in tasks])
+        db.add_all([task for _, task, _ in tasks])
+        # One flush: the ORM batches the task and task_tags INSERTs (insertmanyvalues).
+        db.flush()
+        task_ids = [task.id for _, task, _ in tasks]
+        created += len(task_ids)
+        log_action(
+            db,
+            actor_id=actor_id,
+            action="tasks_imported",
+            entity_type="task",
+            metadata={"count": len(task_ids), "ids": task_ids, "rows": [tasks[0][0], tasks[-1][0]]},
+        )
+        if commit_batches:
+            checkpoint(db)
+    return _report(total, created, errors)
@@ -0,0 +1,218 @@
+import importlib
+import logging
+import os
+import random
+import socket
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.unit_of_work import after_commit, unit_of_work
+from app.repositories import outbox_repo
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Transactional outbox. enqueue() writes the job row in the caller's transaction,
+# so a side effect is recorded if and only if the business change commits, and
+# survives a crash until some worker runs it. Workers lease due jobs (see
+# outbox_repo.claim_jobs), run the handler and mark the job done in one
+# transaction, and reschedule failures with exponential backoff.
+
+JobHandler = Callable[[Session, dict], None]
+
+_handlers: dict[str, JobHandler] = {}
+
+# Modules whose import registers handlers; a standalone worker process loads them
+# without importing the web app.
+HANDLER_MODULES = ("app.services.portfolio_service",)
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    def register(func: JobHandler) -> JobHandler:
+        _handlers[kind] = func
+        return func
+
+    return register
+
+
+def _load_handlers() -> None:
+    for module in HANDLER_MODULES:
+        importlib.import_module(module)
+
+
+def enqueue(db: Session, kind: str, payload: dict, *, delay_seconds: float = 0) -> None:
+    outbox_repo.create_job(
+        db,
+        kind,
+        payload,
+        run_after=datetime.utcnow() + timedelta(seconds=delay_seconds),
+        max_attempts=settings.outbox_max_attempts,
+    )
+    outbox_worker.bind = db.get_bind()
+    after_commit(db, outbox_worker.wake)
+
+
+def backoff_seconds(attempts: int) -> float:
+    delay = min(settings.outbox_backoff_max_seconds, settings.outbox_backoff_base_seconds * 2 ** (attempts - 1))
+    # Jitter keeps jobs that failed together (a database blip) from retrying in lockstep.
+    return delay * random.uniform(0.5, 1.0)
+
+
+class OutboxWorker:
+    def __init__(self, concurrency: int, poll_interval: float, lease_seconds: float, retention_hours: int):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.retention_hours = retention_hours
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.bind: Engine | None = None
+        self._in_flight = 0
+        self._processed = 0
+        self._failed = 0
+        self._last_prune = float("-inf")
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+        self._executor: ThreadPoolExecutor | None = None
+
+    def start(self, bind: Engine) -> None:
+        self.bind = bind
+        self._ensure_worker()
+
+    def wake(self) -> None:
+        if settings.outbox_worker_enabled:
+            self._ensure_worker()
+            self._wakeup.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"in_flight": self._in_flight, "processed": self._processed, "failed": self._failed}
+
+    def run_pending(self, limit: int) -> int:
+        # Claims and runs up to `limit` due jobs on the calling thread.
+        _load_handlers()
+        jobs = self._claim(limit)
+        for job in jobs:
+            self._execute(job)
+        return len(jobs)
+
+    def drain(self, timeout: float = 30.0) -> None:
+        # Runs every due job, including ones the background thread is busy with,
+        # before returning. Used by tests and `python -m app.db.outbox work --once`.
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.run_pending(self.concurrency):
+                continue
+            with self._lock:
+                if not self._in_flight:
+                    return
+                self._slot_freed.wait(0.05)
+        raise TimeoutError("Outbox jobs still running after drain timeout")
+
+    def _claim(self, limit: int) -> list:
+        if self.bind is None or limit <= 0:
+            return []
+        with Session(bind=self.bind) as session, unit_of_work(session):
+            jobs = outbox_repo.claim_jobs(
+                session, self.worker_id, limit, lease_seconds=self.lease_seconds, now=datetime.utcnow()
+            )
+        with self._lock:
+            self._in_flight += len(jobs)
+        return jobs
+
+    def _execute(self, job) -> None:
+        try:
+            handler = _handlers.get(job.kind)
+            if handler is None:
+                raise LookupError(f"No handler registered for {job.kind!r} jobs")
+            with Session(bind=self.bind) as session, unit_of_work(session):
+                handler(session, job.payload)
+                if not outbox_repo.complete_job(session, job.id, job.lease_token, now=datetime.utcnow()):
+                    raise RuntimeError("Lease expired before the job finished")
+            succeeded = True
+        except Exception as exc:
+            succeeded = False
+            self._reschedule(job, exc)
+        with self._lock:
+            self._in_flight -= 1
+            if succeeded:
+                self._processed += 1
+            else:
+                self._failed += 1
+            self._slot_freed.notify_all()
+
+    def _reschedule(self, job, exc: Exception) -> None:
+        now = datetime.utcnow()
+        retry_at = None
+        if job.attempts < job.max_attempts:
+            retry_at = now + timedelta(seconds=backoff_seconds(job.attempts))
+            logger.warning("Outbox job %s (%s) failed, attempt %s", job.id, job.kind, job.attempts, exc_info=exc)
+        else:
+            logger.error("Outbox job %s (%s) gave up after %s attempts", job.id, job.kind, job.attempts, exc_info=exc)
+        try:
+            with Session(bind=self.bind) as session, unit_of_work(session):
+                outbox_repo.fail_job(session, job.id, job.lease_token, repr(exc), retry_at=retry_at, now=now)
+        except Exception:
+            # The lease runs out and the job is claimed again.
+            logger.exception("Cannot record failure of outbox job %s", job.id)
+
+    def _prune(self) -> None:
+        if time.monotonic() - self._last_prune < 3600:
+            return
+        self._last_prune = time.monotonic()
+        with Session(bind=self.bind) as session, unit_of_work(session):
+            outbox_repo.prune_done_jobs(session, datetime.utcnow() - timedelta(hours=self.retention_hours))
+
+    def _ensure_worker(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            _load_handlers()
+            self._stopping = False
+            self._executor = ThreadPoolExecutor(self.concurrency, thread_name_prefix="outbox-job")
+            self._thread = threading.Thread(target=self._run, name="outbox-poll", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopping:
+            try:
+                with self._lock:
+                    free = self.concurrency - self._in_flight
+                for job in self._claim(free):
+                    self._executor.submit(self._execute, job)
+                self._prune()
+            except Exception:
+                logger.exception("Outbox poll failed")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def shutdown(self) -> None:
+        # Jobs already running finish; unclaimed ones stay in the table for the
+        # next start (or another worker).
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 5)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+outbox_worker = OutboxWorker(
+    settings.outbox_concurrency,
+    settings.outbox_poll_interval_seconds,
+    settings.outbox_lease_seconds,
+    settings.outbox_retention_hours,
+)
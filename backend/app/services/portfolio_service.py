@@ -1,22 +1,17 @@
 from sqlalchemy.orm import Session
 
-from app.models.assignment import Assignment
-from app.models.portfolio_entry import PortfolioEntry
 from app.repositories import portfolio_repo
+from app.services import outbox_service
 
+PORTFOLIO_ENTRIES_JOB = "portfolio_entries"
+TEAM_JOINED_SUMMARY = "Назначен в команду проекта."
 
-def create_portfolio_entry_for_assignment(
-    db: Session,
-    assignment: Assignment,
-    summary: str | None = None,
-) -> PortfolioEntry:
-    existing = portfolio_repo.get_portfolio_entry_by_assignment(db, assignment.id)
-    if existing:
-        return existing
-    entry = PortfolioEntry(
-        student_id=assignment.student_id,
-        task_id=assignment.task_id,
-        assignment_id=assignment.id,
-        summary=summary,
-    )
-    return portfolio_repo.create_portfolio_entry(db, entry)
+
+def schedule_portfolio_entries(db: Session, assignment_ids: list[int], summary: str | None = TEAM_JOINED_SUMMARY) -> None:
+    # Written with the assignment change, created off the request path.
+    outbox_service.enqueue(db, PORTFOLIO_ENTRIES_JOB, {"assignment_ids": assignment_ids, "summary": summary})
+
+
+@outbox_service.job_handler(PORTFOLIO_ENTRIES_JOB)
+def create_portfolio_entries(db: Session, payload: dict) -> None:
+    portfolio_repo.create_entries_for_assignments(db, payload["assignment_ids"], payload.get("summary"))
@@ -0,0 +1,136 @@
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.pubsub import get_broker
+from app.models.approval import Approval
+from app.models.assignment import Assignment
+from app.models.comment import Comment
+from app.models.task import Task
+from app.models.task_mentor import TaskMentor
+from app.models.user import User
+from app.schemas.comment import CommentRead
+
+_PENDING_KEY = "project_events"
+
+# Roles that see every event of a project, private questions included.
+PRIVILEGED_ROLES = {
+    "manager",
+    "admin",
+    "mentor",
+    "curator",
+    "univ_teacher",
+    "univ_supervisor",
+    "univ_admin",
+    "hr",
+    "academic_partnership_admin",
+}
+
+
+# Task and assignment fields that decide who may follow a project. Changing one
+# sends an "access" event; streams of non-privileged users then reset, so the
+# client reconnects and the endpoint checks access again.
+ACCESS_EVENT = "access"
+TASK_ACCESS_FIELDS = ("visibility", "is_archived", "nda_required")
+
+
+def topic(task_id: int) -> str:
+    return f"project:{task_id}"
+
+
+def project_event(kind: str, task_id: int, data: dict, audience: list[int] | None = None) -> tuple[int, dict]:
+    # audience=None means everyone allowed to read the project; otherwise only
+    # the listed users (and privileged roles) receive the event.
+    return task_id, {"type": kind, "data": data, "audience": audience}
+
+
+def is_visible(user: User, message: dict) -> bool:
+    audience = message.get("audience")
+    return audience is None or user.id in audience or user.role in PRIVILEGED_ROLES
+
+
+def team_event(assignment_id: int, task_id: int, student_id: int, state: str, previous: str | None) -> tuple[int, dict]:
+    data = {"assignment_id": assignment_id, "student_id": student_id, "state": state, "previous_state": previous}
+    # Joining or leaving the team is news for the whole project; application
+    # traffic only concerns the applicant and the staff.
+    audience = None if "active" in (state, previous) else [student_id]
+    return project_event("team", task_id, data, audience)
+
+
+def queue_events(db: Session, events: list[tuple[int, dict]]) -> None:
+    # For Core statements the flush listener cannot see; published on commit.
+    db.info.setdefault(_PENDING_KEY, []).extend(events)
+
+
+def _state_change(obj) -> tuple[str | None, str] | None:
+    history = inspect(obj).attrs.state.history
+    if not history.has_changes():
+        return None
+    return (history.deleted[0] if history.deleted else None), obj.state
+
+
+def _changed(obj, *fields: str) -> bool:
+    attrs = inspect(obj).attrs
+    return any(attrs[field].history.has_changes() for field in fields)
+
+
+def _events_for(obj, *, created: bool, deleted: bool) -> list[tuple[int, dict]]:
+    if isinstance(obj, Task):
+        if created or deleted or not _changed(obj, *TASK_ACCESS_FIELDS):
+            return []
+        return [project_event(ACCESS_EVENT, obj.id, {})]
+    if isinstance(obj, Comment):
+        if not created:
+            return []
+        data = CommentRead.model_validate(obj).model_dump(mode="json")
+        if obj.is_private:
+            return [project_event("question", obj.task_id, data, [obj.author_id, obj.recipient_id])]
+        return [project_event("comment", obj.task_id, data)]
+    if isinstance(obj, TaskMentor):
+        if not (created or deleted):
+            return []
+        change = "mentor_added" if created else "mentor_removed"
+        return [project_event("team", obj.task_id, {"change": change, "mentor_id": obj.mentor_id})]
+    if deleted:
+        return []
+    if isinstance(obj, Assignment):
+        events = []
+        if not created and _changed(obj, "nda_accepted"):
+            events.append(project_event(ACCESS_EVENT, obj.task_id, {}, [obj.student_id]))
+        moved = (None, obj.state) if created else _state_change(obj)
+        if moved is not None:
+            events.append(team_event(obj.id, obj.task_id, obj.student_id, moved[1], moved[0]))
+        return events
+    if isinstance(obj, Approval):
+        if not created and _state_change(obj) is None:
+            return []
+        data = {"approval_id": obj.id, "type": obj.type, "state": obj.state}
+        return [project_event("approval", obj.task_id, data, [obj.requested_by])]
+    return []
+
+
+@event.listens_for(Session, "after_flush")
+def _collect(session: Session, flush_context) -> None:
+    events = []
+    for obj in session.new:
+        events.extend(_events_for(obj, created=True, deleted=False))
+    for obj in session.dirty:
+        events.extend(_events_for(obj, created=False, deleted=False))
+    for obj in session.deleted:
+        events.extend(_events_for(obj, created=False, deleted=True))
+    if events:
+        queue_events(session, events)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_on_commit(session: Session) -> None:
+    events = session.info.pop(_PENDING_KEY, None)
+    if not events:
+        return
+    broker = get_broker()
+    for task_id, message in events:
+        broker.publish(topic(task_id), message)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_on_rollback(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING_KEY, None)
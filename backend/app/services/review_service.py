@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from app.models.assignment import Assignment
 from app.models.review import Review
 from app.repositories import assignment_repo, review_repo
+from app.services import student_stats_service
 from app.services.audit_service import log_action
 
 
@@ -21,9 +22,12 @@ def create_review(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Review already exists")
     review = Review(assignment_id=assignment.id, mentor_id=mentor_id, rating=rating, comment=comment)
     created = review_repo.create_review(db, review)
+    previous = assignment.state
     assignment.state = "done"
     assignment.updated_at = datetime.utcnow()
     assignment_repo.update_assignment(db, assignment)
+    student_stats_service.review_created(db, assignment.student_id, rating)
+    student_stats_service.assignment_moved(db, assignment.student_id, previous, "done")
     log_action(
         db,
         actor_id=mentor_id,
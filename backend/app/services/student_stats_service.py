@@ -0,0 +1,61 @@
+from collections import Counter, defaultdict
+
+from sqlalchemy.orm import Session
+
+from app.models.student_stat import StudentStat
+from app.repositories import student_stats_repo
+from app.repositories.student_stats_repo import STATE_COLUMNS
+from app.schemas.manager import StudentStats
+
+
+def assignment_created(db: Session, student_id: int, state: str) -> None:
+    student_stats_repo.apply_deltas(db, student_id, {"applications_total": 1, STATE_COLUMNS[state]: 1})
+
+
+def assignment_moved(db: Session, student_id: int, previous: str, state: str) -> None:
+    if previous == state:
+        return
+    student_stats_repo.apply_deltas(db, student_id, {STATE_COLUMNS[previous]: -1, STATE_COLUMNS[state]: 1})
+
+
+def assignments_moved(db: Session, moves: list[tuple[int, str, str]]) -> None:
+    # (student_id, previous, state) triples folded into one delta set per student.
+    deltas: dict[int, Counter] = defaultdict(Counter)
+    for student_id, previous, state in moves:
+        if previous != state:
+            deltas[student_id][STATE_COLUMNS[previous]] -= 1
+            deltas[student_id][STATE_COLUMNS[state]] += 1
+    for student_id, student_deltas in deltas.items():
+        student_stats_repo.apply_deltas(db, student_id, dict(student_deltas))
+
+
+def review_created(db: Session, student_id: int, rating: int) -> None:
+    student_stats_repo.apply_deltas(db, student_id, {"reviews_count": 1, "rating_sum": rating})
+
+
+def to_schema(row: StudentStat | None) -> StudentStats:
+    if row is None:
+        return StudentStats(
+            applications_total=0,
+            applications_approved=0,
+            applications_rejected=0,
+            projects_completed=0,
+            reviews_count=0,
+        )
+    return StudentStats(
+        applications_total=row.applications_total,
+        applications_approved=row.active_count,
+        applications_rejected=row.canceled_count,
+        projects_completed=row.done_count,
+        reviews_count=row.reviews_count,
+        average_rating=row.rating_sum / row.reviews_count if row.reviews_count else None,
+    )
+
+
+def get_student_stats(db: Session, student_id: int) -> StudentStats:
+    return to_schema(student_stats_repo.get_stats(db, student_id))
+
+
+def get_student_stats_map(db: Session, student_ids: list[int]) -> dict[int, StudentStats]:
+    rows = student_stats_repo.get_stats_map(db, student_ids)
+    return {student_id: to_schema(rows.get(student_id)) for student_id in student_ids}
@@ -1,16 +1,18 @@
 from datetime import datetime
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import Session
 
 from app.models.task import Task
-from app.repositories import task_repo
+from app.models.user import User
+from app.repositories import tag_repo, task_repo
 from app.services.audit_service import log_action
 
 
-def create_task(db: Session, payload, created_by: int, creator_role: str | None = None) -> Task:
+def build_task(payload, created_by: int, creator_role: str | None = None) -> Task:
     curator_id = payload.curator_id
     if curator_id is None and creator_role == "curator":
         curator_id = created_by
-    task = Task(
+    return Task(
         title=payload.title,
         description=payload.description,
         goal=payload.goal,
@@ -22,7 +24,6 @@ def create_task(db: Session, payload, created_by: int, creator_role: str | None
         practice_possible=bool(payload.practice_possible),
         course_project_possible=bool(payload.course_project_possible),
         nda_required=bool(payload.nda_required),
-        tags=payload.tags,
         status=payload.status or "open",
         is_archived=bool(payload.is_archived) if payload.is_archived is not None else False,
         created_by=created_by,
@@ -31,6 +32,11 @@ def create_task(db: Session, payload, created_by: int, creator_role: str | None
         deadline=payload.deadline,
         visibility=payload.visibility or "public",
     )
+
+
+def create_task(db: Session, payload, created_by: int, creator_role: str | None = None) -> Task:
+    task = build_task(payload, created_by, creator_role)
+    tag_repo.set_task_tags(db, task, payload.tags)
     created = task_repo.create_task(db, task)
     log_action(
         db,
@@ -62,7 +68,8 @@ def update_task(db: Session, task: Task, payload) -> Task:
         else task.course_project_possible
     )
     task.nda_required = payload.nda_required if payload.nda_required is not None else task.nda_required
-    task.tags = payload.tags or task.tags
+    if payload.tags:
+        tag_repo.set_task_tags(db, task, payload.tags)
     task.status = payload.status or task.status
     task.is_archived = payload.is_archived if payload.is_archived is not None else task.is_archived
     task.curator_id = payload.curator_id if payload.curator_id is not None else task.curator_id
@@ -79,3 +86,16 @@ def update_task(db: Session, task: Task, payload) -> Task:
         entity_id=task.id,
     )
     return updated
+
+
+@event.listens_for(Session, "after_flush")
+def _touch_tasks_on_name_change(session: Session, flush_context) -> None:
+    # TaskRead embeds curator and mentor names, so a rename must move the ETag of
+    # every task that shows it, like touch_task does for mentor links.
+    renamed = [
+        obj.id
+        for obj in session.dirty
+        if isinstance(obj, User) and inspect(obj).attrs.full_name.history.has_changes()
+    ]
+    if renamed:
+        session.connection().execute(task_repo.touch_tasks_of_users_query(renamed))
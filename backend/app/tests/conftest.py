@@ -0,0 +1,30 @@
+import os
+from contextlib import contextmanager
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+
+from app.core.rate_limit import get_rate_limiter  # noqa: E402
+from app.db.instrumentation import track_queries  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    get_rate_limiter().backend.reset()
+
+
+@pytest.fixture
+def query_budget():
+    @contextmanager
+    def _budget(max_queries: int | None = None, max_repeats: int | None = None):
+        with track_queries() as stats:
+            yield stats
+        if max_queries is not None and stats.count > max_queries:
+            pytest.fail(f"Issued {stats.count} queries, budget is {max_queries}:\n" + "\n".join(stats.shapes))
+        repeated = stats.most_repeated()
+        if max_repeats is not None and repeated and repeated[1] > max_repeats:
+            pytest.fail(f"Statement repeated {repeated[1]} times (limit {max_repeats}): {repeated[0]}")
+
+    return _budget
@@ -0,0 +1,241 @@
+import threading
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core import security
+from app.core.hashing import HashingPool
+from app.core.principal_cache import principal_cache
+from app.db.audit_partitions import apply_retention, list_partitions
+from app.db.session import get_db
+from app.db.unit_of_work import unit_of_work
+from app.main import app
+from app.models.audit_log import AuditLog
+from app.models.base import Base
+from app.models.user import User
+from app.services import activity_service
+from app.services.activity_service import ActivityTracker, activity_tracker
+from app.services.audit_service import audit_pipeline, log_action
+from app.services.auth_service import create_user_with_role
+from app import models  # noqa: F401
+
+DATABASE_URL = "sqlite:///./test.db"
+
+engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        with unit_of_work(db):
+            yield db
+    finally:
+        db.close()
+
+
+client = TestClient(app)
+
+
+def setup_module():
+    app.dependency_overrides[get_db] = override_get_db
+    Base.metadata.create_all(bind=engine)
+    principal_cache.clear()
+
+
+def teardown_module():
+    activity_tracker.flush()
+    audit_pipeline.flush()
+    principal_cache.clear()
+    Base.metadata.drop_all(bind=engine)
+
+
+def _login(email: str, password: str) -> str:
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+
+def test_principal_cache_invalidated_on_password_change():
+    with TestingSessionLocal() as db:
+        create_user_with_role(
+            db,
+            email="cached@example.com",
+            full_name="Cached User",
+            password="Secret123!",
+            role="mentor",
+            status="active",
+        )
+    token = _login("cached@example.com", "Secret123!")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+    with TestingSessionLocal() as db:
+        user = db.query(User).filter(User.email == "cached@example.com").one()
+        user.full_name = "Renamed Directly"
+        db.commit()
+    cached = client.get("/api/v1/auth/me", headers=headers)
+    assert cached.json()["full_name"] == "Cached User"
+
+    changed = client.post(
+        "/api/v1/auth/change-password",
+        headers=headers,
+        json={"old_password": "Secret123!", "new_password": "Secret456!"},
+    )
+    assert changed.status_code == 200
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 401
+
+    fresh = _login("cached@example.com", "Secret456!")
+    me = client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {fresh}"})
+    assert me.status_code == 200
+    assert me.json()["full_name"] == "Renamed Directly"
+
+
+def test_login_activity_is_written_behind_in_one_flush():
+    with TestingSessionLocal() as db:
+        user = create_user_with_role(
+            db,
+            email="active@example.com",
+            full_name="Active User",
+            password="Secret123!",
+            role="mentor",
+            status="active",
+        )
+        user_id = user.id
+    activity_tracker.flush()
+
+    _login("active@example.com", "Secret123!")
+    _login("active@example.com", "Secret123!")
+    with TestingSessionLocal() as db:
+        assert db.get(User, user_id).last_active_at is None
+
+    activity_tracker.flush()
+    audit_pipeline.flush()
+    with TestingSessionLocal() as db:
+        assert db.get(User, user_id).last_active_at is not None
+        logins = db.query(AuditLog).filter(AuditLog.actor_id == user_id, AuditLog.action == "user_login").count()
+        assert logins == 2
+
+
+def test_activity_retry_keeps_logins_recorded_meanwhile(monkeypatch):
+    # Only last_active_at is under test; the audit rows belong to audit_pipeline.
+    monkeypatch.setattr(activity_service, "log_action", lambda *args, **kwargs: None)
+    healthy = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=healthy)
+    with Session(bind=healthy) as db:
+        first, second = (
+            create_user_with_role(
+                db, email=f"retry-{n}@example.com", full_name="Retry User", password="Secret123!", role="mentor"
+            ).id
+            for n in (1, 2)
+        )
+
+    tracker = ActivityTracker(flush_interval=3600, flush_max_users=1000)
+    broken = create_engine("sqlite://")
+    tracker.record_login(Session(bind=broken), first)
+    tracker.flush()
+    tracker.record_login(Session(bind=broken), second)
+    # The retried batch fails again and is dropped; the login since is kept.
+    tracker.flush()
+
+    tracker._bind = healthy
+    tracker.shutdown()
+    with Session(bind=healthy) as db:
+        assert db.get(User, first).last_active_at is None
+        assert db.get(User, second).last_active_at is not None
+
+
+def test_audit_rows_are_batched_after_commit():
+    audit_pipeline.flush()
+    with TestingSessionLocal() as db:
+        with unit_of_work(db):
+            log_action(db, actor_id=None, action="audit_committed")
+        try:
+            with unit_of_work(db):
+                log_action(db, actor_id=None, action="audit_rolled_back")
+                raise RuntimeError("rollback")
+        except RuntimeError:
+            pass
+        with unit_of_work(db):
+            log_action(db, actor_id=None, action="audit_durable", durable=True)
+
+    audit_pipeline.flush()
+    with TestingSessionLocal() as db:
+        actions = {row.action for row in db.query(AuditLog).filter(AuditLog.action.like("audit_%"))}
+    assert actions == {"audit_committed", "audit_durable"}
+
+
+def test_admin_audit_filters_pages_and_expires_old_months():
+    with TestingSessionLocal() as db:
+        admin = create_user_with_role(
+            db, email="auditor@example.com", full_name="Auditor", password="Secret123!", role="admin", status="active"
+        )
+        admin_id = admin.id
+        rows = [
+            {"actor_id": admin_id, "action": "task_updated", "entity_type": "task", "entity_id": 7,
+             "metadata_json": {"month": month}, "created_at": datetime(2020, month, 15)}
+            for month in (1, 2, 3)
+        ]
+        db.execute(insert(AuditLog), rows)
+        db.commit()
+    headers = {"Authorization": f"Bearer {_login('auditor@example.com', 'Secret123!')}"}
+
+    params = {"actor_id": admin_id, "entity_type": "task", "entity_id": 7, "since": "2020-01-01", "limit": 2}
+    first = client.get("/api/v1/admin/audit", params=params, headers=headers)
+    assert first.status_code == 200
+    assert [row["metadata"]["month"] for row in first.json()] == [3, 2]
+    second = client.get(
+        "/api/v1/admin/audit", params={**params, "cursor": first.headers["X-Next-Cursor"]}, headers=headers
+    )
+    assert [row["metadata"]["month"] for row in second.json()] == [1]
+    assert client.get("/api/v1/admin/audit", params={"entity_id": 7}, headers=headers).status_code == 400
+
+    by_metadata = client.get(
+        "/api/v1/admin/audit", params={"actor_id": admin_id, "metadata": ["month=2"]}, headers=headers
+    )
+    assert [row["metadata"] for row in by_metadata.json()] == [{"month": 2}]
+    bad_filter = client.get("/api/v1/admin/audit", params={"metadata": ["$.month=2"]}, headers=headers)
+    assert bad_filter.status_code == 400
+
+    with engine.begin() as conn:
+        expired = apply_retention(conn, keep_months=1, archive=True, now=datetime(2020, 3, 20))
+        assert expired == ["audit_logs_2020_01"]
+        assert "audit_logs_2020_01" in [name for name, _ in list_partitions(conn)]
+    remaining = client.get("/api/v1/admin/audit", params=params, headers=headers).json()
+    assert [row["metadata"]["month"] for row in remaining] == [3, 2]
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE audit_logs_2020_01"))
+
+
+def _held(gate: threading.Event, submitted_at: float):
+    gate.wait(5)
+    return None, 0.0, 0.0
+
+
+def test_hashing_pool_rejects_when_full_and_reports_stats(monkeypatch):
+    with TestingSessionLocal() as db:
+        create_user_with_role(db, email="burst@example.com", full_name="Burst", password="Secret123!", role="student")
+    pool = HashingPool("thread", workers=1, max_queue=0)
+    monkeypatch.setattr(security, "hashing_pool", pool)
+    gate = threading.Event()
+    held = pool._submit(_held, gate)
+    try:
+        assert pool.stats()["in_flight"] == 1
+        response = client.post("/api/v1/auth/login", json={"email": "burst@example.com", "password": "Secret123!"})
+        assert response.status_code == 503
+        assert response.json()["detail"] == "Authentication is temporarily overloaded, please retry"
+    finally:
+        gate.set()
+        held.result()
+
+    assert client.post(
+        "/api/v1/auth/login", json={"email": "burst@example.com", "password": "Secret123!"}
+    ).status_code == 200
+    stats = pool.stats()
+    assert (stats["executor"], stats["workers"], stats["max_queue"]) == ("thread", 1, 0)
+    assert (stats["in_flight"], stats["completed"], stats["rejected"]) == (0, 2, 1)
+    assert stats["hash_time_max_ms"] > 0
+    pool.shutdown()
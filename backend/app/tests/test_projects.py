@@ -0,0 +1,833 @@
+import asyncio
+import csv
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
+from pydantic import ValidationError
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import Settings
+from app.core.principal_cache import principal_cache
+from app.api.events import _stream, event_stream_response
+from app.core.pubsub import MAX_NOTIFY_BYTES, MemoryBroker, get_broker, notify_payload
+from app.db.instrumentation import QueryStats
+from app.db.session import get_db
+from app.db.unit_of_work import save, unit_of_work
+from app.main import app
+from app.models.assignment import Assignment
+from app.models.portfolio_entry import PortfolioEntry
+from app.models.base import Base
+from app.models.outbox_job import OutboxJob
+from app.models.user import User
+from app.repositories import outbox_repo, student_stats_repo
+from app.services.activity_service import activity_tracker
+from app.services.audit_service import audit_pipeline
+from app.services.auth_service import create_user_with_role
+from app.services import outbox_service
+from app.services.outbox_service import outbox_worker
+from app.services.dashboard_service import dashboard_cache
+from app.core.swr_cache import StaleWhileRevalidateCache
+from app.schemas.task import TaskRead
+from app import models  # noqa: F401
+from benchmarks.list_serialization import build_app, build_rows
+
+DATABASE_URL = "sqlite:///./test.db"
+
+engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        with unit_of_work(db):
+            yield db
+    finally:
+        db.close()
+
+
+client = TestClient(app)
+
+
+def setup_module():
+    app.dependency_overrides[get_db] = override_get_db
+    Base.metadata.create_all(bind=engine)
+    principal_cache.clear()
+
+
+def teardown_module():
+    activity_tracker.flush()
+    audit_pipeline.flush()
+    outbox_worker.shutdown()
+    principal_cache.clear()
+    Base.metadata.drop_all(bind=engine)
+
+
+def _headers(email: str, role: str) -> dict:
+    with TestingSessionLocal() as db:
+        create_user_with_role(db, email=email, full_name=role.title(), password="Secret123!", role=role)
+    login = client.post("/api/v1/auth/login", json={"email": email, "password": "Secret123!"})
+    assert login.status_code == 200
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def test_project_reads_on_async_session():
+    manager = _headers("pm@example.com", "manager")
+    mentor = _headers("mentor-a@example.com", "mentor")
+    student = _headers("student-a@example.com", "student")
+    mentor_id = client.get("/api/v1/auth/me", headers=mentor).json()["id"]
+
+    public = client.post(
+        "/api/v1/tasks",
+        headers=manager,
+        json={"title": "Open Task", "description": "Public project description", "mentor_id": mentor_id},
+    ).json()
+    nda = client.post(
+        "/api/v1/tasks",
+        headers=manager,
+        json={"title": "NDA Task", "description": "Secret project description", "nda_required": True},
+    ).json()
+    client.post("/api/v1/comments", headers=manager, json={"task_id": public["id"], "body": "Hello"})
+
+    listed = client.get("/api/v1/tasks", headers=manager)
+    assert [task["title"] for task in listed.json()] == ["NDA Task", "Open Task"]
+    assert listed.json()[1]["mentor_names"] == ["Mentor"]
+
+    mentor_projects = client.get("/api/v1/projects", headers=mentor).json()
+    assert [task["id"] for task in mentor_projects] == [public["id"]]
+
+    masked = client.get(f"/api/v1/projects/{nda['id']}", headers=student).json()
+    assert masked["description"] == "Доступно после подтверждения NDA"
+    assert client.get(f"/api/v1/tasks/{nda['id']}", headers=manager).json()["description"] == (
+        "Secret project description"
+    )
+
+    comments = client.get("/api/v1/comments", params={"task_id": public["id"]}, headers=student)
+    assert [comment["body"] for comment in comments.json()] == ["Hello"]
+    assert client.get("/api/v1/comments", params={"task_id": nda["id"]}, headers=student).status_code == 403
+    assert client.get("/api/v1/questions", params={"task_id": nda["id"]}, headers=student).json() == []
+
+
+def test_request_sql_stats_are_reported(query_budget):
+    manager = _headers("pm-stats@example.com", "manager")
+    with query_budget(max_queries=5, max_repeats=2) as stats:
+        response = client.get("/api/v1/auth/me", headers=manager)
+    assert response.status_code == 200
+    assert response.headers["X-DB-Query-Count"] == str(stats.count)
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+
+    counting_only = QueryStats(track_shapes=False)
+    counting_only.record("SELECT * FROM users WHERE id IN (?, ?)", 0.002)
+    assert (counting_only.count, counting_only.shapes, counting_only.most_repeated()) == (1, {}, None)
+
+
+def test_task_listing_query_count_is_constant(query_budget):
+    manager = _headers("pm-pages@example.com", "manager")
+    mentor_ids = []
+    for index in range(3):
+        mentor = _headers(f"mentor-page-{index}@example.com", "mentor")
+        mentor_ids.append(client.get("/api/v1/auth/me", headers=mentor).json()["id"])
+    for index in range(12):
+        task = client.post(
+            "/api/v1/tasks",
+            headers=manager,
+            json={
+                "title": f"Paged task {index}",
+                "description": "Listing query count check",
+                "mentor_id": mentor_ids[index % 3],
+                "curator_id": mentor_ids[(index + 1) % 3],
+            },
+        ).json()
+        client.post(
+            f"/api/v1/manager/projects/{task['id']}/mentors",
+            params={"mentor_id": mentor_ids[(index + 2) % 3]},
+            headers=manager,
+        )
+
+    # One SELECT for the page, one ETag freshness aggregate, plus at most one per
+    # eager-loaded relationship, whatever the page size.
+    for path in ("/api/v1/tasks", "/api/v1/projects", "/api/v1/manager/projects"):
+        for limit in (2, 12):
+            with query_budget(max_queries=6, max_repeats=3):
+                response = client.get(path, params={"limit": limit}, headers=manager)
+            assert response.status_code == 200
+            assert len(response.json()) == limit
+
+
+def test_task_listing_follows_cursor():
+    manager = _headers("pm-cursor@example.com", "manager")
+    for index in range(5):
+        client.post(
+            "/api/v1/tasks",
+            headers=manager,
+            json={"title": f"Cursor task {index}", "description": "Cursor pagination check"},
+        )
+
+    seen = []
+    params = {"limit": 2, "query": "Cursor task"}
+    while True:
+        response = client.get("/api/v1/tasks", params=params, headers=manager)
+        assert response.status_code == 200
+        seen.extend(task["title"] for task in response.json())
+        if "X-Next-Cursor" not in response.headers:
+            assert "Link" not in response.headers
+            break
+        assert 'rel="next"' in response.headers["Link"]
+        params["cursor"] = response.headers["X-Next-Cursor"]
+    assert seen == [f"Cursor task {index}" for index in reversed(range(5))]
+
+    bad = client.get("/api/v1/tasks", params={"cursor": "not-a-cursor"}, headers=manager)
+    assert bad.status_code == 400
+
+
+def test_project_search_is_ranked_and_highlighted():
+    manager = _headers("pm-search@example.com", "manager")
+    student = _headers("student-search@example.com", "student")
+    for title, description, skills in (
+        ("Платформа аналитики", "Сбор метрик и построение дашбордов", "SQL"),
+        ("Telegram bot", "Бот для записи на консультации, аналитика посещений", "Python"),
+        ("Mobile app", "Offline-first client", "Kotlin"),
+    ):
+        client.post(
+            "/api/v1/tasks",
+            headers=manager,
+            json={"title": title, "description": description, "skills_required": skills},
+        )
+
+    found = client.get("/api/v1/projects", params={"search": "аналитик"}, headers=student).json()
+    assert [task["title"] for task in found] == ["Платформа аналитики", "Telegram bot"]
+    assert found[0]["search_rank"] >= found[1]["search_rank"]
+    assert "<mark>" in found[1]["search_snippet"]
+
+    client.post(
+        "/api/v1/tasks",
+        headers=manager,
+        json={"title": "Markup probe", "description": "<img src=x onerror=alert(1)> escapecheck widget"},
+    )
+    probe = client.get("/api/v1/projects", params={"search": "escapecheck"}, headers=student).json()
+    assert "&lt;img src=x onerror=alert(1)&gt;" in probe[0]["search_snippet"]
+    assert "<mark>escapecheck</mark>" in probe[0]["search_snippet"]
+
+    by_skill = client.get("/api/v1/tasks", params={"query": "kotlin"}, headers=manager).json()
+    assert [task["title"] for task in by_skill] == ["Mobile app"]
+
+    task_id = by_skill[0]["id"]
+    client.patch(f"/api/v1/tasks/{task_id}", headers=manager, json={"skills_required": "Swift"})
+    assert client.get("/api/v1/tasks", params={"query": "kotlin"}, headers=manager).json() == []
+
+    first = client.get("/api/v1/projects", params={"search": "аналитик", "limit": 1}, headers=student)
+    second = client.get(
+        "/api/v1/projects",
+        params={"search": "аналитик", "limit": 1, "cursor": first.headers["X-Next-Cursor"]},
+        headers=student,
+    )
+    assert [task["title"] for task in first.json() + second.json()] == ["Платформа аналитики", "Telegram bot"]
+    assert client.get("/api/v1/tasks", params={"query": '"*)('}, headers=manager).status_code == 200
+
+
+def test_tag_filters_and_facets():
+    manager = _headers("pm-tags@example.com", "manager")
+    for title, tags, task_status in (
+        ("Tagged ML", "AI, ml", "open"),
+        ("Tagged NLP", "ai, nlp", "in_progress"),
+        ("Tagged mail", "email", "open"),
+    ):
+        client.post(
+            "/api/v1/tasks",
+            headers=manager,
+            json={"title": title, "description": "Tag facets", "tags": tags, "status": task_status},
+        )
+
+    def titles(**params):
+        response = client.get("/api/v1/projects", params={"search": "Tagged", **params}, headers=manager)
+        return sorted(task["title"] for task in response.json())
+
+    assert titles(tag="ai") == ["Tagged ML", "Tagged NLP"]
+    assert titles(tag="ml,nlp") == ["Tagged ML", "Tagged NLP"]
+    assert titles(tag="ai,nlp", tag_match="all") == ["Tagged NLP"]
+
+    facets = client.get("/api/v1/projects/facets", params={"search": "Tagged"}, headers=manager).json()
+    assert facets["total"] == 3
+    assert facets["tags"][0] == {"value": "ai", "count": 2}
+    assert {item["value"]: item["count"] for item in facets["statuses"]} == {"open": 2, "in_progress": 1}
+
+    narrowed = client.get("/api/v1/projects/facets", params={"search": "Tagged", "tag": "ai"}, headers=manager)
+    assert narrowed.json()["total"] == 2
+
+
+def test_student_stats_follow_assignment_lifecycle():
+    manager = _headers("pm-stats-model@example.com", "manager")
+    mentor = _headers("mentor-stats@example.com", "mentor")
+    student = _headers("student-stats@example.com", "student")
+    student_id = client.get("/api/v1/auth/me", headers=student).json()["id"]
+
+    task_ids = [
+        client.post(
+            "/api/v1/tasks",
+            headers=manager,
+            json={"title": f"Stats task {index}", "description": "Student stats read model"},
+        ).json()["id"]
+        for index in range(2)
+    ]
+    applications = [
+        client.post(f"/api/v1/projects/{task_id}/applications", headers=student, json={}).json()["id"]
+        for task_id in task_ids
+    ]
+    client.post(f"/api/v1/manager/applications/{applications[0]}/approve", headers=manager)
+    client.post(f"/api/v1/manager/applications/{applications[1]}/reject", headers=manager)
+    review = client.post(
+        "/api/v1/reviews", headers=mentor, json={"assignment_id": applications[0], "rating": 4}
+    )
+    assert review.status_code == 200
+
+    stats = client.get(f"/api/v1/manager/students/{student_id}/stats", headers=manager).json()
+    assert stats == {
+        "applications_total": 2,
+        "applications_approved": 0,
+        "applications_rejected": 1,
+        "projects_completed": 1,
+        "reviews_count": 1,
+        "average_rating": 4.0,
+    }
+
+    with TestingSessionLocal() as db:
+        assert student_stats_repo.find_drift(db) == []
+        student_stats_repo.apply_deltas(db, student_id, {"done_count": 5})
+        assert [item["column"] for item in student_stats_repo.find_drift(db)] == ["done_count"]
+        student_stats_repo.rebuild(db)
+        assert student_stats_repo.find_drift(db) == []
+
+
+def test_hr_dashboard_ranks_in_sql():
+    hr = _headers("hr-rank@example.com", "hr")
+    counters = {
+        "a": {"reviews_count": 1, "rating_sum": 5, "done_count": 1},
+        "b": {"reviews_count": 20, "rating_sum": 98, "done_count": 20},
+        "c": {},
+        "d": {"reviews_count": 20, "rating_sum": 40, "done_count": 3},
+    }
+    with TestingSessionLocal() as db:
+        for name, deltas in counters.items():
+            user = create_user_with_role(
+                db,
+                email=f"rank-{name}@example.com",
+                full_name=f"Rank {name.upper()}",
+                password="Secret123!",
+                role="student",
+                skills="Python, rankskill",
+            )
+            student_stats_repo.apply_deltas(db, user.id, deltas)
+        db.commit()
+
+    def names(**params):
+        response = client.get("/api/v1/hr/dashboard", params={"skills": "rankskill", **params}, headers=hr)
+        assert response.status_code == 200
+        return [row["full_name"] for row in response.json()], response
+
+    assert names()[0] == ["Rank A", "Rank B", "Rank D", "Rank C"]
+    # With a prior at the global mean, one perfect review no longer beats twenty great ones.
+    assert names(ranking="bayesian")[0] == ["Rank B", "Rank A", "Rank C", "Rank D"]
+    assert names(min_completed=3)[0] == ["Rank B", "Rank D"]
+    assert names(min_rating=4.5)[0] == ["Rank A", "Rank B"]
+
+    first, response = names(ranking="bayesian", limit=3)
+    second, _ = names(ranking="bayesian", limit=3, cursor=response.headers["X-Next-Cursor"])
+    assert first + second == ["Rank B", "Rank A", "Rank C", "Rank D"]
+
+    # A zero prior weight is refused at startup; the query itself never divides by zero.
+    with pytest.raises(ValidationError):
+        Settings(hr_bayesian_prior_weight=0)
+    stmt, _ = student_stats_repo.ranked_students_query(
+        bayesian=True, prior_weight=0, skills=["rankskill"], min_rating=None, min_completed=None
+    )
+    with TestingSessionLocal() as db:
+        scores = {row.full_name: row.score for row in db.execute(stmt)}
+    assert scores["Rank C"] == 0
+
+
+def test_manager_dashboard_is_cached_and_invalidated(query_budget):
+    manager = _headers("pm-dashboard@example.com", "manager")
+    dashboard_cache.clear()
+    before = client.get("/api/v1/manager/dashboard", headers=manager).json()
+
+    with query_budget(max_queries=0):
+        assert client.get("/api/v1/manager/dashboard", headers=manager).json() == before
+
+    client.post(
+        "/api/v1/tasks",
+        headers=manager,
+        json={"title": "Dashboard task", "description": "Counts towards the dashboard"},
+    )
+    after = client.get("/api/v1/manager/dashboard", headers=manager).json()
+    assert after["total_projects"] == before["total_projects"] + 1
+    assert after["active_projects"] == before["active_projects"] + 1
+
+
+def test_stale_while_revalidate_serves_stale_during_one_refresh():
+    cache = StaleWhileRevalidateCache(ttl_seconds=0.05, max_stale_seconds=60)
+    calls = []
+    release = threading.Event()
+
+    def loader():
+        calls.append(1)
+        if len(calls) > 1:
+            release.wait(5)
+        return len(calls)
+
+    assert cache.get("k", loader) == 1
+    time.sleep(0.06)
+    assert [cache.get("k", loader) for _ in range(5)] == [1] * 5
+    release.set()
+    for _ in range(100):
+        if cache.get("k", loader) == 2:
+            break
+        time.sleep(0.01)
+    assert cache.get("k", loader) == 2
+    assert len(calls) == 2
+
+
+def test_team_and_applications_batch_related_rows(query_budget):
+    manager = _headers("pm-loader@example.com", "manager")
+    students = [_headers(f"student-loader-{index}@example.com", "student") for index in range(3)]
+
+    counts = {}
+    for size in (1, 3):
+        task_id = client.post(
+            "/api/v1/tasks",
+            headers=manager,
+            json={"title": f"Loader task {size}", "description": "Batched relationship loading"},
+        ).json()["id"]
+        for student in students[:size]:
+            application = client.post(f"/api/v1/projects/{task_id}/applications", headers=student, json={})
+            client.post(f"/api/v1/manager/applications/{application.json()['id']}/approve", headers=manager)
+        for path in (f"/api/v1/projects/{task_id}/team", f"/api/v1/manager/projects/{task_id}/applications"):
+            with query_budget(max_repeats=1) as stats:
+                response = client.get(path, headers=manager)
+            assert len(response.json()) == size
+            counts[(path.split("/")[-1], size)] = stats.count
+
+    assert counts[("team", 1)] == counts[("team", 3)]
+    assert counts[("applications", 1)] == counts[("applications", 3)]
+
+
+def test_project_reads_answer_conditional_gets(query_budget):
+    manager = _headers("pm-etag@example.com", "manager")
+    student = _headers("student-etag@example.com", "student")
+    task = client.post(
+        "/api/v1/tasks",
+        headers=manager,
+        json={"title": "ETag task", "description": "Conditional GET check", "nda_required": True},
+    ).json()
+    path = f"/api/v1/projects/{task['id']}"
+
+    first = client.get(path, headers=manager)
+    etag = first.headers["ETag"]
+    with query_budget(max_queries=3):
+        cached = client.get(path, headers={**manager, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    since = client.get(path, headers={**manager, "If-Modified-Since": first.headers["Last-Modified"]})
+    assert since.status_code == 304
+
+    # The NDA-masked view of the same row has its own validator.
+    masked = client.get(path, headers={**student, "If-None-Match": etag})
+    assert masked.status_code == 200
+    assert masked.json()["description"] != first.json()["description"]
+
+    listing = client.get("/api/v1/projects", params={"query": "ETag"}, headers=manager)
+    list_etag = listing.headers["ETag"]
+    manager_id = client.get("/api/v1/auth/me", headers=manager).json()["id"]
+    assert client.get(
+        "/api/v1/projects", params={"query": "ETag"}, headers={**manager, "If-None-Match": list_etag}
+    ).status_code == 304
+
+    client.patch(f"/api/v1/tasks/{task['id']}", headers=manager, json={"title": "ETag task renamed"})
+    renamed = client.get(path, headers={**manager, "If-None-Match": etag})
+    assert renamed.status_code == 200
+
+    # The curator's name is part of TaskRead, so renaming them is a change too.
+    client.patch(f"/api/v1/projects/{task['id']}", headers=manager, json={"curator_id": manager_id})
+    etag = client.get(path, headers=manager).headers["ETag"]
+    client.patch("/api/v1/users/me", headers=manager, json={"full_name": "Renamed Manager"})
+    refreshed = client.get(path, headers={**manager, "If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.json()["curator_full_name"] == "Renamed Manager"
+    assert client.get(
+        "/api/v1/projects", params={"query": "ETag"}, headers={**manager, "If-None-Match": list_etag}
+    ).status_code == 200
+
+
+def test_exports_stream_filtered_rows():
+    manager = _headers("pm-export@example.com", "manager")
+    for index in range(3):
+        client.post(
+            "/api/v1/tasks",
+            headers=manager,
+            json={"title": f"Export task {index}", "description": "Streaming export check", "tags": "export"},
+        )
+
+    csv_export = client.get("/api/v1/projects/export", params={"tag": "export"}, headers=manager)
+    assert csv_export.status_code == 200
+    assert csv_export.headers["content-type"].startswith("text/csv")
+    assert "attachment" in csv_export.headers["content-disposition"]
+    lines = csv_export.content.decode("utf-8-sig").splitlines()
+    assert lines[0].startswith("id,title,status")
+    assert [line.split(",")[1] for line in lines[1:]] == ["Export task 2", "Export task 1", "Export task 0"]
+
+    ndjson_export = client.get(
+        "/api/v1/projects/export", params={"tag": "export", "format": "ndjson"}, headers=manager
+    )
+    rows = [json.loads(line) for line in ndjson_export.text.splitlines()]
+    assert [row["title"] for row in rows] == ["Export task 2", "Export task 1", "Export task 0"]
+    assert rows[0]["tags"] == "export"
+
+    client.post(
+        "/api/v1/tasks",
+        headers=manager,
+        json={"title": "=HYPERLINK(\"http://x\") task", "description": "Formula injection check", "tags": "formula"},
+    )
+    formula = client.get("/api/v1/projects/export", params={"tag": "formula"}, headers=manager)
+    exported = list(csv.reader(formula.content.decode("utf-8-sig").splitlines()))
+    assert exported[1][1] == "'=HYPERLINK(\"http://x\") task"
+
+    students = client.get("/api/v1/manager/students/export", params={"format": "ndjson"}, headers=manager)
+    assert students.status_code == 200
+    assert all("done_count" in json.loads(line) for line in students.text.splitlines())
+    hr = client.get("/api/v1/hr/dashboard/export", params={"ranking": "bayesian"}, headers=manager)
+    assert hr.status_code == 200
+    assert hr.content.decode("utf-8-sig").splitlines()[0].endswith("score")
+    assert client.get("/api/v1/projects/export", params={"format": "xml"}, headers=manager).status_code == 422
+
+
+def test_bulk_import_reports_row_errors():
+    manager = _headers("pm-import@example.com", "manager")
+    _headers("taken-import@example.com", "student")
+    users_csv = (
+        "Email,Full_Name,Password,Role,Faculty\n"
+        "new-one@example.com,New One,Secret123!,student,CS\n"
+        "new-two@example.com,New Two,Secret123!,mentor,\n"
+        "new-one@example.com,Duplicate,Secret123!,student,\n"
+        "taken-import@example.com,Taken,Secret123!,student,\n"
+        "not-an-email,Broken,Secret123!,student,\n"
+        "boss@example.com,Boss,Secret123!,admin,\n"
+    )
+    response = client.post(
+        "/api/v1/manager/import/users",
+        headers=manager,
+        files={"file": ("users.csv", ("\ufeff" + users_csv).encode(), "text/csv")},
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["total"], report["created"]) == (6, 2)
+    assert [(error["row"], error["error"].split(":")[0]) for error in report["errors"]] == [
+        (4, "email"),
+        (5, "email"),
+        (6, "email"),
+        (7, "role"),
+    ]
+    too_many = "email,full_name,password\n" + "x@example.com,Too Many,Secret123!\n" * 1001
+    response = client.post(
+        "/api/v1/manager/import/users",
+        headers=manager,
+        files={"file": ("users.csv", too_many.encode(), "text/csv")},
+    )
+    assert response.status_code == 413
+    mentor_id = client.get("/api/v1/manager/mentors", headers=manager).json()[0]["id"]
+
+    tasks_csv = (
+        "title,description,tags,mentor_id\n"
+        f"Imported task one,Imported from a CSV file,\"import, csv\",{mentor_id}\n"
+        "Imported task two,Imported from a CSV file,import,\n"
+        "No,too short,,\n"
+    )
+    response = client.post(
+        "/api/v1/manager/import/tasks",
+        headers=manager,
+        files={"file": ("tasks.csv", tasks_csv.encode(), "text/csv")},
+    )
+    report = response.json()
+    assert (report["total"], report["created"]) == (3, 2)
+    assert report["errors"][0]["row"] == 4
+    imported = client.get("/api/v1/tasks", params={"tag": "import"}, headers=manager).json()
+    assert sorted(task["tags"] for task in imported) == ["import", "import, csv"]
+
+
+def test_fast_json_paths_match_the_default_serialization():
+    rows = build_rows(3)
+    rows[0].goal = None
+    rows[0].mentor = rows[0].mentor_id = None
+    rows[1].created_at = datetime(2026, 1, 1)
+    bench = TestClient(build_app(rows))
+    default, fast = bench.get("/default"), bench.get("/fast")
+    # Byte for byte: datetimes, nulls, non-ASCII text and the pagination headers.
+    assert fast.content == default.content
+    assert fast.headers["X-Next-Cursor"] == default.headers["X-Next-Cursor"]
+
+    single = FastAPI()
+    single.get("/default", response_model=TaskRead)(lambda: rows[0])
+    single.get("/orjson", response_model=TaskRead, response_class=ORJSONResponse)(lambda: rows[0])
+    single_client = TestClient(single)
+    assert single_client.get("/orjson").content == single_client.get("/default").content
+
+
+def test_bulk_decide_applies_set_based_decisions(query_budget):
+    manager = _headers("pm-bulk@example.com", "manager")
+    student = _headers("student-bulk@example.com", "student")
+    task_ids = [
+        client.post(
+            "/api/v1/tasks",
+            headers=manager,
+            json={"title": f"Bulk task {index}", "description": "Bulk decision check"},
+        ).json()["id"]
+        for index in range(4)
+    ]
+    applications = [
+        client.post(f"/api/v1/projects/{task_id}/applications", headers=student, json={}).json()["id"]
+        for task_id in task_ids
+    ]
+    decisions = [
+        {"assignment_id": applications[0], "state": "active"},
+        {"assignment_id": applications[1], "state": "active"},
+        {"assignment_id": applications[2], "state": "canceled", "reason": "Team is full"},
+        {"assignment_id": applications[3], "state": "canceled", "reason": "Team is full"},
+        {"assignment_id": applications[0], "state": "canceled"},
+        {"assignment_id": 999999, "state": "active"},
+    ]
+    with query_budget(max_queries=20):
+        response = client.post(
+            "/api/v1/manager/applications/bulk-decide", headers=manager, json={"decisions": decisions}
+        )
+    assert response.status_code == 200
+    assert [(item["ok"], item["state"], item["error"]) for item in response.json()] == [
+        (True, "active", None),
+        (True, "active", None),
+        (True, "canceled", None),
+        (True, "canceled", None),
+        (False, "requested", "Duplicate assignment in request"),
+        (False, None, "Application not found"),
+    ]
+
+    again = client.post(
+        "/api/v1/manager/applications/bulk-decide", headers=manager, json={"decisions": decisions[:1]}
+    )
+    assert again.json()[0]["error"] == "Application is already active"
+
+    outbox_worker.drain()
+    team = client.get(f"/api/v1/projects/{task_ids[0]}/team", headers=manager).json()
+    assert len(team) == 1
+    student_id = client.get("/api/v1/auth/me", headers=student).json()["id"]
+    with TestingSessionLocal() as db:
+        assert [item for item in student_stats_repo.find_drift(db) if item["student_id"] == student_id] == []
+        rows = db.execute(
+            select(Assignment.state, Assignment.decision_reason, PortfolioEntry.id)
+            .outerjoin(PortfolioEntry, PortfolioEntry.assignment_id == Assignment.id)
+            .where(Assignment.id.in_(applications))
+            .order_by(Assignment.id)
+        ).all()
+    assert [(state, reason, entry is not None) for state, reason, entry in rows] == [
+        ("active", None, True),
+        ("active", None, True),
+        ("canceled", "Team is full", False),
+        ("canceled", "Team is full", False),
+    ]
+
+
+def test_project_events_stream_committed_changes():
+    manager = _headers("pm-events@example.com", "manager")
+    student = _headers("student-events@example.com", "student")
+    task_id = client.post(
+        "/api/v1/tasks", headers=manager, json={"title": "Events task", "description": "Live updates check"}
+    ).json()["id"]
+
+    async def listen() -> list[tuple[str, dict]]:
+        # Drive the ASGI app directly: TestClient buffers whole bodies, which an
+        # endless event stream never finishes.
+        chunks: asyncio.Queue = asyncio.Queue()
+        disconnected = asyncio.Event()
+
+        async def receive():
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body" and message.get("body"):
+                await chunks.put(message["body"].decode())
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": f"/api/v1/projects/{task_id}/events",
+            "raw_path": f"/api/v1/projects/{task_id}/events".encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"authorization", student["Authorization"].encode())],
+            "client": ("testclient", 50000),
+            "server": ("testserver", 80),
+        }
+        stream = asyncio.create_task(app(scope, receive, send))
+        assert await asyncio.wait_for(chunks.get(), 5) == "retry: 3000\n\n"
+
+        def write():
+            client.post("/api/v1/comments", headers=manager, json={"task_id": task_id, "body": "Kickoff on Monday"})
+            client.post(
+                "/api/v1/questions",
+                headers=manager,
+                json={"task_id": task_id, "body": "Private note", "is_private": True, "recipient_id": 1},
+            )
+            client.post(f"/api/v1/projects/{task_id}/applications", headers=student, json={})
+
+        await asyncio.to_thread(write)
+        events = []
+        while len(events) < 2:
+            frame = await asyncio.wait_for(chunks.get(), 5)
+            kind, data = frame.strip().split("\n")
+            events.append((kind.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+
+        # Losing access resets the student's stream, which then ends on its own.
+        await asyncio.to_thread(
+            client.patch, f"/api/v1/projects/{task_id}", headers=manager, json={"visibility": "private"}
+        )
+        assert await asyncio.wait_for(chunks.get(), 5) == "event: reset\ndata: {}\n\n"
+        await asyncio.wait_for(stream, 5)
+        disconnected.set()
+        return events
+
+    events = asyncio.run(listen())
+    assert [kind for kind, _ in events] == ["comment", "team"]
+    assert events[0][1]["body"] == "Kickoff on Monday"
+    assert events[1][1]["state"] == "requested"
+    assert get_broker().subscriber_count() == 0
+
+
+def test_request_commits_once_and_rolls_back_on_error():
+    manager = _headers("pm-uow@example.com", "manager")
+    commits = []
+
+    def counting_get_db():
+        db = TestingSessionLocal()
+        event.listen(db, "after_commit", commits.append)
+        try:
+            with unit_of_work(db):
+                yield db
+        finally:
+            db.close()
+
+    # Creating a task saves the task, its tags and an audit entry; one commit.
+    app.dependency_overrides[get_db] = counting_get_db
+    try:
+        response = client.post(
+            "/api/v1/tasks",
+            headers=manager,
+            json={"title": "Unit of work task", "description": "Committed once per request", "tags": "uow, atomic"},
+        )
+    finally:
+        app.dependency_overrides[get_db] = override_get_db
+    assert response.status_code == 200
+    assert len(commits) == 1
+
+    # An error raised after save() rolls the whole request back.
+    request_db = override_get_db()
+    db = next(request_db)
+    save(db, User(email="uow-rollback@example.com", full_name="Rolled Back", password_hash="x", role="student"))
+    with pytest.raises(HTTPException):
+        request_db.throw(HTTPException(status_code=409, detail="Conflict after save"))
+    with TestingSessionLocal() as db:
+        assert db.scalar(select(User).where(User.email == "uow-rollback@example.com")) is None
+
+
+def test_outbox_jobs_commit_with_the_change_and_retry():
+    calls = []
+
+    @outbox_service.job_handler("test_flaky")
+    def flaky(db, payload):
+        calls.append(payload["n"])
+        if len(calls) == 1:
+            raise RuntimeError("downstream unavailable")
+
+    with TestingSessionLocal() as db:
+        with unit_of_work(db):
+            outbox_service.enqueue(db, "test_flaky", {"n": 1})
+        try:
+            with unit_of_work(db):
+                outbox_service.enqueue(db, "test_flaky", {"n": 2})
+                raise ValueError("business change rolled back")
+        except ValueError:
+            pass
+
+    outbox_worker.drain()
+    with TestingSessionLocal() as db:
+        job = db.scalars(select(OutboxJob).where(OutboxJob.kind == "test_flaky")).one()
+        assert (job.state, job.attempts, "downstream unavailable" in job.last_error) == ("pending", 1, True)
+        assert job.run_after > datetime.utcnow()
+        job.run_after = datetime.utcnow()
+        db.commit()
+
+    outbox_worker.drain()
+    with TestingSessionLocal() as db:
+        job = db.scalars(select(OutboxJob).where(OutboxJob.kind == "test_flaky")).one()
+        assert (job.state, job.attempts, job.last_error, job.locked_by) == ("done", 2, None, None)
+    assert calls == [1, 1]
+
+
+def test_outbox_leases_are_per_claim_and_expire_into_failure():
+    # Due an hour from now, so the app's own worker leaves these jobs alone.
+    later = datetime.utcnow() + timedelta(hours=1)
+    with TestingSessionLocal() as db:
+        with unit_of_work(db):
+            outbox_repo.create_job(db, "test_lease", {}, run_after=later, max_attempts=2)
+        with unit_of_work(db):
+            [first] = outbox_repo.claim_jobs(db, "host:1", 1, lease_seconds=0, now=later)
+        # The lease ran out and the same process claims the job again.
+        with unit_of_work(db):
+            [second] = outbox_repo.claim_jobs(db, "host:1", 1, lease_seconds=0, now=later)
+        assert first.lease_token != second.lease_token
+        with unit_of_work(db):
+            assert not outbox_repo.complete_job(db, first.id, first.lease_token, now=later)
+
+        # Attempts are spent: the expired lease fails the job instead of a third run.
+        with unit_of_work(db):
+            assert outbox_repo.claim_jobs(db, "host:1", 1, lease_seconds=0, now=later) == []
+        job = db.get(OutboxJob, first.id)
+        assert (job.state, job.attempts, job.lease_token) == ("failed", 2, None)
+
+
+def test_oversized_events_degrade_to_refetch():
+    comment = {"type": "comment", "data": {"id": 1, "body": "Обсуждение " * 1000}, "audience": None}
+    # A full-length Russian comment still fits once the payload is not ASCII-escaped.
+    fits = {**comment, "data": {"id": 2, "body": "я" * 2000}}
+    assert json.loads(notify_payload("project:1", fits))["message"] == fits
+    envelope = json.loads(notify_payload("project:1", comment))
+    assert len(notify_payload("project:1", comment).encode()) <= MAX_NOTIFY_BYTES
+    assert envelope["message"] == {"type": "refetch", "data": {"type": "comment"}, "audience": None}
+
+    async def frames() -> list[str]:
+        broker = MemoryBroker()
+        subscription = broker.subscribe("project:1")
+        stream = _stream(subscription, User(id=1, role="student"))
+        received = [await stream.__anext__()]
+        broker.publish("project:1", envelope["message"])
+        broker.publish("project:1", {"type": "comment", "audience": None})
+        received += [await stream.__anext__(), await stream.__anext__()]
+        await stream.aclose()
+        assert broker.subscriber_count() == 0
+        # A response whose body is never streamed still releases its subscription.
+        unstreamed = broker.subscribe("project:1")
+        await event_stream_response(unstreamed, User(id=1, role="student")).background()
+        unstreamed.close()
+        assert broker.subscriber_count() == 0
+        return [frame.decode() for frame in received]
+
+    assert asyncio.run(frames())[1:] == [
+        'event: refetch\ndata: {"type":"comment"}\n\n',
+        "event: comment\ndata: {}\n\n",
+    ]
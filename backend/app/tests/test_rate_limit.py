@@ -0,0 +1,121 @@
+import fnmatch
+import socketserver
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.rate_limit import MemoryBackend, RateLimiter, RedisBackend, SQLiteBackend
+
+
+class _FakeRedisHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        store = self.server.store
+        while True:
+            header = self.rfile.readline()
+            if not header:
+                return
+            args = []
+            for _ in range(int(header[1:])):
+                length = int(self.rfile.readline()[1:])
+                args.append(self.rfile.read(length + 2)[:-2].decode())
+            command = args[0].upper()
+            if command == "AUTH" and args[1] != self.server.password:
+                self.wfile.write(b"-WRONGPASS invalid password\r\n")
+            elif command == "INCR" and args[1] == "not-a-counter":
+                self.wfile.write(b"-WRONGTYPE Operation against a key holding the wrong kind of value\r\n")
+            elif command == "INCR":
+                store[args[1]] = int(store.get(args[1], 0)) + 1
+                self.wfile.write(b":%d\r\n" % store[args[1]])
+            elif command == "EXPIRE":
+                self.wfile.write(b":1\r\n")
+            elif command == "GET":
+                value = store.get(args[1])
+                if value is None:
+                    self.wfile.write(b"$-1\r\n")
+                else:
+                    data = str(value).encode()
+                    self.wfile.write(b"$%d\r\n%s\r\n" % (len(data), data))
+            elif command == "SCAN":
+                keys = [key.encode() for key in store if fnmatch.fnmatchcase(key, args[3])]
+                self.wfile.write(b"*2\r\n$1\r\n0\r\n*%d\r\n" % len(keys))
+                self.wfile.write(b"".join(b"$%d\r\n%s\r\n" % (len(key), key) for key in keys))
+            elif command == "DEL":
+                removed = sum(store.pop(key, None) is not None for key in args[1:])
+                self.wfile.write(b":%d\r\n" % removed)
+            else:
+                self.wfile.write(b"+OK\r\n")
+
+
+@pytest.fixture
+def fake_redis():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _FakeRedisHandler)
+    server.daemon_threads = True
+    server.store = {}
+    server.password = "secret"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"redis://127.0.0.1:{server.server_address[1]}/0"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _exhaust(limiter: RateLimiter, key: str, limit: int) -> None:
+    for _ in range(limit):
+        limiter.check(key, limit, 60)
+    with pytest.raises(HTTPException) as exc_info:
+        limiter.check(key, limit, 60)
+    assert exc_info.value.status_code == 429
+    assert int(exc_info.value.headers["Retry-After"]) >= 1
+
+
+def test_memory_backend_limits_and_evicts():
+    backend = MemoryBackend(max_keys=2)
+    limiter = RateLimiter(backend)
+    _exhaust(limiter, "login:a", 3)
+    limiter.check("login:b", 3, 60)
+    limiter.check("login:c", 3, 60)
+    assert list(backend._buckets) == ["login:b", "login:c"]
+
+
+def test_sqlite_backend_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "limits.sqlite3")
+    _exhaust(RateLimiter(SQLiteBackend(path)), "login:a", 3)
+    with pytest.raises(HTTPException):
+        RateLimiter(SQLiteBackend(path)).check("login:a", 3, 60)
+
+
+def test_redis_backend_against_stand_in(fake_redis):
+    backend = RedisBackend(fake_redis.url)
+    _exhaust(RateLimiter(backend), "login:a", 3)
+    RateLimiter(RedisBackend(fake_redis.url)).check("login:b", 3, 60)
+
+    fake_redis.store["other:key"] = 1
+    backend.reset()
+    assert list(fake_redis.store) == ["other:key"]
+    RateLimiter(backend).check("login:a", 3, 60)
+
+
+def test_redis_error_replies_leave_no_stale_state(fake_redis):
+    backend = RedisBackend(fake_redis.url)
+    with pytest.raises(RuntimeError):
+        backend.pipeline([("INCR", "not-a-counter"), ("GET", "rl:other")])
+    assert backend._sock is None
+    # The reply to GET was read with the error, so the next call gets its own.
+    assert backend.pipeline([("INCR", "rl:fresh")]) == [1]
+
+    unauthenticated = RedisBackend(fake_redis.url.replace("redis://", "redis://:wrong@"))
+    with pytest.raises(RuntimeError):
+        unauthenticated.pipeline([("GET", "rl:fresh")])
+    assert unauthenticated._sock is None
+
+
+def test_unreachable_backend_fails_open_or_closed(fake_redis):
+    url = fake_redis.url
+    fake_redis.shutdown()
+    fake_redis.server_close()
+    RateLimiter(RedisBackend(url), fail_open=True).check("login:a", 3, 60)
+    with pytest.raises(HTTPException) as exc_info:
+        RateLimiter(RedisBackend(url), fail_open=False).check("login:a", 3, 60)
+    assert exc_info.value.status_code == 503
@@ -4,8 +4,10 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.db.session import get_db
+from app.db.unit_of_work import unit_of_work
 from app.main import app
 from app.models.base import Base
+from app.services.audit_service import audit_pipeline
 from app.services.auth_service import create_user_with_role
 from app import models  # noqa: F401
 
@@ -18,7 +20,8 @@ TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engin
 def override_get_db():
     db = TestingSessionLocal()
     try:
-        yield db
+        with unit_of_work(db):
+            yield db
     finally:
         db.close()
 
@@ -35,6 +38,7 @@ def setup_module():
 
 
 def teardown_module():
+    audit_pipeline.flush()
     Base.metadata.drop_all(bind=engine)
 
 
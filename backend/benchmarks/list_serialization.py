@@ -0,0 +1,98 @@
+# Throughput of a 100-item TaskRead page through FastAPI's default response
+# path (response_model validation + stdlib json) versus the fast path used by
+# the list endpoints (app.api.pagination.paginated_json). The rows are built in
+# memory so the numbers measure serialization only, not the database.
+#
+#   cd backend && DATABASE_URL=sqlite:// SECRET_KEY=bench python -m benchmarks.list_serialization
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from app.api.pagination import paginated, paginated_json
+from app.models.tag import Tag
+from app.models.task import Task
+from app.models.task_mentor import TaskMentor
+from app.models.user import User
+from app.repositories.pagination import Page
+from app.schemas.task import TaskRead
+from app import models  # noqa: F401
+
+
+def build_rows(count: int) -> list[Task]:
+    curator = User(id=1, full_name="Куратор Проектов", email="curator@example.com")
+    mentors = [User(id=index, full_name=f"Ментор {index}", email=f"mentor{index}@example.com") for index in (2, 3)]
+    tags = [Tag(id=index, name=name) for index, name in enumerate(("python", "ml", "backend"), start=1)]
+    now = datetime.utcnow()
+    rows = []
+    for index in range(count):
+        task = Task(
+            id=index + 1,
+            title=f"Проект {index}: анализ данных",
+            description="Описание задачи " * 200,
+            goal="Построить сервис рекомендаций",
+            key_tasks="Сбор данных; обучение модели; API",
+            skills_required="Python, SQL, pandas",
+            tags="backend, ml, python",
+            status="open",
+            visibility="public",
+            is_archived=False,
+            nda_required=False,
+            created_by=1,
+            curator_id=1,
+            mentor_id=2,
+            created_at=now - timedelta(minutes=index),
+            updated_at=now - timedelta(minutes=index),
+        )
+        task.curator = curator
+        task.mentor = mentors[0]
+        task.mentor_links = [TaskMentor(task_id=task.id, mentor_id=3, mentor=mentors[1])]
+        task.tag_items = tags
+        rows.append(task)
+    return rows
+
+
+def build_app(rows: list[Task]) -> FastAPI:
+    app = FastAPI()
+    page = Page(rows, "next-cursor")
+
+    @app.get("/default", response_model=list[TaskRead])
+    def default_path(request: Request, response: Response):
+        return paginated(request, response, page)
+
+    @app.get("/fast", response_model=list[TaskRead])
+    def fast_path(request: Request, response: Response):
+        return paginated_json(request, response, page, TaskRead)
+
+    return app
+
+
+def measure(client: TestClient, path: str, requests: int) -> float:
+    client.get(path)
+    started = time.perf_counter()
+    for _ in range(requests):
+        client.get(path)
+    return requests / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark list endpoint serialization")
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    client = TestClient(build_app(build_rows(args.items)))
+    default, fast = client.get("/default"), client.get("/fast")
+    assert default.json() == fast.json(), "fast path must return the same payload"
+
+    default_rps = measure(client, "/default", args.requests)
+    fast_rps = measure(client, "/fast", args.requests)
+    print(f"{args.items}-item pages, {args.requests} requests each")
+    print(f"  response_model + json : {default_rps:8.1f} req/s")
+    print(f"  paginated_json        : {fast_rps:8.1f} req/s  ({fast_rps / default_rps:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,7 +18,7 @@ function getHealthUrl(): string {
   }
 }
 
-export async function apiRequest<T>(path: string, options: RequestInit = {}): Promise<T> {
+async function send(path: string, options: RequestInit = {}): Promise<Response> {
   const token = typeof window !== "undefined" ? localStorage.getItem("access_token") : null;
 
   const headers: Record<string, string> = {
@@ -58,8 +58,29 @@ export async function apiRequest<T>(path: string, options: RequestInit = {}): Pr
     throw new Error(detail);
   }
 
+  return response;
+}
+
+export async function apiRequest<T>(path: string, options: RequestInit = {}): Promise<T> {
+  const response = await send(path, options);
+
   // если вдруг 204
   if (response.status === 204) return undefined as unknown as T;
 
   return response.json();
 }
+
+// Списки отдаются страницами: следующая страница приходит в заголовке X-Next-Cursor.
+// Собираем все страницы, чтобы экраны, показывающие весь список, ничего не теряли.
+export async function apiRequestAll<T>(path: string, pageSize = 200): Promise<T[]> {
+  const separator = path.includes("?") ? "&" : "?";
+  const items: T[] = [];
+  let cursor: string | null = null;
+  do {
+    const query: string = `limit=${pageSize}` + (cursor ? `&cursor=${encodeURIComponent(cursor)}` : "");
+    const response = await send(`${path}${separator}${query}`);
+    items.push(...((await response.json()) as T[]));
+    cursor = response.headers.get("X-Next-Cursor");
+  } while (cursor);
+  return items;
+}
@@ -3,7 +3,7 @@ import Layout from "../components/Layout";
 import Card from "../components/Card";
 import Select from "../components/Select";
 import ErrorText from "../components/ErrorText";
-import { apiRequest } from "../components/api";
+import { apiRequest, apiRequestAll } from "../components/api";
 import styles from "../styles/Admin.module.css";
 
 interface UserRow {
@@ -20,7 +20,7 @@ export default function AdminPage() {
   const [error, setError] = useState<string | null>(null);
 
   const loadUsers = () => {
-    apiRequest<UserRow[]>("/users")
+    apiRequestAll<UserRow>("/users")
       .then(setUsers)
       .catch((err) => setError(err.message));
   };
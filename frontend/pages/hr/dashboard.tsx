@@ -3,7 +3,7 @@ import Layout from "../../components/Layout";
 import RouteGuard from "../../components/RouteGuard";
 import Card from "../../components/Card";
 import Input from "../../components/Input";
-import { apiRequest } from "../../components/api";
+import { apiRequestAll } from "../../components/api";
 import styles from "../../styles/Manager.module.css";
 
 type HrStudent = {
@@ -21,7 +21,7 @@ export default function HrDashboardPage() {
   const [error, setError] = useState<string | null>(null);
 
   useEffect(() => {
-    apiRequest<HrStudent[]>("/hr/dashboard")
+    apiRequestAll<HrStudent>("/hr/dashboard")
       .then(setStudents)
       .catch((err) => setError(err.message));
   }, []);
@@ -4,7 +4,7 @@ import Layout from "../../../components/Layout";
 import RouteGuard from "../../../components/RouteGuard";
 import Card from "../../../components/Card";
 import Button from "../../../components/Button";
-import { apiRequest } from "../../../components/api";
+import { apiRequest, apiRequestAll } from "../../../components/api";
 import styles from "../../../styles/Manager.module.css";
 
 type Curator = {
@@ -21,7 +21,7 @@ export default function ManagerCuratorsPage() {
 
   const loadCurators = async () => {
     try {
-      const data = await apiRequest<Curator[]>("/manager/curators");
+      const data = await apiRequestAll<Curator>("/manager/curators");
       setCurators(data);
     } catch (err) {
       setError((err as Error).message);
@@ -4,7 +4,7 @@ import Layout from "../../../components/Layout";
 import RouteGuard from "../../../components/RouteGuard";
 import Card from "../../../components/Card";
 import Button from "../../../components/Button";
-import { apiRequest } from "../../../components/api";
+import { apiRequest, apiRequestAll } from "../../../components/api";
 import styles from "../../../styles/Manager.module.css";
 
 type Mentor = {
@@ -20,7 +20,7 @@ export default function ManagerMentorsPage() {
   const [error, setError] = useState<string | null>(null);
 
   useEffect(() => {
-    apiRequest<Mentor[]>("/manager/mentors")
+    apiRequestAll<Mentor>("/manager/mentors")
       .then(setMentors)
       .catch((err) => setError(err.message));
   }, []);
@@ -38,7 +38,7 @@ export default function ManagerMentorsPage() {
     if (!ok) return;
     try {
       await apiRequest(`/manager/mentors/${mentorId}`, { method: "DELETE" });
-      const updated = await apiRequest<Mentor[]>("/manager/mentors");
+      const updated = await apiRequestAll<Mentor>("/manager/mentors");
       setMentors(updated);
     } catch (err) {
       setError((err as Error).message);
@@ -7,7 +7,7 @@ import Button from "../../../components/Button";
 import Select from "../../../components/Select";
 import Input from "../../../components/Input";
 import Textarea from "../../../components/Textarea";
-import { apiRequest } from "../../../components/api";
+import { apiRequest, apiRequestAll } from "../../../components/api";
 import styles from "../../../styles/Manager.module.css";
 import detailStyles from "../../../styles/TaskDetail.module.css";
 
@@ -157,8 +157,8 @@ export default function ManagerProjectDetailPage() {
     if (!id) return;
     loadProject();
     loadApplications();
-    apiRequest<Mentor[]>("/manager/mentors").then(setMentors).catch(() => null);
-    apiRequest<Curator[]>("/manager/curators").then(setCurators).catch(() => null);
+    apiRequestAll<Mentor>("/manager/mentors").then(setMentors).catch(() => null);
+    apiRequestAll<Curator>("/manager/curators").then(setCurators).catch(() => null);
     apiRequest<Question[]>(`/questions?task_id=${id}`).then(setQuestions).catch(() => null);
     apiRequest<TaskMentor[]>(`/manager/projects/${id}/mentors`).then(setTaskMentors).catch(() => null);
   }, [id]);
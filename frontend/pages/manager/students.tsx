@@ -3,7 +3,7 @@ import Layout from "../../components/Layout";
 import RouteGuard from "../../components/RouteGuard";
 import Card from "../../components/Card";
 import Button from "../../components/Button";
-import { apiRequest } from "../../components/api";
+import { apiRequest, apiRequestAll } from "../../components/api";
 import styles from "../../styles/Manager.module.css";
 
 type Student = {
@@ -30,10 +30,10 @@ export default function ManagerStudentsPage() {
   const [error, setError] = useState<string | null>(null);
 
   useEffect(() => {
-    apiRequest<Student[]>("/manager/students")
+    apiRequestAll<Student>("/manager/students")
       .then(setStudents)
       .catch((err) => setError(err.message));
-    apiRequest<Student[]>("/manager/students/pending")
+    apiRequestAll<Student>("/manager/students/pending")
       .then(setPending)
       .catch(() => null);
   }, []);
@@ -41,7 +41,7 @@ export default function ManagerStudentsPage() {
   const decidePending = async (studentId: number, action: "approve" | "reject") => {
     try {
       await apiRequest(`/manager/students/${studentId}/${action}`, { method: "POST" });
-      const updated = await apiRequest<Student[]>("/manager/students/pending");
+      const updated = await apiRequestAll<Student>("/manager/students/pending");
       setPending(updated);
     } catch (err) {
       setError((err as Error).message);
@@ -2,7 +2,7 @@ import { useEffect, useState } from "react";
 import Layout from "../../components/Layout";
 import RouteGuard from "../../components/RouteGuard";
 import Card from "../../components/Card";
-import { apiRequest } from "../../components/api";
+import { apiRequestAll } from "../../components/api";
 import styles from "../../styles/Manager.module.css";
 
 type PortfolioEntry = {
@@ -20,7 +20,7 @@ export default function StudentPortfolioPage() {
   const [error, setError] = useState<string | null>(null);
 
   useEffect(() => {
-    apiRequest<PortfolioEntry[]>("/portfolio/me")
+    apiRequestAll<PortfolioEntry>("/portfolio/me")
       .then(setEntries)
       .catch((err) => setError(err.message));
   }, []);
@@ -2,7 +2,7 @@ import { useEffect, useState } from "react";
 import Layout from "../../components/Layout";
 import RouteGuard from "../../components/RouteGuard";
 import Card from "../../components/Card";
-import { apiRequest } from "../../components/api";
+import { apiRequestAll } from "../../components/api";
 import styles from "../../styles/Manager.module.css";
 
 export default function StudentReviewsPage() {
@@ -10,7 +10,7 @@ export default function StudentReviewsPage() {
   const [error, setError] = useState<string | null>(null);
 
   useEffect(() => {
-    apiRequest<{ id: number; rating: number; comment?: string | null }[]>("/reviews/me")
+    apiRequestAll<{ id: number; rating: number; comment?: string | null }>("/reviews/me")
       .then(setReviews)
       .catch((err) => setError(err.message));
   }, []);
@@ -4,7 +4,7 @@ import RouteGuard from "../../components/RouteGuard";
 import Card from "../../components/Card";
 import Button from "../../components/Button";
 import Textarea from "../../components/Textarea";
-import { apiRequest } from "../../components/api";
+import { apiRequest, apiRequestAll } from "../../components/api";
 import styles from "../../styles/Manager.module.css";
 
 type Approval = {
@@ -23,7 +23,7 @@ export default function UnivApprovalsPage() {
   const [error, setError] = useState<string | null>(null);
 
   const loadApprovals = () => {
-    apiRequest<Approval[]>("/univ/approvals")
+    apiRequestAll<Approval>("/univ/approvals")
       .then(setApprovals)
       .catch((err) => setError(err.message));
   };